@@ -1,16 +1,191 @@
-from fastapi import FastAPI, UploadFile, File
-from fastapi.responses import JSONResponse,FileResponse
+from project.pipeline.startup import StartupProfiler
+startup_profiler = StartupProfiler()
+
+import asyncio
+import importlib
+from contextlib import asynccontextmanager
+from typing import List
+from fastapi import FastAPI, UploadFile, File, Request
+from fastapi.responses import JSONResponse,FileResponse,StreamingResponse,Response
 from fastapi.staticfiles import StaticFiles
-from project.pipeline.prediction import ImagePredictor
+from project.pipeline.prediction import ImagePredictor, open_image_bytes, resize_and_normalize
+from project.pipeline.backends import resolve_backend_name
+from project.pipeline.batching import MicroBatcher
+from project.pipeline.batch_prediction import BatchPredictionStreamer
+from project.pipeline.cache import PredictionCache
+from project.pipeline.executor import InferenceExecutor, ServerOverloaded
+from project.pipeline.metrics import ServingMetrics
+from project.pipeline.model_registry import ModelRegistry, ModelManager, resolve_predictor
+from project.pipeline.tensor_ingest import parse_tensor_payload, TensorPayloadError
+from project.configeration import ConfigerationManager
+from project.logger import logging
 import uvicorn
-import shutil
-import uuid
-import os
 
-app = FastAPI()
+startup_profiler.mark("imports")
+
+
+prediction_config = ConfigerationManager().get_prediction_config()
+
+
+def load_predictor(model_path: str, version: str) -> ImagePredictor:
+    """Load and warm up one model version."""
+    return ImagePredictor(
+        str(model_path),
+        compiled=prediction_config.compiled_inference,
+        jit_compile=prediction_config.jit_compile,
+        warmup_batch_sizes=prediction_config.warmup_batch_sizes,
+        num_threads=prediction_config.num_threads,
+        backend=prediction_config.backend,
+        version=version,
+        precision=prediction_config.param_precision
+    )
+
+
+# Serve the newest registry version, or model_path when the registry is empty.
+# The initial model is loaded after the server binds (see `load_initial_model`),
+# so /healthz answers immediately and /readyz flips once the model is warm.
+# New versions are loaded and warmed in the background, then swapped in.
+model_manager = ModelManager(
+    ModelRegistry(prediction_config.registry_dir),
+    loader=load_predictor,
+    poll_seconds=prediction_config.registry_poll_seconds
+)
+model_ready = asyncio.Event()
+startup_error = None
+target_size = tuple(prediction_config.param_image_size[:-1])
+
+# Dedicated, bounded pool for model execution (keeps the event loop free)
+inference_executor = InferenceExecutor(
+    max_workers=prediction_config.inference_workers,
+    max_queue=prediction_config.max_queue,
+    retry_after=prediction_config.retry_after_seconds
+)
+
+# Merge concurrent requests into one forward pass
+batcher = MicroBatcher(
+    model_manager,
+    max_batch_size=prediction_config.max_batch_size,
+    max_wait_ms=prediction_config.max_wait_ms,
+    executor=inference_executor
+)
+
+# Per-stage latency histograms, counters and gauges for /metrics
+serving_metrics = ServingMetrics(executor=inference_executor, batcher=batcher)
+inference_executor.histogram = serving_metrics.forward
+OVERLOAD_STATUS = str(prediction_config.overload_status_code)
+# Reduced-resolution JPEG decode for large uploads
+DRAFT_SIZE = target_size if prediction_config.draft_decode else None
+# Largest /predict/tensor body: a full float32 batch plus header room
+MAX_TENSOR_BYTES = prediction_config.max_tensor_batch * 4 * int(
+    prediction_config.param_image_size[0] * prediction_config.param_image_size[1]
+    * prediction_config.param_image_size[2]) + 4096
+
+# Content-addressed cache: re-uploads of the same image skip inference
+cache = PredictionCache(
+    fingerprint=None,
+    max_entries=prediction_config.cache_max_entries,
+    ttl_seconds=prediction_config.cache_ttl_seconds,
+    db_path=str(prediction_config.cache_db_path) if prediction_config.cache_db_path else None
+)
+
+# Many-image scoring for /predict/batch
+batch_streamer = BatchPredictionStreamer(
+    model_manager,
+    target_size=target_size,
+    batch_size=prediction_config.batch_endpoint_size,
+    decode_workers=prediction_config.decode_workers,
+    max_image_bytes=prediction_config.max_image_bytes,
+    cache=cache,
+    executor=inference_executor,
+    draft_decode=prediction_config.draft_decode
+)
+
+# A swapped-in model invalidates predictions cached for the old one
+model_manager.on_swap = lambda new_predictor: cache.set_fingerprint(new_predictor.model_fingerprint)
+
+
+startup_profiler.mark("service_setup")
+
+
+async def load_initial_model():
+    """Import TensorFlow, load and warm the initial model, then mark the service ready."""
+    global startup_error
+    try:
+        _, model_path = model_manager.resolve_initial(fallback_path=prediction_config.model_path)
+        if resolve_backend_name(model_path, prediction_config.backend) in ("keras", "savedmodel"):
+            with startup_profiler.phase("tensorflow_import"):
+                await asyncio.to_thread(importlib.import_module, "tensorflow")
+
+        await asyncio.to_thread(model_manager.load_initial, prediction_config.model_path)
+        predictor = model_manager.current
+        startup_profiler.record("model_deserialize", predictor.load_timings["model_deserialize_s"])
+        startup_profiler.record("warmup", predictor.load_timings["warmup_s"])
+
+        await model_manager.start()
+        model_ready.set()
+        startup_profiler.ready()
+    except Exception as e:
+        startup_error = str(e)
+        logging.error(f"Initial model load failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await batcher.start()
+    loader_task = asyncio.create_task(load_initial_model())
+    yield
+    loader_task.cancel()
+    await model_manager.stop()
+    await batcher.stop()
+    inference_executor.shutdown()
+    cache.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+def overloaded_response(e: ServerOverloaded) -> JSONResponse:
+    return JSONResponse(
+        {"error": str(e)},
+        status_code=prediction_config.overload_status_code,
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+
+class AdmittedStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that releases the request's admission ticket when the
+    response ends for any reason: fully sent, client disconnected, cancelled,
+    or never started streaming. Releasing is idempotent, so the generator
+    may also release it as soon as its last line is produced.
+    """
+
+    def __init__(self, content, ticket, **kwargs):
+        super().__init__(content, **kwargs)
+        self.ticket = ticket
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.ticket.release()
+
+
+def not_ready_response() -> JSONResponse:
+    return JSONResponse(
+        {"error": "Model is still loading", "startup_error": startup_error},
+        status_code=503,
+        headers={"Retry-After": str(prediction_config.retry_after_seconds)}
+    )
+
+
+def preprocess_upload(image_bytes: bytes):
+    """Decode and resize/normalize an upload, timing each stage."""
+    with serving_metrics.decode.time():
+        img = open_image_bytes(image_bytes, draft_size=DRAFT_SIZE)
+    with serving_metrics.resize_normalize.time():
+        return resize_and_normalize(img, target_size)
 
-# Load model
-predictor = ImagePredictor("artifacts/training/model.h5")
 
 # Serve static files
 app.mount("/frontend", StaticFiles(directory="frontend"), name="frontend")
@@ -21,30 +196,232 @@ async def root():
     return FileResponse("frontend/index.html")
 
 
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving HTTP."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: 200 once the model is loaded and warmed up, 503 before."""
+    body = {"ready": model_ready.is_set(), "model_version": model_manager.version,
+            "startup_error": startup_error, "startup": startup_profiler.report()}
+    return JSONResponse(body, status_code=200 if model_ready.is_set() else 503)
+
+
 @app.post("/predict")
 async def predict(file: UploadFile = File(...)):
+    if not model_ready.is_set():
+        serving_metrics.requests.inc(("predict", "503"))
+        return not_ready_response()
+
+    serving_metrics.in_flight.inc()
+    stage = "validate"
     try:
         if not file.filename.lower().endswith((".png", ".jpg", ".jpeg")):
+            serving_metrics.requests.inc(("predict", "400"))
             return JSONResponse({"error": "Invalid file type"}, status_code=400)
 
-        temp_filename = f"temp_{uuid.uuid4()}.png"
+        # Refuse early instead of piling up latency
+        with inference_executor.admit():
+            # Decode straight from the upload buffer, no temp file
+            stage = "upload_read"
+            with serving_metrics.upload_read.time():
+                image_bytes = await file.read()
+
+            cache_key = cache.key(image_bytes)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                label, confidence = cached
+                model_version = model_manager.version
+            else:
+                stage = "preprocess"
+                img_array = await asyncio.to_thread(preprocess_upload, image_bytes)
+                stage = "forward"
+                result = await batcher.submit(img_array)
+                label, confidence, model_version = result.label, result.confidence, result.version
+                cache.put(cache_key, label, confidence, fingerprint=result.fingerprint)
+
+        stage = "serialization"
+        with serving_metrics.serialization.time():
+            response = JSONResponse({
+                "filename": file.filename,
+                "prediction": label,
+                "confidence": float(confidence),
+                "model_version": model_version
+            })
+        serving_metrics.requests.inc(("predict", "200"))
+        serving_metrics.images.inc(("predict",))
+        return response
+
+    except ServerOverloaded as e:
+        serving_metrics.requests.inc(("predict", OVERLOAD_STATUS))
+        return overloaded_response(e)
+
+    except Exception as e:
+        serving_metrics.errors.inc(("predict", stage))
+        serving_metrics.requests.inc(("predict", "500"))
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+    finally:
+        serving_metrics.in_flight.dec()
+
+
+@app.post("/predict/batch")
+async def predict_batch(files: List[UploadFile] = File(...)):
+    """Score many images (or zip archives of images), one NDJSON line per image."""
+    if not model_ready.is_set():
+        serving_metrics.requests.inc(("predict_batch", "503"))
+        return not_ready_response()
 
-        with open(temp_filename, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+    try:
+        ticket = inference_executor.admit()
+    except ServerOverloaded as e:
+        serving_metrics.requests.inc(("predict_batch", OVERLOAD_STATUS))
+        return overloaded_response(e)
+
+    def stream():
+        # Hold the admission slot until the last line is sent
+        serving_metrics.in_flight.inc()
+        try:
+            with ticket:
+                for line in batch_streamer.stream(files):
+                    serving_metrics.images.inc(("predict_batch",))
+                    yield line
+            serving_metrics.requests.inc(("predict_batch", "200"))
+        except Exception:
+            serving_metrics.errors.inc(("predict_batch", "stream"))
+            raise
+        finally:
+            serving_metrics.in_flight.dec()
+
+    # Sync generator: Starlette iterates it in a worker thread
+    return AdmittedStreamingResponse(stream(), ticket, media_type="application/x-ndjson")
+
+
+@app.post("/predict/tensor")
+async def predict_tensor(request: Request):
+    """
+    Score already decoded images sent as a raw `.npy` file or a KTNS tensor
+    (see project/pipeline/tensor_ingest.py): one (H, W, C) image or an
+    (N, H, W, C) batch, uint8 or float32 in [0, 1], matching IMAGE_SIZE.
+    """
+    if not model_ready.is_set():
+        serving_metrics.requests.inc(("predict_tensor", "503"))
+        return not_ready_response()
 
-        label, confidence = predictor.predict(temp_filename)
+    serving_metrics.in_flight.inc()
+    stage = "upload_read"
+    try:
+        with inference_executor.admit():
+            with serving_metrics.upload_read.time():
+                body = bytearray()
+                async for chunk in request.stream():
+                    body.extend(chunk)
+                    if len(body) > MAX_TENSOR_BYTES:
+                        serving_metrics.requests.inc(("predict_tensor", "413"))
+                        return JSONResponse({"error": "Tensor payload too large"}, status_code=413)
+
+            stage = "validate"
+            try:
+                # Views the request buffer; uint8 is scaled in a single pass
+                batch = parse_tensor_payload(
+                    body, prediction_config.param_image_size, prediction_config.max_tensor_batch)
+            except TensorPayloadError as e:
+                serving_metrics.requests.inc(("predict_tensor", "400"))
+                return JSONResponse({"error": str(e)}, status_code=400)
+
+            stage = "forward"
+            if len(batch) == 1:
+                result = await batcher.submit(batch)
+                results, model_version = [(result.label, result.confidence)], result.version
+            else:
+                predictor = resolve_predictor(model_manager)
+                results = await inference_executor.run(predictor.predict_batch, batch)
+                model_version = predictor.version
 
-        os.remove(temp_filename)
+        stage = "serialization"
+        with serving_metrics.serialization.time():
+            response = JSONResponse({
+                "predictions": [
+                    {"prediction": label, "confidence": float(confidence)} for label, confidence in results
+                ],
+                "model_version": model_version
+            })
+        serving_metrics.requests.inc(("predict_tensor", "200"))
+        serving_metrics.images.inc(("predict_tensor",), amount=len(results))
+        return response
 
-        return {
-            "filename": file.filename,
-            "prediction": label,
-            "confidence": float(confidence)
-        }
+    except ServerOverloaded as e:
+        serving_metrics.requests.inc(("predict_tensor", OVERLOAD_STATUS))
+        return overloaded_response(e)
 
     except Exception as e:
+        serving_metrics.errors.inc(("predict_tensor", stage))
+        serving_metrics.requests.inc(("predict_tensor", "500"))
         return JSONResponse({"error": str(e)}, status_code=500)
 
+    finally:
+        serving_metrics.in_flight.dec()
+
+
+@app.get("/stats/batching")
+async def batching_stats():
+    return batcher.stats()
+
+
+@app.get("/stats/cache")
+async def cache_stats():
+    return cache.stats()
+
+
+@app.get("/stats/executor")
+async def executor_stats():
+    return inference_executor.stats()
+
+
+@app.get("/stats/startup")
+async def startup_stats():
+    return startup_profiler.report()
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition of the serving metrics."""
+    return Response(serving_metrics.render(), media_type=serving_metrics.registry.content_type)
+
+
+@app.get("/admin/models")
+async def model_status():
+    return model_manager.status()
+
+
+@app.post("/admin/models/pin/{version}")
+async def pin_model(version: str):
+    """Serve `version` and stop following the newest registry version."""
+    try:
+        await model_manager.pin(version)
+    except KeyError as e:
+        return JSONResponse({"error": str(e)}, status_code=404)
+    return model_manager.status()
+
+
+@app.post("/admin/models/unpin")
+async def unpin_model():
+    model_manager.unpin()
+    return model_manager.status()
+
+
+@app.post("/admin/models/rollback")
+async def rollback_model():
+    """Re-serve the previously served version and pin it."""
+    try:
+        await model_manager.rollback()
+    except KeyError as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+    return model_manager.status()
+
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,116 @@
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import time
+import argparse
+import numpy as np
+
+from project.pipeline.backends import BACKENDS, available_backends, load_backend
+from project.pipeline.prediction import decode_image_bytes
+
+
+DEFAULT_MODELS = {
+    "keras": "artifacts/training/model.h5",
+    "savedmodel": "artifacts/training/model_export",
+    "tflite": "artifacts/tflite_export/model_float16.tflite",
+    "onnx": "artifacts/training/model.onnx",
+}
+
+
+def load_images(image_dir: str, limit: int, input_shape) -> np.ndarray:
+    """Load up to `limit` images from a directory tree, or random images if none given."""
+    if image_dir is None:
+        rng = np.random.default_rng(0)
+        return rng.random((limit, *input_shape), dtype=np.float32)
+
+    batch = []
+    for root, _, names in sorted(os.walk(image_dir)):
+        for name in sorted(names):
+            if name.lower().endswith((".png", ".jpg", ".jpeg")):
+                with open(os.path.join(root, name), "rb") as f:
+                    batch.append(decode_image_bytes(f.read(), input_shape[:2])[0])
+                if len(batch) == limit:
+                    return np.stack(batch)
+    return np.stack(batch)
+
+
+def latency(backend, img_batch, repeats):
+    backend(img_batch)  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        backend(img_batch)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return float(np.percentile(timings, 50)), float(np.percentile(timings, 99))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run every available backend on the same images and flag drift.")
+    for name, path in DEFAULT_MODELS.items():
+        parser.add_argument(f"--{name}", type=str, default=path, help=f"{name} model path")
+    parser.add_argument("--reference", type=str, default="keras", help="Backend used as ground truth")
+    parser.add_argument("--images", type=str, default=None, help="Image directory (random inputs if omitted)")
+    parser.add_argument("--limit", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--tolerance", type=float, default=1e-2, help="Max abs probability drift allowed")
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    backends = {}
+    for name in BACKENDS:
+        path = getattr(args, name)
+        if name not in available_backends():
+            print(f"skip {name:<11} runtime not installed")
+            continue
+        if not os.path.exists(path):
+            print(f"skip {name:<11} no model at {path}")
+            continue
+        backends[name] = load_backend(path, backend=name)
+
+    if args.reference not in backends:
+        raise SystemExit(f"Reference backend '{args.reference}' is not available")
+
+    images = load_images(args.images, args.limit, backends[args.reference].input_shape)
+    reference = backends[args.reference](images)
+
+    results, drifted = [], []
+    for name, backend in backends.items():
+        outputs = backend(images)
+        max_abs_diff = float(np.max(np.abs(outputs - reference)))
+        agreement = float(np.mean(np.argmax(outputs, axis=1) == np.argmax(reference, axis=1)))
+        p50, p99 = latency(backend, images[:args.batch_size], args.repeats)
+        ok = max_abs_diff <= args.tolerance and agreement == 1.0
+        if not ok:
+            drifted.append(name)
+
+        results.append({
+            "backend": name,
+            "max_abs_diff": max_abs_diff,
+            "top1_agreement": agreement,
+            "latency_p50_ms": p50,
+            "latency_p99_ms": p99,
+            "drift": not ok,
+        })
+        print(
+            f"{name:<11} max_abs_diff={max_abs_diff:.2e} agreement={agreement:.3f} "
+            f"p50={p50:.2f}ms p99={p99:.2f}ms {'DRIFT' if not ok else 'ok'}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"reference": args.reference, "batch_size": args.batch_size, "results": results}, f, indent=4)
+
+    if drifted:
+        raise SystemExit(f"Numerical drift above tolerance: {drifted}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+## python benchmarks/backend_parity.py --images artifacts/data_ingestion/kidney-ct-scan-image --limit 64
@@ -0,0 +1,112 @@
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import time
+import argparse
+import subprocess
+import urllib.request
+import urllib.error
+import numpy as np
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def status_of(url: str) -> int:
+    """HTTP status of a GET, or None while the server is not listening yet."""
+    try:
+        with urllib.request.urlopen(url, timeout=1.0) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, ConnectionError, OSError):
+        return None
+
+
+def fetch_json(url: str) -> dict:
+    try:
+        with urllib.request.urlopen(url, timeout=5.0) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return json.loads(e.read())
+
+
+def time_import() -> float:
+    """Seconds to `import app` in a fresh interpreter (no model load happens at import)."""
+    code = "import time; t = time.perf_counter(); import app; print(time.perf_counter() - t)"
+    output = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def cold_start(port: int, timeout: float) -> dict:
+    """Launch uvicorn and time process start -> /healthz 200 -> /readyz 200."""
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port)],
+        cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    healthy_s = ready_s = None
+    try:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {process.returncode}")
+            if healthy_s is None and status_of(f"{base}/healthz") == 200:
+                healthy_s = time.perf_counter() - start
+            if healthy_s is not None and status_of(f"{base}/readyz") == 200:
+                ready_s = time.perf_counter() - start
+                break
+            time.sleep(0.02)
+        profile = fetch_json(f"{base}/stats/startup") if healthy_s is not None else None
+    finally:
+        process.terminate()
+        process.wait()
+
+    return {"time_to_healthz_s": healthy_s, "time_to_readyz_s": ready_s, "startup_profile": profile}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start: time to liveness and readiness of the API.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    runs = []
+    for run in range(args.runs):
+        result = cold_start(args.port, args.timeout)
+        result["import_app_s"] = time_import()
+        runs.append(result)
+        print(
+            f"run {run}: import app={result['import_app_s']:.2f}s  "
+            f"healthz={result['time_to_healthz_s']}s  readyz={result['time_to_readyz_s']}s"
+        )
+        if result["startup_profile"]:
+            print(f"        phases: {result['startup_profile']['phases_s']}")
+
+    ready = [r["time_to_readyz_s"] for r in runs if r["time_to_readyz_s"] is not None]
+    summary = {
+        "runs": runs,
+        "median_time_to_healthz_s": float(np.median([r["time_to_healthz_s"] for r in runs
+                                                     if r["time_to_healthz_s"] is not None] or [np.nan])),
+        "median_time_to_readyz_s": float(np.median(ready)) if ready else None,
+    }
+    print(f"median healthz={summary['median_time_to_healthz_s']:.2f}s  "
+          f"readyz={summary['median_time_to_readyz_s']}s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
+
+
+## python benchmarks/cold_start.py --runs 3
@@ -0,0 +1,93 @@
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import time
+import argparse
+import tensorflow as tf
+
+from project.configeration import ConfigerationManager
+from project.components.tfrecord_conversion import load_tfrecord_dataset
+
+
+def directory_dataset(config):
+    return tf.keras.utils.image_dataset_from_directory(
+        config.training_data,
+        validation_split=0.2,
+        subset="training",
+        seed=42,
+        image_size=tuple(config.param_image_size[:-1]),
+        batch_size=config.param_batch_size,
+        shuffle=True,
+        label_mode="categorical"
+    )
+
+
+def tfrecord_dataset(config):
+    return load_tfrecord_dataset(config.tfrecord_dir, "train", config.param_batch_size, shuffle=True)
+
+
+def prepare(dataset):
+    """Same normalization and prefetching as Training.train_valid_generator."""
+    rescale = tf.keras.layers.Rescaling(1.0 / 255)
+    return dataset.map(lambda x, y: (rescale(x), y)).prefetch(tf.data.AUTOTUNE)
+
+
+def time_epochs(build, config, epochs: int, model=None) -> list:
+    """Wall time of each epoch, building the dataset (directory listing included) first."""
+    start = time.perf_counter()
+    dataset = prepare(build(config))
+    setup_s = time.perf_counter() - start
+
+    timings = []
+    for _ in range(epochs):
+        start = time.perf_counter()
+        if model is not None:
+            model.fit(dataset, epochs=1, verbose=0)
+        else:
+            for _ in dataset:
+                pass
+        timings.append(time.perf_counter() - start)
+    return {"setup_s": setup_s, "epoch_s": timings}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Epoch time: image directory vs sharded TFRecords.")
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--with-model", action="store_true",
+                        help="Time full training epochs of the prepared base model, not just the input pipeline")
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    config = ConfigerationManager().get_training_config()
+
+    model = None
+    if args.with_model:
+        model = tf.keras.models.load_model(config.update_base_model)
+        model.compile(optimizer="adam", loss="categorical_crossentropy", metrics=["accuracy"])
+
+    results = {
+        "mode": "training" if args.with_model else "input_pipeline",
+        "directory": time_epochs(directory_dataset, config, args.epochs, model),
+        "tfrecord": time_epochs(tfrecord_dataset, config, args.epochs, model),
+    }
+    for name in ("directory", "tfrecord"):
+        epochs = results[name]["epoch_s"]
+        print(f"{name:>10}  setup={results[name]['setup_s']:.2f}s  "
+              f"epochs={', '.join(f'{t:.2f}s' for t in epochs)}")
+    results["speedup"] = sum(results["directory"]["epoch_s"]) / sum(results["tfrecord"]["epoch_s"])
+    print(f"speedup: {results['speedup']:.2f}x")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
+
+
+## python benchmarks/epoch_time.py --epochs 3 --with-model
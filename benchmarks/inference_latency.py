@@ -0,0 +1,80 @@
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import time
+import argparse
+import numpy as np
+
+from project.pipeline.prediction import ImagePredictor
+
+
+def measure(fn, batch, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(batch)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return {
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p99_ms": float(np.percentile(timings, 99)),
+        "mean_ms": float(np.mean(timings)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="model.predict vs traced tf.function inference latency.")
+    parser.add_argument("--model", type=str, default="artifacts/training/model.h5")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--repeats", type=int, default=100)
+    parser.add_argument("--jit-compile", action="store_true", help="Also benchmark the XLA compiled path")
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    # Cold start: time from construction to ready, including warm-up
+    variants = {}
+    start = time.perf_counter()
+    variants["model.predict"] = ImagePredictor(args.model, compiled=False, warmup_batch_sizes=args.batch_sizes)
+    load_ms = {"model.predict": (time.perf_counter() - start) * 1000.0}
+
+    start = time.perf_counter()
+    variants["tf.function"] = ImagePredictor(args.model, compiled=True, warmup_batch_sizes=args.batch_sizes)
+    load_ms["tf.function"] = (time.perf_counter() - start) * 1000.0
+
+    if args.jit_compile:
+        start = time.perf_counter()
+        variants["tf.function+xla"] = ImagePredictor(
+            args.model, compiled=True, jit_compile=True, warmup_batch_sizes=args.batch_sizes
+        )
+        load_ms["tf.function+xla"] = (time.perf_counter() - start) * 1000.0
+
+    rng = np.random.default_rng(0)
+    input_shape = variants["model.predict"].input_shape
+    results = {"load_and_warmup_ms": load_ms, "latency": []}
+
+    for batch_size in args.batch_sizes:
+        batch = rng.random((batch_size, *input_shape), dtype=np.float32)
+        reference = variants["model.predict"].predict_probabilities(batch)
+
+        for name, predictor in variants.items():
+            stats = measure(predictor.predict_probabilities, batch, args.repeats)
+            stats["max_abs_diff"] = float(np.max(np.abs(predictor.predict_probabilities(batch) - reference)))
+            results["latency"].append({"variant": name, "batch_size": batch_size, **stats})
+            print(
+                f"batch={batch_size:<3} {name:<16} p50={stats['p50_ms']:.2f}ms "
+                f"p99={stats['p99_ms']:.2f}ms max_abs_diff={stats['max_abs_diff']:.2e}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
+
+
+## python benchmarks/inference_latency.py --batch-sizes 1 8 --jit-compile
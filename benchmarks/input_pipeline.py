@@ -0,0 +1,72 @@
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import time
+import argparse
+import itertools
+from dataclasses import replace
+
+from project.configeration import ConfigerationManager
+from project.components.model_training import Training
+
+
+def images_per_second(config, epochs: int) -> dict:
+    """Iterate the training input pipeline alone (no model) and time each epoch."""
+    trainer = Training(config)
+    trainer.train_valid_generator()
+
+    epoch_rates = []
+    for _ in range(epochs):
+        images = 0
+        start = time.perf_counter()
+        for batch, _ in trainer.train_data:
+            images += int(batch.shape[0])
+        epoch_rates.append(images / (time.perf_counter() - start))
+    return {"images_per_s": epoch_rates, "steady_state_images_per_s": max(epoch_rates)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Input pipeline throughput (images/sec) per configuration.")
+    parser.add_argument("--epochs", type=int, default=2, help="Epochs per configuration (cache fills on the first)")
+    parser.add_argument("--parallel", type=int, nargs="+", default=[1, -1], help="NUM_PARALLEL_CALLS values")
+    parser.add_argument("--cache", nargs="+", default=["none", "memory"], help="DATA_CACHE values")
+    parser.add_argument("--deterministic", nargs="+", default=["true", "false"])
+    parser.add_argument("--augment-in", nargs="+", default=["pipeline", "model"], help="AUGMENT_IN values")
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    base = ConfigerationManager().get_training_config()
+    results = []
+    for parallel, cache, deterministic, augment_in in itertools.product(
+            args.parallel, args.cache, args.deterministic, args.augment_in):
+        config = replace(
+            base,
+            param_num_parallel_calls=parallel,
+            param_data_cache=cache,
+            param_deterministic=deterministic == "true",
+            param_augment_in=augment_in
+        )
+        result = images_per_second(config, args.epochs)
+        result.update({"parallel": parallel, "cache": cache,
+                       "deterministic": deterministic == "true", "augment_in": augment_in})
+        results.append(result)
+        print(
+            f"parallel={parallel:>3} cache={cache:<6} deterministic={deterministic:<5} "
+            f"augment_in={augment_in:<8} "
+            f"images/s={', '.join(f'{r:.0f}' for r in result['images_per_s'])}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
+
+
+## python benchmarks/input_pipeline.py --epochs 2 --parallel 1 -1 --cache none memory
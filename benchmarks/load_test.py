@@ -0,0 +1,232 @@
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import io
+import json
+import time
+import random
+import asyncio
+import argparse
+from collections import Counter
+import numpy as np
+import httpx
+from PIL import Image
+
+
+def synthetic_images(count: int, size: int) -> list:
+    """Create `count` distinct synthetic CT-like PNG uploads."""
+    rng = np.random.default_rng(0)
+    images = []
+    for _ in range(count):
+        pixels = rng.integers(0, 256, size=(size, size), dtype=np.uint8)
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).convert("RGB").save(buffer, format="PNG")
+        images.append(buffer.getvalue())
+    return images
+
+
+def sample_images(directory: str, limit: int) -> list:
+    """Read up to `limit` PNG/JPEG files from a directory tree."""
+    images = []
+    for root, _, names in os.walk(directory):
+        for name in sorted(names):
+            if name.lower().endswith((".png", ".jpg", ".jpeg")):
+                with open(os.path.join(root, name), "rb") as f:
+                    images.append(f.read())
+                if len(images) >= limit:
+                    return images
+    return images
+
+
+def tensor_payloads(images: list, image_size: int) -> list:
+    """Decode uploads once and re-encode them as KTNS uint8 tensors for /predict/tensor."""
+    from project.pipeline.tensor_ingest import encode_tensor
+
+    payloads = []
+    for image_bytes in images:
+        img = Image.open(io.BytesIO(image_bytes)).convert("RGB").resize((image_size, image_size), Image.NEAREST)
+        payloads.append(encode_tensor(np.asarray(img, dtype=np.uint8)))
+    return payloads
+
+
+class LoadGenerator:
+    """
+    Sends requests to the API and records per-request latency and status.
+
+    Closed loop: `concurrency` workers each send the next request as soon as
+    the previous one finishes. Open loop: requests start on a fixed schedule
+    (`rps`) whether or not earlier ones have finished, and latency is measured
+    from the scheduled start so server stalls are not hidden.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, endpoint: str, payloads: list, cache_bust: bool = False):
+        self.client = client
+        self.endpoint = endpoint
+        self.payloads = payloads
+        self.cache_bust = cache_bust
+        self.latencies = []
+        self.statuses = Counter()
+
+    async def _send(self, payload: bytes, scheduled: float):
+        if self.cache_bust and self.endpoint != "/predict/tensor":
+            # Trailing bytes are ignored by the image decoders but change the cache key
+            payload = payload + random.randbytes(8)
+        try:
+            if self.endpoint == "/predict/tensor":
+                response = await self.client.post(self.endpoint, content=payload)
+            else:
+                response = await self.client.post(
+                    self.endpoint, files={"file": ("image.png", payload, "image/png")})
+            status = str(response.status_code)
+        except Exception as e:
+            status = type(e).__name__
+        self.latencies.append(time.perf_counter() - scheduled)
+        self.statuses[status] += 1
+
+    async def closed_loop(self, concurrency: int, duration: float):
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                await self._send(random.choice(self.payloads), time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    async def open_loop(self, rps: float, duration: float, max_outstanding: int):
+        start = time.perf_counter()
+        interval = 1.0 / rps
+        tasks = set()
+        sent = 0
+        while sent * interval < duration:
+            scheduled = start + sent * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(tasks) >= max_outstanding:
+                self.statuses["dropped"] += 1
+            else:
+                task = asyncio.create_task(self._send(random.choice(self.payloads), scheduled))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            sent += 1
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    def report(self, elapsed: float) -> dict:
+        latencies_ms = np.asarray(self.latencies) * 1000.0
+        total = sum(self.statuses.values())
+        ok = self.statuses.get("200", 0)
+        return {
+            "requests": total,
+            "succeeded": ok,
+            "error_rate": (total - ok) / total if total else 0.0,
+            "statuses": dict(self.statuses),
+            "elapsed_s": elapsed,
+            "throughput_rps": ok / elapsed if elapsed > 0 else 0.0,
+            "latency_ms": {
+                "p50": float(np.percentile(latencies_ms, 50)) if len(latencies_ms) else None,
+                "p95": float(np.percentile(latencies_ms, 95)) if len(latencies_ms) else None,
+                "p99": float(np.percentile(latencies_ms, 99)) if len(latencies_ms) else None,
+                "mean": float(latencies_ms.mean()) if len(latencies_ms) else None,
+                "max": float(latencies_ms.max()) if len(latencies_ms) else None,
+            },
+        }
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float):
+    """Poll /readyz until the model is loaded."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get("/readyz")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise TimeoutError("Service did not become ready")
+
+
+async def run(args, payloads: list) -> dict:
+    timeout = httpx.Timeout(args.request_timeout)
+    limits = httpx.Limits(max_connections=max(args.concurrency, args.max_outstanding))
+
+    if args.in_process:
+        from app import app
+
+        # Run the app's lifespan (model load, batcher, executor) around the test
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://app", timeout=timeout) as client:
+                return await drive(client, args, payloads)
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=timeout, limits=limits) as client:
+        return await drive(client, args, payloads)
+
+
+async def drive(client: httpx.AsyncClient, args, payloads: list) -> dict:
+    await wait_ready(client, args.ready_timeout)
+    generator = LoadGenerator(client, args.endpoint, payloads, cache_bust=args.cache_bust)
+
+    start = time.perf_counter()
+    if args.mode == "open":
+        await generator.open_loop(args.rps, args.duration, args.max_outstanding)
+    else:
+        await generator.closed_loop(args.concurrency, args.duration)
+    report = generator.report(time.perf_counter() - start)
+
+    report["config"] = {
+        "mode": args.mode, "endpoint": args.endpoint, "duration_s": args.duration,
+        "rps": args.rps if args.mode == "open" else None,
+        "concurrency": args.concurrency if args.mode == "closed" else None,
+        "target": "in-process" if args.in_process else args.url,
+        "images": len(payloads), "cache_bust": args.cache_bust,
+    }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open/closed-loop load test of the prediction API.")
+    parser.add_argument("--mode", choices=["open", "closed"], default="closed")
+    parser.add_argument("--rps", type=float, default=20.0, help="Open loop: request rate")
+    parser.add_argument("--concurrency", type=int, default=8, help="Closed loop: concurrent clients")
+    parser.add_argument("--max-outstanding", type=int, default=512,
+                        help="Open loop: requests in flight before new ones are dropped")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--endpoint", choices=["/predict", "/predict/tensor"], default="/predict")
+    parser.add_argument("--url", type=str, default="http://127.0.0.1:8000")
+    parser.add_argument("--in-process", action="store_true", help="Drive app.py's ASGI app without a server")
+    parser.add_argument("--images", type=str, default=None, help="Directory of sample images")
+    parser.add_argument("--num-images", type=int, default=32)
+    parser.add_argument("--image-size", type=int, default=512, help="Synthetic image size")
+    parser.add_argument("--cache-bust", action="store_true", help="Make every upload miss the prediction cache")
+    parser.add_argument("--request-timeout", type=float, default=30.0)
+    parser.add_argument("--ready-timeout", type=float, default=300.0)
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    images = sample_images(args.images, args.num_images) if args.images else synthetic_images(args.num_images, args.image_size)
+    if args.endpoint == "/predict/tensor":
+        from project.configeration import ConfigerationManager
+
+        image_size = ConfigerationManager().get_prediction_config().param_image_size[0]
+        payloads = tensor_payloads(images, image_size)
+    else:
+        payloads = images
+
+    report = asyncio.run(run(args, payloads))
+    print(json.dumps(report, indent=4))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
+
+
+## python benchmarks/load_test.py --mode open --rps 50 --duration 30 --cache-bust --output baseline.json
+## python benchmarks/load_test.py --mode closed --concurrency 16 --in-process
@@ -0,0 +1,131 @@
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import io
+import json
+import time
+import argparse
+import numpy as np
+from PIL import Image, ImageFilter
+
+from project.pipeline.prediction import decode_image_bytes
+
+
+def make_jpeg(width: int, height: int, quality: int = 90) -> bytes:
+    """Create a synthetic CT-like JPEG: smooth structures plus mild noise."""
+    rng = np.random.default_rng(0)
+    yy, xx = np.mgrid[0:height, 0:width].astype(np.float32)
+    pixels = 128 + 60 * np.sin(xx / (width / 7)) * np.cos(yy / (height / 5))
+    pixels += rng.normal(0, 8, size=(height, width))
+    img = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    img.convert("RGB").save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def load_jpegs(directory: str, limit: int) -> list:
+    """Read up to `limit` real JPEGs from a directory tree."""
+    images = []
+    for root, _, names in os.walk(directory):
+        for name in sorted(names):
+            if name.lower().endswith((".jpg", ".jpeg")):
+                with open(os.path.join(root, name), "rb") as f:
+                    images.append(f.read())
+            if len(images) >= limit:
+                return images
+    return images
+
+
+def throughput(image_bytes: bytes, target_size, draft: bool, repeats: int) -> dict:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        decode_image_bytes(image_bytes, target_size=target_size, draft=draft)
+        timings.append(time.perf_counter() - start)
+    return {
+        "p50_ms": float(np.percentile(timings, 50) * 1000.0),
+        "images_per_s": float(1.0 / np.mean(timings)),
+    }
+
+
+def pixel_parity(image_bytes: bytes, target_size) -> dict:
+    full = decode_image_bytes(image_bytes, target_size=target_size)
+    reduced = decode_image_bytes(image_bytes, target_size=target_size, draft=True)
+    diff = np.abs(full - reduced)
+    return {"max_abs_diff": float(diff.max()), "mean_abs_diff": float(diff.mean())}
+
+
+def prediction_parity(model_path: str, images: list, target_size) -> dict:
+    """Compare model outputs of the full and reduced decode paths."""
+    from project.pipeline.prediction import ImagePredictor
+
+    predictor = ImagePredictor(model_path)
+    full = np.concatenate([decode_image_bytes(b, target_size) for b in images])
+    reduced = np.concatenate([decode_image_bytes(b, target_size, draft=True) for b in images])
+    p_full = predictor.predict_probabilities(full)
+    p_reduced = predictor.predict_probabilities(reduced)
+    return {
+        "images": len(images),
+        "label_agreement": float(np.mean(np.argmax(p_full, 1) == np.argmax(p_reduced, 1))),
+        "max_probability_diff": float(np.max(np.abs(p_full - p_reduced))),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full vs reduced-resolution (draft) JPEG decode.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 512, 1024, 2048, 4096])
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--images", type=str, default=None,
+                        help="Directory of real JPEGs used for the parity check")
+    parser.add_argument("--model", type=str, default=None,
+                        help="Model used to check prediction parity on --images")
+    parser.add_argument("--limit", type=int, default=256)
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    target_size = (224, 224)
+    results = {"throughput": []}
+
+    for size in args.sizes:
+        image_bytes = make_jpeg(size, size)
+        full = throughput(image_bytes, target_size, False, args.repeats)
+        reduced = throughput(image_bytes, target_size, True, args.repeats)
+        parity = pixel_parity(image_bytes, target_size)
+        results["throughput"].append({
+            "source_size": size, "full": full, "reduced": reduced,
+            "speedup": reduced["images_per_s"] / full["images_per_s"], **parity,
+        })
+        print(
+            f"{size:>5}px  full={full['images_per_s']:.0f} img/s  "
+            f"reduced={reduced['images_per_s']:.0f} img/s  "
+            f"speedup={reduced['images_per_s'] / full['images_per_s']:.2f}x  "
+            f"mean_abs_diff={parity['mean_abs_diff']:.4f}"
+        )
+
+    if args.images:
+        images = load_jpegs(args.images, args.limit)
+        diffs = [pixel_parity(b, target_size) for b in images]
+        results["dataset_pixel_parity"] = {
+            "images": len(images),
+            "max_abs_diff": max(d["max_abs_diff"] for d in diffs),
+            "mean_abs_diff": float(np.mean([d["mean_abs_diff"] for d in diffs])),
+        }
+        print(f"dataset pixel parity: {results['dataset_pixel_parity']}")
+
+        if args.model:
+            results["prediction_parity"] = prediction_parity(args.model, images, target_size)
+            print(f"prediction parity: {results['prediction_parity']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
+
+
+## python benchmarks/reduced_decode.py --images artifacts/data_ingestion --model artifacts/training/model.h5
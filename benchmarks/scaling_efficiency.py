@@ -0,0 +1,106 @@
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import time
+import argparse
+import tempfile
+import statistics
+from dataclasses import replace
+
+from project.pipeline.distributed import launch_local_workers
+
+
+def run_worker(args):
+    """One cluster member: train for a few epochs and, on the chief, write the epoch timings."""
+    import tensorflow as tf
+    from project.configeration import ConfigerationManager
+    from project.components.model_training import Training
+
+    config = replace(
+        ConfigerationManager().get_training_config(),
+        param_distributed=True,
+        param_feature_cache=False,
+        param_epochs=args.epochs
+    )
+    trainer = Training(config)
+    trainer.get_base_model()
+    trainer.train_valid_generator()
+
+    epoch_times = []
+    timer = tf.keras.callbacks.LambdaCallback(
+        on_epoch_begin=lambda epoch, logs: epoch_times.append(time.perf_counter()),
+        on_epoch_end=lambda epoch, logs: epoch_times.__setitem__(-1, time.perf_counter() - epoch_times[-1])
+    )
+    # No validation and no saving: only the training step is measured
+    trainer._training_model().fit(
+        trainer.train_data,
+        epochs=args.epochs,
+        steps_per_epoch=trainer.train_data.cardinality().numpy(),
+        callbacks=[timer],
+        verbose=0
+    )
+
+    if trainer.is_chief:
+        # The first epoch includes graph tracing and collective setup
+        steady = epoch_times[1:] or epoch_times
+        with open(args.result, "w") as f:
+            json.dump({
+                "workers": trainer.strategy.num_replicas_in_sync,
+                "global_batch_size": trainer.global_batch_size,
+                "images": len(trainer.train_files),
+                "epoch_s": epoch_times,
+                "images_per_s": len(trainer.train_files) / statistics.median(steady),
+            }, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-worker training throughput and scaling efficiency.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Cluster sizes to run")
+    parser.add_argument("--epochs", type=int, default=3, help="Epochs per run (the first is warm-up)")
+    parser.add_argument("--threads-per-worker", type=int, default=None,
+                        help="Intra-op threads per worker, same for every run (default: CPU count / max workers)")
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON output path")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--result", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    threads = args.threads_per_worker or max(1, (os.cpu_count() or 1) // max(args.workers))
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_workers in sorted(args.workers):
+            result_path = os.path.join(tmp, f"workers-{num_workers}.json")
+            command = [sys.executable, os.path.abspath(__file__), "--worker",
+                       "--epochs", str(args.epochs), "--result", result_path]
+            exit_codes = launch_local_workers(num_workers, command, threads, log_dir=os.path.join(tmp, "logs"))
+            if any(exit_codes):
+                raise RuntimeError(f"{num_workers} workers failed: exit codes {exit_codes}")
+            with open(result_path) as f:
+                results.append(json.load(f))
+
+    # Efficiency relative to the smallest cluster: 1.0 means per-worker throughput is unchanged
+    base = results[0]
+    for result in results:
+        result["threads_per_worker"] = threads
+        result["speedup"] = result["images_per_s"] / base["images_per_s"]
+        result["scaling_efficiency"] = result["speedup"] * base["workers"] / result["workers"]
+        print(f"workers={result['workers']:>2}  images/s={result['images_per_s']:8.1f}  "
+              f"speedup={result['speedup']:.2f}x  efficiency={result['scaling_efficiency']:.0%}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
+
+
+## python benchmarks/scaling_efficiency.py --workers 1 2 4 --epochs 3 --threads-per-worker 2
@@ -0,0 +1,104 @@
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import io
+import json
+import time
+import uuid
+import shutil
+import argparse
+import numpy as np
+import tensorflow as tf
+from PIL import Image
+
+from project.pipeline.prediction import decode_image_bytes
+
+
+def make_upload(width: int, height: int, fmt: str = "PNG") -> bytes:
+    """Create a synthetic encoded CT-like grayscale image."""
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 256, size=(height, width), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).convert("RGB").save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def temp_file_path(image_bytes: bytes, target_size) -> np.ndarray:
+    """The previous /predict path: write upload to disk, read it back with load_img."""
+    temp_filename = f"temp_{uuid.uuid4()}.png"
+    with open(temp_filename, "wb") as buffer:
+        shutil.copyfileobj(io.BytesIO(image_bytes), buffer)
+
+    img = tf.keras.utils.load_img(temp_filename, target_size=target_size)
+    img_array = tf.keras.utils.img_to_array(img)
+    img_array = np.expand_dims(img_array, axis=0) / 255.0
+
+    os.remove(temp_filename)
+    return img_array
+
+
+def in_memory_path(image_bytes: bytes, target_size) -> np.ndarray:
+    """The new /predict path: decode straight from the upload buffer."""
+    return decode_image_bytes(image_bytes, target_size=target_size)
+
+
+def time_it(fn, image_bytes, target_size, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(image_bytes, target_size)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return {
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p99_ms": float(np.percentile(timings, 99)),
+        "mean_ms": float(np.mean(timings)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-request decode latency: temp file vs in-memory.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[224, 512, 1024])
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    target_size = (224, 224)
+    results = []
+
+    for size in args.sizes:
+        image_bytes = make_upload(size, size)
+
+        # Parity: both paths must produce the same tensor
+        max_abs_diff = float(np.max(np.abs(
+            temp_file_path(image_bytes, target_size) - in_memory_path(image_bytes, target_size)
+        )))
+
+        old = time_it(temp_file_path, image_bytes, target_size, args.repeats)
+        new = time_it(in_memory_path, image_bytes, target_size, args.repeats)
+
+        results.append({
+            "source_size": size,
+            "temp_file": old,
+            "in_memory": new,
+            "saved_p50_ms": old["p50_ms"] - new["p50_ms"],
+            "max_abs_diff": max_abs_diff,
+        })
+        print(
+            f"{size:>5}px  temp_file p50={old['p50_ms']:.2f}ms  "
+            f"in_memory p50={new['p50_ms']:.2f}ms  "
+            f"saved={old['p50_ms'] - new['p50_ms']:.2f}ms  max_abs_diff={max_abs_diff:.2e}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
+
+
+## python benchmarks/upload_decode.py --sizes 224 512 1024
@@ -0,0 +1,148 @@
+import os
+import sys
+import time
+import numpy as np
+import tensorflow as tf
+from pathlib import Path
+from dataclasses import replace
+from project.entity.config import BackboneBenchmarkConfig, PrepareBasemodelConfig, TrainingConfig
+from project.components.prepare_basemodel import PrepareBaseModel
+from project.components.model_training import Training
+from project.exception import CustomException
+from project.logger import logging
+from project.utils import save_json
+
+
+class BackboneBenchmark:
+    """
+    Compares backbones for CPU serving: latency, size and accuracy.
+
+    Each backbone goes through the regular stages with its own paths: the
+    base model is prepared with the benchmark head, the head is trained for a
+    few epochs on the training split and scored on the validation split.
+    The trained model is then timed at batch size 1 and at BATCH_SIZE.
+
+    Attributes:
+        config (BackboneBenchmarkConfig): Backbones, head and report paths.
+        prepare_config (PrepareBasemodelConfig): Base settings for model preparation.
+        training_config (TrainingConfig): Base settings for training.
+    """
+
+    def __init__(self, config: BackboneBenchmarkConfig, prepare_config: PrepareBasemodelConfig,
+                 training_config: TrainingConfig):
+        self.config = config
+        self.prepare_config = prepare_config
+        self.training_config = training_config
+
+    def _latency(self, model: tf.keras.Model, images: np.ndarray) -> dict:
+        single = images[:1]
+        model(single, training=False)
+        model(images, training=False)  # warm-up at both batch sizes
+
+        timings = []
+        for _ in range(self.config.latency_runs):
+            start = time.perf_counter()
+            model(single, training=False)
+            timings.append((time.perf_counter() - start) * 1000.0)
+
+        start = time.perf_counter()
+        runs = max(1, self.config.latency_runs // 5)
+        for _ in range(runs):
+            model(images, training=False)
+        batch_s = (time.perf_counter() - start) / runs
+
+        return {
+            "latency_p50_ms": float(np.percentile(timings, 50)),
+            "latency_p95_ms": float(np.percentile(timings, 95)),
+            "batch_images_per_s": len(images) / batch_s,
+        }
+
+    def benchmark_backbone(self, backbone: str) -> dict:
+        """Prepare, train and measure one backbone."""
+        root = Path(self.config.root_dir) / backbone
+        root.mkdir(parents=True, exist_ok=True)
+
+        prepare = PrepareBaseModel(replace(
+            self.prepare_config,
+            param_backbone=backbone,
+            param_head=self.config.head,
+            base_model=root / "base_model.h5",
+            update_base_model=root / "update_base_model.h5"
+        ))
+        prepare.get_base_model()
+        prepare.update_base_model()
+
+        trainer = Training(replace(
+            self.training_config,
+            update_base_model=root / "update_base_model.h5",
+            trained_model_path=root / "model.h5",
+            param_epochs=self.config.epochs,
+            param_feature_cache=False,
+            param_distributed=False,
+            param_resume=False
+        ))
+        trainer.get_base_model()
+        trainer.train_valid_generator()
+
+        # fit directly: Training.train would also overwrite final_model/
+        start = time.perf_counter()
+        trainer._training_model().fit(
+            trainer.train_data,
+            epochs=self.config.epochs,
+            steps_per_epoch=trainer.train_data.cardinality().numpy(),
+            verbose=2
+        )
+        train_s = time.perf_counter() - start
+        _, accuracy = trainer.model.evaluate(trainer.val_data, verbose=0)
+        trainer.save_model(root / "model.h5", trainer.model)
+
+        images = next(iter(trainer.val_data))[0].numpy()
+        result = {
+            "backbone": backbone,
+            "head": self.config.head,
+            "params_m": trainer.model.count_params() / 1e6,
+            "trainable_params": int(sum(np.prod(w.shape) for w in trainer.model.trainable_weights)),
+            "size_mb": os.path.getsize(root / "model.h5") / 1024 / 1024,
+            "val_accuracy": float(accuracy),
+            "train_s": train_s,
+        }
+        result.update(self._latency(trainer.model, images))
+        return result
+
+    @staticmethod
+    def _table(results: list) -> str:
+        lines = [
+            "| backbone | head | params (M) | size (MB) | p50 latency (ms) | p95 latency (ms) | batch images/s | val accuracy |",
+            "|---|---|---|---|---|---|---|---|",
+        ]
+        for r in results:
+            lines.append(
+                f"| {r['backbone']} | {r['head']} | {r['params_m']:.1f} | {r['size_mb']:.1f} | "
+                f"{r['latency_p50_ms']:.1f} | {r['latency_p95_ms']:.1f} | {r['batch_images_per_s']:.1f} | "
+                f"{r['val_accuracy']:.3f} |"
+            )
+        return "\n".join(lines) + "\n"
+
+    def run(self) -> list:
+        """
+        Benchmark every configured backbone and write the JSON report and Markdown table.
+
+        Returns:
+            list: One result dict per backbone.
+        """
+        try:
+            results = []
+            for backbone in self.config.backbones:
+                logging.info(f"Benchmarking backbone {backbone}")
+                results.append(self.benchmark_backbone(backbone))
+                logging.info(f"{backbone}: {results[-1]}")
+                tf.keras.backend.clear_session()
+
+            save_json(path=Path(self.config.report_file_path), data={r["backbone"]: r for r in results})
+            table = self._table(results)
+            with open(self.config.table_file_path, "w") as f:
+                f.write(table)
+            logging.info(f"Backbone benchmark:\n{table}")
+            return results
+        except Exception as e:
+            raise CustomException(e, sys)
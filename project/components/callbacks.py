@@ -1,5 +1,10 @@
 import os
+import json
 import time
+import resource
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import tensorflow as tf
 from project.entity.config import PrepareCallbackConfig
 from project.exception import CustomException
@@ -7,6 +12,392 @@ from project.logger import logging
 import sys
 
 
+def is_chief_worker(strategy=None) -> bool:
+    """
+    Whether this process is the one that writes shared training outputs.
+
+    True for a single local process, the "chief" task, or worker 0 of a
+    cluster without a chief (the TF_CONFIG layout of `pipeline/distributed.py`).
+    """
+    strategy = strategy or tf.distribute.get_strategy()
+    resolver = getattr(strategy, "cluster_resolver", None)
+    if resolver is None or resolver.task_type is None:
+        return True
+    if resolver.task_type == "chief":
+        return True
+    return (resolver.task_type == "worker" and resolver.task_id == 0
+            and "chief" not in resolver.cluster_spec().as_dict())
+
+
+class AsyncWriter:
+    """
+    Single background thread for training-time disk writes.
+
+    Callbacks do the cheap part (snapshotting tensors into memory) on the
+    training thread and hand the slow part (serialization, fsync, rename)
+    to `submit`. With `coalesce=True` a write of the same kind that is still
+    queued when a newer one arrives is dropped, so at most one stale
+    snapshot waits in memory.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-writer")
+        self._queued = {}
+        self._pending = set()
+        self._error = None
+        # Reentrant: cancelling a future runs its done-callback while the lock is held
+        self._lock = threading.RLock()
+        self.stats = {}
+
+    def _stat(self, kind: str) -> dict:
+        return self.stats.setdefault(kind, {"writes": 0, "dropped": 0, "blocking_s": 0.0, "write_s": 0.0})
+
+    def record_blocking(self, kind: str, seconds: float):
+        """Account time the training thread spent preparing a write."""
+        with self._lock:
+            self._stat(kind)["blocking_s"] += seconds
+
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+            for kind, queued in list(self._queued.items()):
+                if queued is future:
+                    del self._queued[kind]
+            if not future.cancelled() and future.exception() is not None and self._error is None:
+                self._error = future.exception()
+
+    def submit(self, kind: str, fn, *args, coalesce: bool = True):
+        """
+        Run `fn(*args)` on the writer thread, accounted under `kind`.
+
+        Args:
+            kind (str): Report key of the write.
+            fn (callable): The write.
+            coalesce (bool): Drop a still-queued write of the same kind
+                (snapshots); False keeps every write (e.g. log batches).
+        """
+        def run():
+            start = time.perf_counter()
+            fn(*args)
+            with self._lock:
+                stat = self._stat(kind)
+                stat["writes"] += 1
+                stat["write_s"] += time.perf_counter() - start
+
+        with self._lock:
+            if coalesce:
+                previous = self._queued.get(kind)
+                if previous is not None and previous.cancel():
+                    self._stat(kind)["dropped"] += 1
+            future = self._executor.submit(run)
+            self._pending.add(future)
+            if coalesce:
+                self._queued[kind] = future
+        future.add_done_callback(self._done)
+
+    def flush(self):
+        """Wait for every queued write and re-raise the first failure."""
+        with self._lock:
+            pending = list(self._pending)
+        for future in pending:
+            if not future.cancelled():
+                future.exception()
+        if self._error is not None:
+            raise self._error
+
+    def report(self) -> dict:
+        """Per kind: writes, dropped snapshots, training-thread and background time."""
+        with self._lock:
+            report = {kind: dict(stat) for kind, stat in self.stats.items()}
+        for stat in report.values():
+            # What a synchronous callback would have blocked on, minus what this one did
+            stat["recovered_s"] = stat["write_s"] - stat["blocking_s"]
+        report["recovered_s"] = sum(stat["recovered_s"] for stat in report.values())
+        return report
+
+
+class AsyncModelCheckpoint(tf.keras.callbacks.Callback):
+    """
+    Best-model checkpoint written off the training thread.
+
+    At epoch end the weights are copied to host memory; a shadow clone of
+    the model receives them on the writer thread, is saved to a temporary
+    file and atomically renamed over `filepath`, so a reader never sees a
+    half-written model. In a multi-worker run only the chief writes.
+    """
+
+    def __init__(self, filepath, writer: AsyncWriter, monitor: str = "val_loss",
+                 save_best_only: bool = True):
+        super().__init__()
+        self.filepath = str(filepath)
+        self.writer = writer
+        self.monitor = monitor
+        self.save_best_only = save_best_only
+        self.mode = "max" if "acc" in monitor else "min"
+        self.best = None
+        self._shadow = None
+        self._chief = True
+
+    def on_train_begin(self, logs=None):
+        self._chief = is_chief_worker(self.model.distribute_strategy)
+        if self._chief and self._shadow is None:
+            self._shadow = tf.keras.models.clone_model(self.model)
+
+    def _improved(self, value) -> bool:
+        if self.best is None:
+            return True
+        return value > self.best if self.mode == "max" else value < self.best
+
+    def _write(self, weights: list):
+        self._shadow.set_weights(weights)
+        root, ext = os.path.splitext(self.filepath)
+        tmp_path = f"{root}.tmp{ext}"
+        self._shadow.save(tmp_path)
+        os.replace(tmp_path, self.filepath)
+
+    def on_epoch_end(self, epoch, logs=None):
+        if not self._chief:
+            return
+        value = (logs or {}).get(self.monitor)
+        if self.save_best_only:
+            if value is None or not self._improved(value):
+                return
+            self.best = value
+
+        start = time.perf_counter()
+        weights = [np.array(w, copy=True) for w in self.model.get_weights()]
+        self.writer.record_blocking("checkpoint", time.perf_counter() - start)
+        self.writer.submit("checkpoint", self._write, weights)
+
+
+class AsyncTensorBoard(tf.keras.callbacks.Callback):
+    """
+    Epoch scalars for TensorBoard, buffered and written in batches.
+
+    Logs are collected in memory and handed to the writer thread every
+    `flush_every` epochs (and at the end of training), which writes and
+    flushes them in one go instead of touching disk at every epoch. In a
+    multi-worker run only the chief writes.
+    """
+
+    def __init__(self, log_dir, writer: AsyncWriter, flush_every: int = 5):
+        super().__init__()
+        self.log_dir = str(log_dir)
+        self.writer = writer
+        self.flush_every = max(1, flush_every)
+        self._buffer = []
+        self._summary_writers = {}
+        self._chief = True
+
+    def on_train_begin(self, logs=None):
+        self._chief = is_chief_worker(self.model.distribute_strategy)
+
+    def _write(self, entries: list):
+        for split, step, scalars in entries:
+            if split not in self._summary_writers:
+                self._summary_writers[split] = tf.summary.create_file_writer(
+                    os.path.join(self.log_dir, split), max_queue=10_000, flush_millis=10 ** 9)
+            with self._summary_writers[split].as_default():
+                for name, value in scalars.items():
+                    tf.summary.scalar(f"epoch_{name}", value, step=step)
+        for summary_writer in self._summary_writers.values():
+            summary_writer.flush()
+
+    def _submit(self):
+        if self._buffer:
+            entries, self._buffer = self._buffer, []
+            # Log batches are never dropped, only snapshots are
+            self.writer.submit("tensorboard", self._write, entries, coalesce=False)
+
+    def on_epoch_end(self, epoch, logs=None):
+        if not self._chief:
+            return
+        start = time.perf_counter()
+        logs = {name: float(value) for name, value in (logs or {}).items()}
+        self._buffer.append(("train", epoch, {k: v for k, v in logs.items() if not k.startswith("val_")}))
+        self._buffer.append(("validation", epoch, {k[4:]: v for k, v in logs.items() if k.startswith("val_")}))
+        if (epoch + 1) % self.flush_every == 0:
+            self._submit()
+        self.writer.record_blocking("tensorboard", time.perf_counter() - start)
+
+    def on_train_end(self, logs=None):
+        self._submit()
+
+
+class AsyncWriterReport(tf.keras.callbacks.Callback):
+    """Drain the writer when training ends and save its report as JSON (chief only)."""
+
+    def __init__(self, writer: AsyncWriter, report_path):
+        super().__init__()
+        self.writer = writer
+        self.report_path = str(report_path)
+
+    def on_train_end(self, logs=None):
+        start = time.perf_counter()
+        self.writer.flush()
+        if not is_chief_worker(self.model.distribute_strategy):
+            return
+        report = self.writer.report()
+        report["final_flush_s"] = time.perf_counter() - start
+        os.makedirs(os.path.dirname(self.report_path), exist_ok=True)
+        with open(self.report_path, "w") as f:
+            json.dump(report, f, indent=4)
+        logging.info(f"Async callback writes: {report['recovered_s']:.2f}s of step time recovered")
+
+
+class StepTimeProfiler(tf.keras.callbacks.Callback):
+    """
+    Splits training step time into input wait and compute.
+
+    `instrument(dataset)` stamps each batch when it leaves the input
+    pipeline's prefetch buffer. A step that starts before its batch was
+    ready waited `ready - step start` on the iterator; the rest of the step
+    is compute. Stamps are keyed by (iterator, batch index) carried in the
+    dataset elements, because prefetching runs ahead of the steps and Keras
+    starts new iterators per epoch, per `fit` call and to build the model.
+    Per epoch, step wall times, the input/compute split, peak RSS and an
+    input-bound / compute-bound verdict are written to
+    `<log_dir>/epoch_<n>.json`.
+
+    Optionally a TensorFlow profiler trace is captured for the global steps
+    [start, stop) into `log_dir` (viewable in TensorBoard's Profile tab).
+    In a multi-worker run only the chief writes the summaries and the trace.
+    """
+
+    # Share of step time spent waiting on data above which an epoch is input-bound
+    INPUT_BOUND_THRESHOLD = 0.2
+
+    def __init__(self, log_dir, trace_steps: list = None):
+        super().__init__()
+        self.log_dir = str(log_dir)
+        self.trace_steps = tuple(trace_steps) if trace_steps else None
+        self.instrumented = False
+        self._ready = {}
+        self._lock = threading.Lock()
+        self._latest_iterator = 0
+        self._step_iterator, self._step_index = None, -1
+        self._global_step = 0
+        self._tracing = False
+        self._chief = True
+
+    def instrument(self, dataset: tf.data.Dataset) -> tf.data.Dataset:
+        """Return `dataset` with a ready-time stamp per batch (apply to the final training dataset)."""
+        def new_iterator():
+            with self._lock:
+                self._latest_iterator += 1
+                return np.int64(self._latest_iterator)
+
+        def stamp(iterator, index):
+            with self._lock:
+                self._ready[(int(iterator), int(index))] = time.perf_counter()
+            return np.int64(0)
+
+        def numbered(iterator):
+            def mark(index, batch):
+                token = tf.numpy_function(stamp, [iterator, index], tf.int64)
+                images, labels = batch
+                with tf.control_dependencies([token]):
+                    return tf.identity(images), labels
+            return dataset.enumerate().map(mark)
+
+        self.instrumented = True
+        # Runs once per iterator, so every iterator numbers its batches from 0 under a new id
+        iterators = tf.data.Dataset.from_tensors(np.int64(0)).map(
+            lambda _: tf.numpy_function(new_iterator, [], tf.int64))
+        instrumented = iterators.flat_map(numbered)
+        cardinality = int(dataset.cardinality())
+        if cardinality >= 0:
+            # Keras starts a new iterator per epoch only for datasets of known size
+            instrumented = instrumented.apply(tf.data.experimental.assert_cardinality(cardinality))
+        # The stamp runs when a batch leaves the upstream prefetch; the small buffer after it keeps that off the step
+        return instrumented.prefetch(1)
+
+    def _ready_time(self):
+        """Ready time of the batch the step that just ended consumed."""
+        with self._lock:
+            # Keras only consumes from its newest iterator
+            iterator = self._latest_iterator
+            if iterator != self._step_iterator:
+                self._step_iterator, self._step_index = iterator, -1
+                self._ready = {key: t for key, t in self._ready.items() if key[0] >= iterator}
+            self._step_index += 1
+            return self._ready.pop((iterator, self._step_index), None)
+
+    @staticmethod
+    def _peak_rss_mb() -> float:
+        # ru_maxrss is in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+    def on_train_begin(self, logs=None):
+        self._chief = is_chief_worker(self.model.distribute_strategy)
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._steps = []
+        self._epoch_start = time.perf_counter()
+
+    def on_train_batch_begin(self, batch, logs=None):
+        if self._chief and self.trace_steps and self._global_step == self.trace_steps[0]:
+            tf.profiler.experimental.start(self.log_dir)
+            self._tracing = True
+        self._step_start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        end = time.perf_counter()
+        step_s = end - self._step_start
+        wait_s = None
+        ready = self._ready_time() if self.instrumented else None
+        if ready is not None:
+            wait_s = min(step_s, max(0.0, ready - self._step_start))
+        self._steps.append((step_s, wait_s, self._peak_rss_mb()))
+
+        self._global_step += 1
+        if self._tracing and self._global_step >= self.trace_steps[1]:
+            tf.profiler.experimental.stop()
+            self._tracing = False
+
+    def on_epoch_end(self, epoch, logs=None):
+        if not self._chief or not self._steps:
+            return
+        step_s = np.array([s for s, _, _ in self._steps])
+        waits = [w for _, w, _ in self._steps if w is not None]
+        input_wait_s = float(np.sum(waits)) if waits else None
+        share = input_wait_s / float(step_s.sum()) if waits else None
+
+        summary = {
+            "epoch": epoch,
+            "steps": len(step_s),
+            "epoch_s": time.perf_counter() - self._epoch_start,
+            "step_s": {
+                "total": float(step_s.sum()),
+                "mean": float(step_s.mean()),
+                "p50": float(np.percentile(step_s, 50)),
+                "p95": float(np.percentile(step_s, 95)),
+                "max": float(step_s.max()),
+            },
+            "input_wait_s": input_wait_s,
+            "compute_s": float(step_s.sum()) - input_wait_s if waits else None,
+            "input_wait_share": share,
+            "bound": None if share is None else ("input" if share > self.INPUT_BOUND_THRESHOLD else "compute"),
+            "peak_rss_mb": max(rss for _, _, rss in self._steps),
+            "per_step": [
+                {"step_s": s, "input_wait_s": w, "peak_rss_mb": rss} for s, w, rss in self._steps
+            ],
+        }
+        os.makedirs(self.log_dir, exist_ok=True)
+        with open(os.path.join(self.log_dir, f"epoch_{epoch:03d}.json"), "w") as f:
+            json.dump(summary, f, indent=4)
+        if share is not None:
+            logging.info(
+                f"Epoch {epoch}: {share:.0%} of step time waiting on input "
+                f"({summary['bound']}-bound), peak RSS {summary['peak_rss_mb']:.0f} MB"
+            )
+
+    def on_train_end(self, logs=None):
+        if self._tracing:
+            tf.profiler.experimental.stop()
+            self._tracing = False
+
+
 class CallBacks:
     """
     Creates TensorBoard and ModelCheckpoint callbacks for training.
@@ -69,15 +460,61 @@ class CallBacks:
         except Exception as e:
             raise CustomException(e, sys)
 
+    @property
+    def create_step_profiler_callback(self) -> StepTimeProfiler:
+        """
+        Create a StepTimeProfiler writing next to the TensorBoard runs.
+
+        Returns:
+            StepTimeProfiler: Step time / input wait profiler callback.
+        """
+        try:
+            timestamp = time.strftime("%Y-%m-%d-%H-%M-%S")
+            log_dir = os.path.join(self.config.tensorboard_root_log_dir, f"step_profile_at_{timestamp}")
+            return StepTimeProfiler(log_dir, trace_steps=self.config.param_profile_trace_steps)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_async_callbacks(self) -> list:
+        """
+        Non-blocking equivalents of the TensorBoard and ModelCheckpoint callbacks.
+
+        Both share one background writer thread; the last callback drains it
+        at the end of training and writes `async_io.json` (time spent on the
+        training thread vs. in the background) into the TensorBoard run dir.
+
+        Returns:
+            list: AsyncTensorBoard, AsyncModelCheckpoint and AsyncWriterReport callbacks.
+        """
+        try:
+            timestamp = time.strftime("%Y-%m-%d-%H-%M-%S")
+            tb_log_dir = os.path.join(self.config.tensorboard_root_log_dir, f"tb_logs_at_{timestamp}")
+            writer = AsyncWriter()
+            return [
+                AsyncTensorBoard(tb_log_dir, writer, flush_every=self.config.param_tb_flush_every),
+                AsyncModelCheckpoint(self.config.checkpoint_model_filepath, writer, save_best_only=True),
+                AsyncWriterReport(writer, os.path.join(tb_log_dir, "async_io.json")),
+            ]
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def get_tb_ckpt_callbacks(self) -> list:
         """
         Returns a list of callbacks required during training.
 
         Returns:
-            list: Contains TensorBoard and ModelCheckpoint callbacks.
+            list: Contains TensorBoard and ModelCheckpoint callbacks
+            (their asynchronous versions when ASYNC_CALLBACKS is set),
+            plus the StepTimeProfiler when STEP_PROFILER is set.
         """
         try:    
-            return [self.create_tb_callback, self.create_ckpt_callback]
+            if self.config.param_async_callbacks:
+                callbacks = self.get_async_callbacks()
+            else:
+                callbacks = [self.create_tb_callback, self.create_ckpt_callback]
+            if self.config.param_step_profiler:
+                callbacks.append(self.create_step_profiler_callback)
+            return callbacks
         except Exception as e:
             raise CustomException(e, sys)
 
@@ -0,0 +1,180 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import tensorflow as tf
+from project.exception import CustomException
+from project.logger import logging
+
+
+class TrainingCheckpointer(tf.keras.callbacks.Callback):
+    """
+    Periodic, resumable training checkpoints.
+
+    Each checkpoint is a `tf.train.Checkpoint` of the model weights, the
+    optimizer state (iteration count and Adam moments) and the position in
+    the data stream as (epoch, step within the epoch). The iterator itself
+    is not saved: `Training` rebuilds the epoch's order from its epoch
+    number (`Training._replay_dataset`) and skips the trained steps, so
+    step-level resume is exact. Where the order cannot be replayed
+    (cached or TFRecord input) only epoch-end checkpoints are written.
+    A `CheckpointManager` rotates them: the newest `max_to_keep` are kept, plus one every
+    `keep_every_n_hours` when set.
+
+    `state.json` next to the checkpoints records a compatibility key (model
+    architecture, base model weights, precision, batch size, ...). A
+    checkpoint written under another key, or by a run that already
+    finished, is never restored.
+
+    In a multi-worker run every worker restores from the chief's
+    `checkpoint_dir` (a directory all workers can read), so all of them
+    resume with the same weights, optimizer state and position. Only the
+    chief writes there; the others save into a discarded temporary
+    directory, because saving a distributed checkpoint is a collective
+    every worker has to join.
+    """
+
+    def __init__(self, checkpoint_dir: str, model: tf.keras.Model, compat_key: str,
+                 max_to_keep: int = 3, keep_every_n_hours: float = None,
+                 save_every_steps: int = 0, is_chief: bool = True):
+        """
+        Args:
+            checkpoint_dir (str): Directory of the checkpoints and state.json.
+            model (tf.keras.Model): Compiled model passed to `fit`.
+            compat_key (str): Checkpoints are only restored under the same key.
+            max_to_keep (int): Newest checkpoints to keep.
+            keep_every_n_hours (float, optional): Also keep one checkpoint per
+                this many hours of training.
+            save_every_steps (int): Also save every N training steps
+                (0 = only at epoch ends).
+            is_chief (bool): Non-chief workers of a multi-worker run restore
+                from `checkpoint_dir` but write to a temporary directory
+                that is discarded.
+        """
+        super().__init__()
+        self.compat_key = compat_key
+        self.save_every_steps = save_every_steps
+        self.is_chief = is_chief
+        self.checkpoint_dir = str(checkpoint_dir)
+        self.write_dir = self.checkpoint_dir if is_chief else tempfile.mkdtemp(prefix="ckpt-worker-")
+        os.makedirs(self.write_dir, exist_ok=True)
+        self.state_path = os.path.join(self.checkpoint_dir, "state.json")
+
+        self.epoch = tf.Variable(0, dtype=tf.int64, trainable=False)
+        self.step = tf.Variable(0, dtype=tf.int64, trainable=False)
+        self.checkpoint = tf.train.Checkpoint(
+            model=model, optimizer=model.optimizer, epoch=self.epoch, step=self.step)
+        self.max_to_keep = max_to_keep
+        self.keep_every_n_hours = keep_every_n_hours
+        self.manager = self._new_manager()
+        self._fit_model = model
+        self.resume_epoch, self.resume_step = 0, 0
+        self._epoch_step = 0
+        self._current_epoch = 0
+
+    # ---------------------------------------------------------------------
+    def _new_manager(self) -> tf.train.CheckpointManager:
+        return tf.train.CheckpointManager(
+            self.checkpoint,
+            self.write_dir,
+            max_to_keep=self.max_to_keep,
+            keep_checkpoint_every_n_hours=self.keep_every_n_hours,
+            checkpoint_name="ckpt"
+        )
+
+    def _read_state(self) -> dict:
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            # Absent, or just cleared by the chief
+            return {}
+
+    def _write_state(self, completed: bool):
+        if not self.is_chief:
+            return
+        with open(f"{self.state_path}.tmp", "w") as f:
+            json.dump({"compat_key": self.compat_key, "completed": completed,
+                       "epoch": int(self.epoch.numpy()), "step": int(self.step.numpy())}, f)
+        os.replace(f"{self.state_path}.tmp", self.state_path)
+
+    def latest_compatible(self) -> str:
+        """
+        Path of the latest checkpoint that may be resumed, or None.
+
+        Checkpoints of an incompatible or finished run are discarded (by the chief).
+        """
+        try:
+            state = self._read_state()
+            latest = tf.train.latest_checkpoint(self.checkpoint_dir)
+            if latest is None:
+                return None
+            if state.get("compat_key") != self.compat_key or state.get("completed", True):
+                reason = "finished run" if state.get("compat_key") == self.compat_key else "incompatible run"
+                logging.info(f"Ignoring checkpoints of a {reason} in {self.checkpoint_dir}")
+                if self.is_chief:
+                    shutil.rmtree(self.checkpoint_dir)
+                    os.makedirs(self.checkpoint_dir)
+                    self.manager = self._new_manager()
+                return None
+            return latest
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def restore(self, checkpoint: str = "latest") -> tuple:
+        """
+        Restore a checkpoint. In a multi-worker run this is a collective:
+        every worker has to restore the same one (see `latest_compatible`).
+
+        Args:
+            checkpoint (str): Path from `latest_compatible`, None for a fresh
+                start, or "latest" to look it up here.
+
+        Returns:
+            tuple: (epoch, step) to resume from; (0, 0) for a fresh start.
+        """
+        try:
+            if checkpoint == "latest":
+                checkpoint = self.latest_compatible()
+            if checkpoint is None:
+                return 0, 0
+
+            # Create the optimizer slots first so their values are restored, not deferred
+            model = self._fit_model
+            with model.distribute_strategy.scope():
+                model.optimizer.build(model.trainable_variables)
+            self.checkpoint.restore(checkpoint).assert_existing_objects_matched()
+            self.resume_epoch, self.resume_step = int(self.epoch.numpy()), int(self.step.numpy())
+            logging.info(f"Resumed from {checkpoint} at epoch {self.resume_epoch}, step {self.resume_step}")
+            return self.resume_epoch, self.resume_step
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def save(self, epoch: int, step: int):
+        """Write a checkpoint at (epoch, step within epoch) and rotate old ones."""
+        self.epoch.assign(epoch)
+        self.step.assign(step)
+        path = self.manager.save()
+        self._write_state(completed=False)
+        logging.info(f"Saved checkpoint {path} (epoch {epoch}, step {step})")
+
+    # ---------------------------------------------------------------------
+    def on_epoch_begin(self, epoch, logs=None):
+        self._current_epoch = epoch
+        # The first resumed epoch starts after the batches it had already trained on
+        self._epoch_step = self.resume_step if epoch == self.resume_epoch else 0
+
+    def on_train_batch_end(self, batch, logs=None):
+        self._epoch_step += 1
+        if self.save_every_steps and self._epoch_step % self.save_every_steps == 0:
+            self.save(self._current_epoch, self._epoch_step)
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.save(epoch + 1, 0)
+
+    def mark_completed(self):
+        """Record that training finished, so the next run starts fresh."""
+        self._write_state(completed=True)
+        if not self.is_chief:
+            shutil.rmtree(self.write_dir, ignore_errors=True)
@@ -0,0 +1,266 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import numpy as np
+import tensorflow as tf
+from pathlib import Path
+from project.entity.config import DistillationConfig
+from project.exception import CustomException
+from project.logger import logging
+from project.utils import save_json
+
+
+class DistillationLoss(tf.keras.losses.Loss):
+    """
+    Hinton-style distillation loss on a softmax student.
+
+    `y_true` packs the one-hot label and the teacher's probabilities side by
+    side ([label | teacher], 2 * num_classes columns), so the standard
+    `fit` loop can carry both targets. Both distributions are softened with
+    `temperature` by rescaling their log-probabilities; the soft term is
+    scaled by T^2 so its gradients keep the magnitude of the hard term.
+    """
+
+    def __init__(self, num_classes: int, temperature: float = 4.0, alpha: float = 0.1,
+                 name: str = "distillation_loss", **kwargs):
+        super().__init__(name=name, **kwargs)
+        self.num_classes = num_classes
+        self.temperature = temperature
+        self.alpha = alpha
+
+    def call(self, y_true, y_pred):
+        labels, teacher = y_true[:, :self.num_classes], y_true[:, self.num_classes:]
+        y_pred = tf.cast(y_pred, tf.float32)
+        eps = tf.keras.backend.epsilon()
+
+        hard = tf.keras.losses.categorical_crossentropy(labels, y_pred)
+        soft_teacher = tf.nn.softmax(tf.math.log(teacher + eps) / self.temperature)
+        soft_student = tf.nn.log_softmax(tf.math.log(y_pred + eps) / self.temperature)
+        soft = tf.reduce_sum(
+            soft_teacher * (tf.math.log(soft_teacher + eps) - soft_student), axis=-1)
+        return self.alpha * hard + (1.0 - self.alpha) * self.temperature ** 2 * soft
+
+    def get_config(self):
+        config = super().get_config()
+        config.update({"num_classes": self.num_classes, "temperature": self.temperature, "alpha": self.alpha})
+        return config
+
+
+def build_student(image_size, num_classes: int, filters=(32, 64, 128, 256)) -> tf.keras.Model:
+    """
+    Small CNN student: Conv-BN-ReLU blocks with max pooling, global average
+    pooling and a float32 softmax. Takes the same [0, 1] images as the teacher,
+    so `ImagePredictor` serves it unchanged.
+    """
+    inputs = tf.keras.Input(shape=tuple(image_size))
+    x = inputs
+    for width in filters:
+        x = tf.keras.layers.Conv2D(width, 3, padding="same", use_bias=False)(x)
+        x = tf.keras.layers.BatchNormalization()(x)
+        x = tf.keras.layers.ReLU()(x)
+        x = tf.keras.layers.MaxPooling2D()(x)
+    x = tf.keras.layers.GlobalAveragePooling2D()(x)
+    outputs = tf.keras.layers.Dense(num_classes, activation="softmax", dtype="float32")(x)
+    return tf.keras.Model(inputs=inputs, outputs=outputs, name="student")
+
+
+class Distillation:
+    """
+    Distills the trained VGG16 teacher into a compact student CNN.
+
+    Teacher probabilities for the train and validation splits are computed
+    once and cached under a directory named after the teacher's file hash;
+    student epochs only read the cache. The student is trained on images
+    without augmentation, because cached targets belong to the plain images.
+
+    Attributes:
+        config (DistillationConfig): Paths and distillation settings.
+    """
+
+    def __init__(self, config: DistillationConfig):
+        self.config = config
+
+    # ---------------------------------------------------------------------
+    def split_files(self):
+        """Class names and the (files, labels) of the train/validation split used by Training."""
+        train_ds, val_ds = tf.keras.utils.image_dataset_from_directory(
+            self.config.training_data,
+            validation_split=0.2,
+            subset="both",
+            seed=42,
+            image_size=tuple(self.config.param_image_size[:-1]),
+            batch_size=None,
+            label_mode="int"
+        )
+        class_names = train_ds.class_names
+
+        def labelled(files):
+            return np.array([class_names.index(os.path.basename(os.path.dirname(f))) for f in files])
+
+        self.class_names = class_names
+        self.splits = {
+            "train": (list(train_ds.file_paths), labelled(train_ds.file_paths)),
+            "val": (list(val_ds.file_paths), labelled(val_ds.file_paths)),
+        }
+
+    def _load_image(self, path):
+        """Decode and resize like `image_dataset_from_directory`, then scale to [0, 1]."""
+        image = tf.io.decode_image(tf.io.read_file(path), channels=3, expand_animations=False)
+        image = tf.image.resize(image, tuple(self.config.param_image_size[:-1]), method="bilinear")
+        image.set_shape(tuple(self.config.param_image_size))
+        return tf.cast(image, tf.float32) / 255.0
+
+    def _images(self, files: list) -> tf.data.Dataset:
+        return (
+            tf.data.Dataset.from_tensor_slices(files)
+            .map(self._load_image, num_parallel_calls=tf.data.AUTOTUNE)
+            .batch(self.config.param_batch_size)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+
+    @staticmethod
+    def _file_hash(path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def teacher_targets(self) -> dict:
+        """
+        Teacher probabilities per split, from the cache or computed once.
+
+        Returns:
+            dict: {split: float32 array of shape (num_files, num_classes)}.
+        """
+        cache_dir = Path(self.config.teacher_cache_dir) / self._file_hash(self.config.teacher_model_path)[:16]
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+        targets, teacher = {}, None
+        self.teacher_cache_hit = True
+        for split, (files, _) in self.splits.items():
+            path = cache_dir / f"{split}.npz"
+            if path.exists():
+                cached = np.load(path)
+                if list(cached["files"]) == files:
+                    targets[split] = cached["probabilities"]
+                    continue
+
+            self.teacher_cache_hit = False
+            if teacher is None:
+                teacher = tf.keras.models.load_model(self.config.teacher_model_path, compile=False)
+            start = time.perf_counter()
+            probabilities = np.concatenate([
+                np.asarray(teacher(images, training=False), dtype=np.float32)
+                for images in self._images(files)
+            ])
+            logging.info(f"Teacher targets for {split} ({len(files)} images) in {time.perf_counter() - start:.1f}s")
+            np.savez(f"{path}.tmp.npz", files=np.array(files), probabilities=probabilities)
+            os.replace(f"{path}.tmp.npz", path)
+            targets[split] = probabilities
+        return targets
+
+    def _dataset(self, split: str, targets: np.ndarray, shuffle: bool) -> tf.data.Dataset:
+        files, labels = self.splits[split]
+        num_classes = len(self.class_names)
+        packed = np.concatenate([np.eye(num_classes, dtype=np.float32)[labels], targets], axis=1)
+        dataset = tf.data.Dataset.from_tensor_slices((files, packed))
+        if shuffle:
+            dataset = dataset.shuffle(len(files), seed=42, reshuffle_each_iteration=True)
+        return (
+            dataset.map(lambda path, y: (self._load_image(path), y), num_parallel_calls=tf.data.AUTOTUNE)
+            .batch(self.config.param_batch_size)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+
+    # ---------------------------------------------------------------------
+    def train_student(self, targets: dict) -> tf.keras.Model:
+        """Train the student on the packed hard labels and cached teacher targets, then save it."""
+        num_classes = len(self.class_names)
+
+        def hard_accuracy(y_true, y_pred):
+            return tf.keras.metrics.categorical_accuracy(y_true[:, :num_classes], y_pred)
+
+        student = build_student(self.config.param_image_size, num_classes, self.config.param_student_filters)
+        student.compile(
+            optimizer=tf.keras.optimizers.Adam(learning_rate=self.config.param_learning_rate),
+            loss=DistillationLoss(num_classes, self.config.param_temperature, self.config.param_alpha),
+            metrics=[hard_accuracy]
+        )
+        start = time.perf_counter()
+        student.fit(
+            self._dataset("train", targets["train"], shuffle=True),
+            epochs=self.config.param_epochs,
+            validation_data=self._dataset("val", targets["val"], shuffle=False),
+            verbose=1
+        )
+        self.train_s = time.perf_counter() - start
+
+        # Serving needs the architecture and weights only
+        student.save(self.config.student_model_path, include_optimizer=False)
+        return student
+
+    def _evaluate(self, model: tf.keras.Model) -> tuple:
+        files, labels = self.splits["val"]
+        probabilities = np.concatenate([
+            np.asarray(model(images, training=False), dtype=np.float32) for images in self._images(files)
+        ])
+        predictions = probabilities.argmax(axis=1)
+
+        single = next(iter(self._images(files[:1])))
+        model(single, training=False)
+        timings = []
+        for _ in range(self.config.latency_runs):
+            start = time.perf_counter()
+            model(single, training=False)
+            timings.append((time.perf_counter() - start) * 1000.0)
+
+        return predictions, {
+            "accuracy": float(np.mean(predictions == labels)),
+            "params_m": model.count_params() / 1e6,
+            "latency_p50_ms": float(np.percentile(timings, 50)),
+            "latency_p95_ms": float(np.percentile(timings, 95)),
+        }
+
+    def run(self) -> dict:
+        """
+        Distill, then compare teacher and student on the validation split.
+
+        Returns:
+            dict: Teacher and student accuracy, size and latency, their
+            prediction agreement and the student's size/latency gains.
+        """
+        try:
+            self.split_files()
+            targets = self.teacher_targets()
+            student = self.train_student(targets)
+
+            teacher = tf.keras.models.load_model(self.config.teacher_model_path, compile=False)
+            teacher_predictions, teacher_report = self._evaluate(teacher)
+            student_predictions, student_report = self._evaluate(student)
+            teacher_report["size_mb"] = os.path.getsize(self.config.teacher_model_path) / 1024 / 1024
+            student_report["size_mb"] = os.path.getsize(self.config.student_model_path) / 1024 / 1024
+
+            report = {
+                "teacher": teacher_report,
+                "student": student_report,
+                "agreement": float(np.mean(teacher_predictions == student_predictions)),
+                "accuracy_delta": student_report["accuracy"] - teacher_report["accuracy"],
+                "size_ratio": student_report["size_mb"] / teacher_report["size_mb"],
+                "speedup": teacher_report["latency_p50_ms"] / student_report["latency_p50_ms"],
+                "student_train_s": self.train_s,
+                "teacher_cache_hit": self.teacher_cache_hit,
+                "settings": {
+                    "temperature": self.config.param_temperature,
+                    "alpha": self.config.param_alpha,
+                    "epochs": self.config.param_epochs,
+                    "student_filters": list(self.config.param_student_filters),
+                },
+            }
+            save_json(path=Path(self.config.report_file_path), data=report)
+            logging.info(f"Distillation report: {json.dumps(report)}")
+            return report
+        except Exception as e:
+            raise CustomException(e, sys)
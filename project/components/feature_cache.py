@@ -0,0 +1,228 @@
+import os
+import sys
+import json
+import time
+import hashlib
+from bisect import bisect_right
+import numpy as np
+import tensorflow as tf
+from project.exception import CustomException
+from project.logger import logging
+
+
+def split_frozen_model(full_model: tf.keras.Model):
+    """
+    Split the model built by `PrepareBaseModel.prepare_model_layers` into its
+    convolutional backbone and its Flatten/GlobalAveragePooling + Dense head.
+
+    The head reuses the full model's pooling and Dense layers, so training the
+    head updates the full model's weights in place.
+
+    Returns:
+        tuple: (backbone, head) Keras models, or (None, None) when the backbone
+        has trainable weights and its features cannot be cached.
+    """
+    flatten, dense = full_model.layers[-2], full_model.layers[-1]
+    backbone = tf.keras.Model(inputs=full_model.input, outputs=flatten.input)
+    if backbone.trainable_weights:
+        return None, None
+
+    features = tf.keras.Input(shape=tuple(backbone.output_shape[1:]))
+    head = tf.keras.Model(inputs=features, outputs=dense(flatten(features)))
+    return backbone, head
+
+
+class BottleneckFeatureCache:
+    """
+    Memory-mapped cache of frozen-backbone features.
+
+    Entries are keyed by "<sha256 of image bytes>:<variant>" under a directory
+    named after the backbone's fingerprint, so a different backbone (weights or
+    architecture) never reads stale features. Variant 0 is the plain image;
+    variants 1..K-1 are fixed augmented copies.
+
+    Features are appended as float16 `.npy` shards opened with `np.load(mmap_mode="r")`;
+    `index.json` maps each key to a global row.
+    """
+
+    def __init__(self, root_dir: str, backbone: tf.keras.Model, image_size, batch_size: int = 32):
+        """
+        Args:
+            root_dir (str): Cache root directory.
+            backbone (tf.keras.Model): Frozen feature extractor.
+            image_size (tuple): Resize target (height, width).
+            batch_size (int): Batch size of the backbone forward passes.
+        """
+        self.backbone = backbone
+        self.image_size = tuple(image_size)
+        self.batch_size = batch_size
+        self.fingerprint = self.backbone_fingerprint(backbone)
+        self.cache_dir = os.path.join(str(root_dir), self.fingerprint[:16])
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.shard_names = []
+        self.shards = []
+        self._offsets = []
+        self.index = {}
+        self._load()
+
+    # ---------------------------------------------------------------------
+    @staticmethod
+    def backbone_fingerprint(backbone: tf.keras.Model) -> str:
+        """SHA-256 over the backbone's architecture and weights."""
+        digest = hashlib.sha256(backbone.to_json().encode())
+        for weight in backbone.get_weights():
+            digest.update(np.ascontiguousarray(weight).tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def image_hash(path: str) -> str:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    @property
+    def size(self) -> int:
+        return self._offsets[-1] + len(self.shards[-1]) if self.shards else 0
+
+    def _load(self):
+        index_path = os.path.join(self.cache_dir, "index.json")
+        if not os.path.exists(index_path):
+            return
+        with open(index_path) as f:
+            state = json.load(f)
+        for name in state["shards"]:
+            self._open_shard(name)
+        self.index = state["keys"]
+
+    def _open_shard(self, name: str):
+        self._offsets.append(self.size)
+        self.shard_names.append(name)
+        self.shards.append(np.load(os.path.join(self.cache_dir, name), mmap_mode="r"))
+
+    def _save_index(self):
+        index_path = os.path.join(self.cache_dir, "index.json")
+        with open(f"{index_path}.tmp", "w") as f:
+            json.dump({"shards": self.shard_names, "keys": self.index}, f)
+        os.replace(f"{index_path}.tmp", index_path)
+
+    # ---------------------------------------------------------------------
+    def _load_image(self, path):
+        """Decode and resize like `image_dataset_from_directory`, then scale to [0, 1]."""
+        image = tf.io.decode_image(tf.io.read_file(path), channels=3, expand_animations=False)
+        image = tf.image.resize(image, self.image_size, method="bilinear")
+        return tf.cast(image, tf.float32) / 255.0
+
+    def ensure(self, paths: list, variants: int = 1, augmentation=None) -> list:
+        """
+        Compute and store features for every (image, variant) not cached yet.
+
+        Args:
+            paths (list): Image file paths.
+            variants (int): Variants per image (1 = plain image only).
+            augmentation (callable, optional): Keras augmentation model applied
+                to variants >= 1.
+
+        Returns:
+            list: Image hashes, aligned with `paths`.
+        """
+        try:
+            hashes = [self.image_hash(p) for p in paths]
+            missing = [
+                (path, image_hash, variant)
+                for variant in range(variants)
+                for path, image_hash in zip(paths, hashes)
+                if f"{image_hash}:{variant}" not in self.index
+            ]
+            if not missing:
+                return hashes
+
+            start = time.perf_counter()
+            name = f"features-{len(self.shard_names):05d}.npy"
+            shard_path = os.path.join(self.cache_dir, name)
+            shard = np.lib.format.open_memmap(
+                f"{shard_path}.tmp", mode="w+", dtype=np.float16,
+                shape=(len(missing), *self.backbone.output_shape[1:])
+            )
+
+            row = 0
+            new_keys = {}
+            for variant in range(variants):
+                group = [(path, image_hash) for path, image_hash, v in missing if v == variant]
+                if not group:
+                    continue
+                dataset = (
+                    tf.data.Dataset.from_tensor_slices([path for path, _ in group])
+                    .map(self._load_image, num_parallel_calls=tf.data.AUTOTUNE)
+                    .batch(self.batch_size)
+                    .prefetch(tf.data.AUTOTUNE)
+                )
+                for images in dataset:
+                    if variant > 0 and augmentation is not None:
+                        images = augmentation(images, training=True)
+                    features = self.backbone(images, training=False).numpy()
+                    shard[row:row + len(features)] = features
+                    row += len(features)
+                base = self.size + row - len(group)
+                for offset, (_, image_hash) in enumerate(group):
+                    new_keys[f"{image_hash}:{variant}"] = base + offset
+
+            shard.flush()
+            del shard
+            os.replace(f"{shard_path}.tmp", shard_path)
+            self._open_shard(name)
+            self.index.update(new_keys)
+            self._save_index()
+
+            logging.info(
+                f"Cached {len(missing)} bottleneck features in {time.perf_counter() - start:.1f}s "
+                f"({self.cache_dir})"
+            )
+            return hashes
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def rows(self, hashes: list, variants: int = 1) -> np.ndarray:
+        """Global row ids of shape (len(hashes), variants)."""
+        return np.array(
+            [[self.index[f"{h}:{v}"] for v in range(variants)] for h in hashes], dtype=np.int64
+        )
+
+    def gather(self, rows: np.ndarray) -> np.ndarray:
+        """Read the features at global `rows` as a float32 batch."""
+        batch = np.empty((len(rows), *self.backbone.output_shape[1:]), dtype=np.float32)
+        for i, row in enumerate(rows):
+            shard = bisect_right(self._offsets, row) - 1
+            batch[i] = self.shards[shard][row - self._offsets[shard]]
+        return batch
+
+
+class CachedFeatureSequence(tf.keras.utils.Sequence):
+    """
+    Keras Sequence over cached features. Each epoch reshuffles and, when an
+    image has several cached variants, picks one of them at random.
+    """
+
+    def __init__(self, cache: BottleneckFeatureCache, rows: np.ndarray, labels: np.ndarray,
+                 batch_size: int, shuffle: bool = True, seed: int = 42, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.rows = rows
+        self.labels = labels
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(seed)
+        self.on_epoch_end()
+
+    def __len__(self):
+        return int(np.ceil(len(self.rows) / self.batch_size))
+
+    def __getitem__(self, index):
+        order = self.order[index * self.batch_size:(index + 1) * self.batch_size]
+        variants = self.rng.integers(0, self.rows.shape[1], size=len(order))
+        features = self.cache.gather(self.rows[order, variants])
+        return features, self.labels[order]
+
+    def on_epoch_end(self):
+        self.order = np.arange(len(self.rows))
+        if self.shuffle:
+            self.rng.shuffle(self.order)
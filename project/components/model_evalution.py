@@ -5,14 +5,14 @@ import yaml
 # Add project root to Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
+import time
+import numpy as np
 from pathlib import Path
 import tensorflow as tf
-import mlflow
 from project.entity.config import ModelEvaluationConfig
 from project.utils import save_json
-
-import dagshub
-dagshub.init(repo_owner='Ahmed2797', repo_name='Kidney-Disease-Classification-Deep-learning-project', mlflow=True)
+from project.components.tfrecord_conversion import load_tfrecord_dataset
+from project.pipeline.backends import cast_model_precision
 
 
 
@@ -31,16 +31,20 @@ class Evaluation:
         img_size = tuple(self.config.param_image_size[:-1])
         batch_size = self.config.param_batch_size
 
-        val_ds = tf.keras.utils.image_dataset_from_directory(
-            self.config.training_data_path,
-            validation_split=0.30,
-            subset="validation",
-            seed=42,
-            image_size=img_size,
-            batch_size=batch_size,
-            shuffle=False,
-            label_mode='categorical',
-        )
+        if self.config.param_use_tfrecords:
+            # Held-out split of the tfrecord_conversion stage, read with parallel interleave
+            val_ds = load_tfrecord_dataset(self.config.tfrecord_dir, "val", batch_size, shuffle=False)
+        else:
+            val_ds = tf.keras.utils.image_dataset_from_directory(
+                self.config.training_data_path,
+                validation_split=0.30,
+                subset="validation",
+                seed=42,
+                image_size=img_size,
+                batch_size=batch_size,
+                shuffle=False,
+                label_mode='categorical',
+            )
 
         normalization_layer = tf.keras.layers.Rescaling(1.0 / 255)
         val_ds = val_ds.map(lambda x, y: (normalization_layer(x), y))
@@ -59,10 +63,75 @@ class Evaluation:
         model = self.load_model(Path("artifacts/training/model.h5"))
         loss, accuracy = model.evaluate(self.valid_generator)
 
-        return {
+        results = {
             "loss": float(loss),
             "accuracy": float(accuracy)
         }
+        if self.config.param_precision == "mixed_bfloat16":
+            results["precision"] = self.compare_precision(model)
+
+        return results
+
+    # ---------------------------------------------------------------------
+    @staticmethod
+    def _time_model(model, images, labels, repeats: int = 5):
+        """Median single-batch inference latency and training step time (seconds)."""
+        infer = tf.function(lambda x: model(x, training=False))
+        infer(images)
+        latencies = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            infer(images).numpy()
+            latencies.append(time.perf_counter() - start)
+
+        model.compile(optimizer=tf.keras.optimizers.Adam(1e-5),
+                      loss=tf.keras.losses.CategoricalCrossentropy())
+        model.train_on_batch(images, labels)
+        steps = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            model.train_on_batch(images, labels)
+            steps.append(time.perf_counter() - start)
+
+        return float(np.median(latencies)), float(np.median(steps))
+
+    def compare_precision(self, model):
+        """
+        Accuracy parity and speed of the float32 model vs its mixed_bfloat16 copy.
+
+        Both copies are built from the same weights; timing uses one
+        validation batch, and the training steps run on throwaway clones.
+        """
+        variants = {
+            "float32": cast_model_precision(model, "float32"),
+            "mixed_bfloat16": cast_model_precision(model, "mixed_bfloat16"),
+        }
+        probabilities = {name: [] for name in variants}
+        labels = []
+        for images, batch_labels in self.valid_generator:
+            labels.append(np.argmax(batch_labels, axis=1))
+            for name, variant in variants.items():
+                probabilities[name].append(np.asarray(variant(images, training=False), dtype=np.float32))
+        labels = np.concatenate(labels)
+        probabilities = {name: np.concatenate(p) for name, p in probabilities.items()}
+
+        images, batch_labels = next(iter(self.valid_generator))
+        report = {}
+        for name, variant in variants.items():
+            latency, step_time = self._time_model(variant, images, batch_labels)
+            report[name] = {
+                "accuracy": float(np.mean(np.argmax(probabilities[name], axis=1) == labels)),
+                "batch_latency_s": latency,
+                "train_step_s": step_time,
+            }
+
+        report["label_agreement"] = float(np.mean(
+            np.argmax(probabilities["float32"], axis=1) == np.argmax(probabilities["mixed_bfloat16"], axis=1)))
+        report["max_probability_diff"] = float(np.max(np.abs(
+            probabilities["float32"] - probabilities["mixed_bfloat16"])))
+        report["inference_speedup"] = report["float32"]["batch_latency_s"] / report["mixed_bfloat16"]["batch_latency_s"]
+        report["train_step_speedup"] = report["float32"]["train_step_s"] / report["mixed_bfloat16"]["train_step_s"]
+        return report
 
     # ---------------------------------------------------------------------
     def save_outputs(self):
@@ -96,6 +165,11 @@ class Evaluation:
     # ---------------------------------------------------------------------
     def log_mlflow(self):
         """Log metrics and model to MLflow."""
+        # Imported here: dagshub.init touches the network, so only do it when logging
+        import mlflow
+        import dagshub
+        dagshub.init(repo_owner='Ahmed2797', repo_name='Kidney-Disease-Classification-Deep-learning-project', mlflow=True)
+
         os.environ["MLFLOW_TRACKING_URI"] = self.config.mlflow_tracking_uri
         os.environ["MLFLOW_TRACKING_USERNAME"] = "Ahmed2797"
         os.environ["MLFLOW_TRACKING_PASSWORD"] = "466cd6e40b4463c19cee521d93d34f35fb915367"
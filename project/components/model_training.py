@@ -1,10 +1,19 @@
+import os
+import json
 import math
+import hashlib
 import sys
+import numpy as np
 import tensorflow as tf
 from pathlib import Path
 from project.exception import CustomException
 from project.entity.config import TrainingConfig
 from project.utils import create_directories
+from project.logger import logging
+from project.components.tfrecord_conversion import load_tfrecord_dataset, load_tfrecord_metadata
+from project.components.checkpointing import TrainingCheckpointer
+from project.components.callbacks import StepTimeProfiler, is_chief_worker
+from project.pipeline.backends import cast_model_precision, needs_precision_cast, precision_policy
 
 
 
@@ -16,17 +25,58 @@ class Training:
             config: Instance of TrainingConfig containing all training parameters.
         """
         self.config = config
-        
+        # The strategy has to exist before any other TensorFlow op runs
+        self.strategy = self.get_strategy()
+        self.global_batch_size = self.config.param_batch_size * self.strategy.num_replicas_in_sync
+
+    def get_strategy(self) -> tf.distribute.Strategy:
+        """
+        MultiWorkerMirroredStrategy when DISTRIBUTED is set, else the default strategy.
+
+        The cluster comes from the TF_CONFIG environment variable (see
+        `project/pipeline/distributed.py`); without TF_CONFIG it runs as a
+        single worker.
+        """
+        if not self.config.param_distributed:
+            return tf.distribute.get_strategy()
+
+        strategy = tf.distribute.MultiWorkerMirroredStrategy()
+        resolver = strategy.cluster_resolver
+        logging.info(
+            f"MultiWorkerMirroredStrategy: {resolver.task_type}:{resolver.task_id}, "
+            f"{strategy.num_replicas_in_sync} replicas in sync"
+        )
+        return strategy
+
+    @property
+    def num_workers(self) -> int:
+        """Worker processes in the cluster (1 without TF_CONFIG)."""
+        resolver = getattr(self.strategy, "cluster_resolver", None)
+        if resolver is None or resolver.task_type is None:
+            return 1
+        spec = resolver.cluster_spec()
+        return sum(spec.num_tasks(job) for job in spec.jobs if job in ("chief", "worker"))
+
+    @property
+    def is_chief(self) -> bool:
+        """Whether this process writes the model (worker 0, or the single local process)."""
+        return is_chief_worker(self.strategy)
 
     def get_base_model(self):
-        """Load and compile the base model."""
+        """Load and compile the base model under the configured dtype policy."""
         try:
-            self.model = tf.keras.models.load_model(self.config.update_base_model)
-            self.model.compile(
-                optimizer=tf.keras.optimizers.Adam(learning_rate=self.config.param_learning_rate),
-                loss=tf.keras.losses.CategoricalCrossentropy(),
-                metrics=["accuracy"]
-            )
+            precision = self.config.param_precision
+            # Variables and optimizer slots are created by the strategy (mirrored across workers)
+            with precision_policy(precision), self.strategy.scope():
+                self.model = tf.keras.models.load_model(self.config.update_base_model, compile=False)
+                # Rebuild when the saved base model was prepared under another policy
+                if needs_precision_cast(self.model, precision):
+                    self.model = cast_model_precision(self.model, precision)
+                self.model.compile(
+                    optimizer=tf.keras.optimizers.Adam(learning_rate=self.config.param_learning_rate),
+                    loss=tf.keras.losses.CategoricalCrossentropy(),
+                    metrics=["accuracy"]
+                )
         except Exception as e:
             raise CustomException(e, sys)
 
@@ -38,61 +88,239 @@ class Training:
         try:
             # Image size: (H, W)
             img_size = tuple(self.config.param_image_size[:-1])
-            batch_size = self.config.param_batch_size
-
-            
-            train_ds = tf.keras.utils.image_dataset_from_directory(
-                self.config.training_data,
-                validation_split=0.2,
-                subset="training",
-                seed=42,
-                image_size=img_size,
-                batch_size=batch_size,
-                shuffle=True,
-                label_mode='categorical'
-            )
+            # BATCH_SIZE is per worker; the strategy splits each global batch across replicas
+            batch_size = self.global_batch_size
 
-        
-            val_ds = tf.keras.utils.image_dataset_from_directory(
-                self.config.training_data,
-                validation_split=0.2,
-                subset="validation",
-                seed=42,
-                image_size=img_size,
-                batch_size=batch_size,
-                shuffle=False,
-                label_mode='categorical'
-            )
+            if self.config.param_use_tfrecords:
+                # Pre-resized sharded records written by the tfrecord_conversion stage
+                metadata = load_tfrecord_metadata(self.config.tfrecord_dir)
+                train_ds = load_tfrecord_dataset(self.config.tfrecord_dir, "train", batch_size, shuffle=True)
+                val_ds = load_tfrecord_dataset(self.config.tfrecord_dir, "val", batch_size, shuffle=False)
 
-            
-            # Normalization Layer (replaces rescale=1./255)
-            normalization_layer = tf.keras.layers.Rescaling(1./255)
+                self.class_names = metadata["class_names"]
+                self.train_files = metadata["files"]["train"]
+                self.val_files = metadata["files"]["val"]
+            else:
+                train_ds = tf.keras.utils.image_dataset_from_directory(
+                    self.config.training_data,
+                    validation_split=0.2,
+                    subset="training",
+                    seed=42,
+                    image_size=img_size,
+                    batch_size=batch_size,
+                    shuffle=True,
+                    label_mode='categorical'
+                )
 
-            train_ds = train_ds.map(lambda x, y: (normalization_layer(x), y))
-            val_ds = val_ds.map(lambda x, y: (normalization_layer(x), y))
+                val_ds = tf.keras.utils.image_dataset_from_directory(
+                    self.config.training_data,
+                    validation_split=0.2,
+                    subset="validation",
+                    seed=42,
+                    image_size=img_size,
+                    batch_size=batch_size,
+                    shuffle=False,
+                    label_mode='categorical'
+                )
 
+                # File lists of the split, reused by the feature cache
+                self.class_names = train_ds.class_names
+                self.train_files = list(train_ds.file_paths)
+                self.val_files = list(val_ds.file_paths)
 
             # Data Augmentation (modern version)       
+            self.data_augmentation = None
             if self.config.params_augmentation:
-                data_augmentation = tf.keras.Sequential([
+                self.data_augmentation = tf.keras.Sequential([
                     tf.keras.layers.RandomRotation(0.1),
                     tf.keras.layers.RandomTranslation(0.2, 0.2),
                     tf.keras.layers.RandomZoom(0.2),
                     tf.keras.layers.RandomFlip("horizontal")
                 ])
 
-                train_ds = train_ds.map(lambda x, y: (data_augmentation(x, training=True), y))
-
-            # ------------------------------
-            # Enable Prefetching for Performance
-            # ------------------------------
-            self.train_data = train_ds.prefetch(buffer_size=tf.data.AUTOTUNE)
-            self.val_data = val_ds.prefetch(buffer_size=tf.data.AUTOTUNE)
+            self.train_data = self._input_pipeline(train_ds, len(self.train_files), training=True)
+            self.val_data = self._input_pipeline(val_ds, len(self.val_files), training=False)
         except Exception as e:
             raise CustomException(e, sys)
 
 
 
+    def _input_pipeline(self, dataset, num_images: int, training: bool):
+        """
+        Normalize, optionally cache, augment and prefetch a batched dataset.
+
+        Controlled by param.yaml:
+            NUM_PARALLEL_CALLS: parallel map calls (-1 = AUTOTUNE).
+            DETERMINISTIC: keep element order when mapping in parallel.
+            DATA_CACHE: "none", "memory" or "file". Decoded, resized images are
+                cached as rounded uint8 (4x smaller than float32) and reshuffled each epoch.
+            AUGMENT_IN: "pipeline" (tf.data map) or "model" (Keras layers run as
+                part of the training step, see `_training_model`).
+        """
+        parallel = tf.data.AUTOTUNE if self.config.param_num_parallel_calls < 0 else self.config.param_num_parallel_calls
+        batch_size = self.global_batch_size
+
+        options = tf.data.Options()
+        options.deterministic = self.config.param_deterministic
+        # Shard by element: every worker reads the full file list and keeps its
+        # 1/N of the batches. FILE sharding would break the asserted cardinality
+        # and needs at least as many shards as workers.
+        options.experimental_distribute.auto_shard_policy = tf.data.experimental.AutoShardPolicy.DATA
+        dataset = dataset.with_options(options)
+
+        if self.config.param_data_cache != "none":
+            cache_file = ""
+            if self.config.param_data_cache == "file":
+                create_directories([self.config.data_cache_dir])
+                # Name the cache after its contents so a changed dataset or size is never replayed
+                files = self.train_files if training else self.val_files
+                key = hashlib.sha256(json.dumps([sorted(files), list(self.config.param_image_size), "uint8-rounded"]).encode())
+                split = "train" if training else "val"
+                cache_file = os.path.join(str(self.config.data_cache_dir), f"{split}-{key.hexdigest()[:16]}")
+            dataset = (
+                dataset.unbatch()
+                .map(lambda x, y: (tf.cast(tf.clip_by_value(tf.round(x), 0, 255), tf.uint8), y),
+                     num_parallel_calls=parallel)
+                .apply(tf.data.experimental.assert_cardinality(num_images))
+                .cache(cache_file)
+            )
+            if training:
+                dataset = dataset.shuffle(min(num_images, 2048), seed=42, reshuffle_each_iteration=True)
+            dataset = dataset.batch(batch_size)
+
+        # Normalization Layer (replaces rescale=1./255)
+        normalization_layer = tf.keras.layers.Rescaling(1./255)
+        dataset = dataset.map(lambda x, y: (normalization_layer(tf.cast(x, tf.float32)), y),
+                              num_parallel_calls=parallel)
+
+        if training and self.data_augmentation is not None and self.config.param_augment_in == "pipeline":
+            data_augmentation = self.data_augmentation
+            dataset = dataset.map(lambda x, y: (data_augmentation(x, training=True), y),
+                                  num_parallel_calls=parallel)
+
+        return dataset.prefetch(buffer_size=tf.data.AUTOTUNE)
+
+    def _training_model(self):
+        """
+        Model used by `fit`. With AUGMENT_IN: model the augmentation layers are
+        prepended so they run inside the compiled training step; the saved
+        model stays `self.model`, whose weights are shared with the wrapper.
+        """
+        if self.data_augmentation is None or self.config.param_augment_in != "model":
+            return self.model
+
+        with precision_policy(self.config.param_precision), self.strategy.scope():
+            inputs = tf.keras.Input(shape=tuple(self.config.param_image_size))
+            outputs = self.model(self.data_augmentation(inputs))
+            model = tf.keras.Model(inputs=inputs, outputs=outputs)
+            model.compile(
+                optimizer=tf.keras.optimizers.Adam(learning_rate=self.config.param_learning_rate),
+                loss=tf.keras.losses.CategoricalCrossentropy(),
+                metrics=["accuracy"]
+            )
+        return model
+
+    def _checkpoint_key(self, model: tf.keras.Model) -> str:
+        """Settings a resumed run must share with the run that wrote the checkpoint."""
+        digest = hashlib.sha256(model.to_json().encode())
+        with open(self.config.update_base_model, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        digest.update(json.dumps([
+            self.config.param_precision, self.global_batch_size, self.config.param_learning_rate,
+            self.config.param_augment_in, self.config.param_use_tfrecords, self.config.param_data_cache
+        ]).encode())
+        return digest.hexdigest()
+
+    def restore_checkpoint(self, model: tf.keras.Model) -> tuple:
+        """
+        Create the `TrainingCheckpointer` of `model` and restore the latest
+        compatible checkpoint. Every worker restores from the chief's
+        `checkpoint_dir`, after checking that all of them found the same one.
+
+        Returns:
+            tuple: (checkpointer, (epoch, step) to resume from).
+        """
+        save_every_steps = self.config.param_checkpoint_every_steps
+        if save_every_steps and not self._replayable:
+            # Without a replayable order a mid-epoch resume could not skip exactly the trained batches
+            logging.info("CHECKPOINT_EVERY_STEPS needs DATA_CACHE: none and USE_TFRECORDS: False, "
+                         "checkpointing at epoch ends only")
+            save_every_steps = 0
+        checkpointer = TrainingCheckpointer(
+            self.config.checkpoint_dir,
+            model,
+            compat_key=self._checkpoint_key(model),
+            max_to_keep=self.config.param_checkpoints_to_keep,
+            keep_every_n_hours=self.config.param_checkpoint_keep_every_hours or None,
+            save_every_steps=save_every_steps,
+            is_chief=self.is_chief
+        )
+        checkpoint = checkpointer.latest_compatible()
+        self._check_same_checkpoint(checkpoint)
+        return checkpointer, checkpointer.restore(checkpoint)
+
+    def _check_same_checkpoint(self, checkpoint: str):
+        """
+        Fail fast when the workers of a DISTRIBUTED run found different
+        checkpoints, e.g. because `checkpoint_dir` is not shared. Restoring
+        and the `fit` calls that follow are collectives; workers at different
+        positions would hang in them or train on diverged weights.
+        """
+        if not self.config.param_distributed:
+            return
+        # CheckpointManager names checkpoints ckpt-<save number>
+        number = int(checkpoint.rsplit("-", 1)[1]) if checkpoint else -1
+        local = tf.constant([number], dtype=tf.int64)
+        numbers = self.strategy.gather(self.strategy.run(lambda: local), axis=0).numpy()
+        if (numbers != numbers[0]).any():
+            raise RuntimeError(
+                f"Workers found different checkpoints {numbers.tolist()} (-1 = none); "
+                f"checkpoint_dir {self.config.checkpoint_dir} must be readable by every worker"
+            )
+
+    @property
+    def _replayable(self) -> bool:
+        """Whether the training order is rebuilt from (epoch, step) by `_replay_dataset`."""
+        return (self.config.param_resume and not self.config.param_use_tfrecords
+                and self.config.param_data_cache == "none")
+
+    def _replay_dataset(self, first_epoch: int, last_epoch: int, skip_steps: int = 0):
+        """
+        Training batches of epochs [first_epoch, last_epoch) as one stream.
+
+        Each epoch visits the training files in a permutation seeded by its
+        epoch number (stateless `index_shuffle`), instead of the reshuffle of
+        `image_dataset_from_directory`, whose order a restarted process cannot
+        reproduce. A resumed run therefore skips exactly the `skip_steps`
+        batches the interrupted epoch had trained on. Images are decoded and
+        resized the same way and go through the same `_input_pipeline`.
+        """
+        files = tf.constant(self.train_files)
+        labels = tf.constant(self._labels(self.train_files))
+        num_images = len(self.train_files)
+        batch_size = self.global_batch_size
+        image_size = self.config.param_image_size
+
+        def load(index):
+            image = tf.io.decode_image(tf.io.read_file(files[index]), channels=3, expand_animations=False)
+            image = tf.image.resize(image, tuple(image_size[:-1]), method="bilinear")
+            image.set_shape(tuple(image_size))
+            return image, labels[index]
+
+        def epoch_batches(epoch):
+            seed = tf.stack([tf.constant(42, tf.int64), epoch])
+            order = tf.data.Dataset.range(num_images).map(
+                lambda i: tf.random.experimental.index_shuffle(i, seed, num_images - 1))
+            order = order.skip(tf.where(epoch == first_epoch, tf.constant(skip_steps * batch_size, tf.int64), 0))
+            # Ordered map: batch composition must not depend on thread timing
+            return order.map(load, num_parallel_calls=tf.data.AUTOTUNE, deterministic=True).batch(batch_size)
+
+        dataset = tf.data.Dataset.range(first_epoch, last_epoch).flat_map(epoch_batches)
+        options = tf.data.Options()
+        options.deterministic = True
+        return self._input_pipeline(dataset, num_images, training=True).with_options(options)
+
     @staticmethod
     def save_model(path: Path, model: tf.keras.Model):
         """Save the trained model to the given path."""
@@ -109,20 +337,76 @@ class Training:
         # steps_per_epoch = math.ceil(self.train_data.samples / self.train_data.batch_size)
         # validation_steps = math.ceil(self.val_data.samples / self.val_data.batch_size)
         try:
+            if self.config.param_feature_cache and self.config.param_distributed:
+                logging.info("Feature cache is not supported with DISTRIBUTED, training end to end")
+            elif self.config.param_feature_cache:
+                history = self.train_on_cached_features(callbacks)
+                if history is not None:
+                    return history
+
+            if self.num_workers > 1 and int(tf.keras.__version__.split(".")[0]) >= 3:
+                # Keras 3 fit cannot reduce distributed input batches or metrics across workers
+                raise RuntimeError(
+                    f"Keras {tf.keras.__version__} cannot run model.fit under MultiWorkerMirroredStrategy "
+                    f"across {self.num_workers} workers; train with one worker, or run every stage "
+                    f"on Keras 2 (tf-keras with TF_USE_LEGACY_KERAS=1)"
+                )
+
             steps_per_epoch = self.train_data.cardinality().numpy()
             validation_steps = self.val_data.cardinality().numpy()
 
+            model = self._training_model()
+            callbacks = list(callbacks or [])
+            checkpointer = None
+            initial_epoch, resume_step = 0, 0
+            if self.config.param_resume:
+                checkpointer, (initial_epoch, resume_step) = self.restore_checkpoint(model)
+                callbacks.append(checkpointer)
 
-            # Train the model
-            history = self.model.fit(
-                self.train_data,
-                epochs=self.config.param_epochs,
-                steps_per_epoch=steps_per_epoch,
-                validation_data=self.val_data,
-                validation_steps=validation_steps,
-                callbacks=callbacks,
-                verbose=1
-            )
+            # Stamp batches for the step profiler so it can tell input wait from compute
+            profiler = next((c for c in callbacks if isinstance(c, StepTimeProfiler)), None)
+            instrument = profiler.instrument if profiler is not None else (lambda dataset: dataset)
+
+            def epochs_data(first_epoch, last_epoch, skip_steps=0):
+                if self._replayable:
+                    return instrument(self._replay_dataset(first_epoch, last_epoch, skip_steps))
+                return instrument(self.train_data)
+
+            history = None
+            if resume_step:
+                # Finish the interrupted epoch on the batches it had not reached yet. Keras runs
+                # the same number of steps in every epoch, so this shorter epoch is its own fit
+                # call; all workers restored the same position and make the same calls.
+                history = model.fit(
+                    epochs_data(initial_epoch, initial_epoch + 1, resume_step),
+                    epochs=initial_epoch + 1,
+                    initial_epoch=initial_epoch,
+                    steps_per_epoch=steps_per_epoch - resume_step,
+                    validation_data=self.val_data,
+                    validation_steps=validation_steps,
+                    callbacks=callbacks,
+                    verbose=1 if self.is_chief else 0
+                )
+                initial_epoch += 1
+
+            # Train the model (nothing left when the interrupted epoch was the last one)
+            if initial_epoch < self.config.param_epochs:
+                history = model.fit(
+                    epochs_data(initial_epoch, self.config.param_epochs),
+                    epochs=self.config.param_epochs,
+                    initial_epoch=initial_epoch,
+                    steps_per_epoch=steps_per_epoch,
+                    validation_data=self.val_data,
+                    validation_steps=validation_steps,
+                    callbacks=callbacks,
+                    verbose=1 if self.is_chief else 0
+                )
+            if checkpointer is not None:
+                checkpointer.mark_completed()
+
+            # Workers hold identical weights after every step; only the chief writes them
+            if not self.is_chief:
+                return history
 
             # Save the trained model to configured path
             self.save_model(
@@ -139,3 +423,69 @@ class Training:
         except Exception as e:
             raise CustomException(e, sys)
 
+    def _labels(self, files: list) -> np.ndarray:
+        """One-hot labels from the class directory of each file."""
+        indices = [self.class_names.index(os.path.basename(os.path.dirname(f))) for f in files]
+        return np.eye(len(self.class_names), dtype=np.float32)[indices]
+
+    def train_on_cached_features(self, callbacks: list = None):
+        """
+        Train only the Flatten+Dense head on cached frozen-backbone features.
+
+        The backbone runs once per image (and per augmented variant); later
+        epochs and later runs read features from the memory-mapped cache.
+        The head shares its layers with `self.model`, which is then saved as usual.
+
+        Returns:
+            History or None: None when the backbone is trainable, so the
+            regular end-to-end path should be used instead.
+        """
+        from project.components.callbacks import AsyncModelCheckpoint
+        from project.components.feature_cache import (BottleneckFeatureCache,
+                                                      CachedFeatureSequence,
+                                                      split_frozen_model)
+
+        backbone, head = split_frozen_model(self.model)
+        if backbone is None:
+            logging.info("Backbone has trainable weights, feature cache disabled")
+            return None
+
+        head.compile(
+            optimizer=tf.keras.optimizers.Adam(learning_rate=self.config.param_learning_rate),
+            loss=tf.keras.losses.CategoricalCrossentropy(),
+            metrics=["accuracy"]
+        )
+
+        variants = self.config.param_feature_cache_variants if self.data_augmentation is not None else 1
+        cache = BottleneckFeatureCache(
+            self.config.feature_cache_dir,
+            backbone,
+            image_size=self.config.param_image_size[:-1],
+            batch_size=self.config.param_batch_size
+        )
+        train_hashes = cache.ensure(self.train_files, variants=variants, augmentation=self.data_augmentation)
+        val_hashes = cache.ensure(self.val_files, variants=1)
+
+        batch_size = self.config.param_batch_size
+        train_seq = CachedFeatureSequence(
+            cache, cache.rows(train_hashes, variants), self._labels(self.train_files), batch_size)
+        val_seq = CachedFeatureSequence(
+            cache, cache.rows(val_hashes, 1), self._labels(self.val_files), batch_size, shuffle=False)
+
+        # A ModelCheckpoint would save the head alone; the full model is saved below
+        callbacks = [c for c in callbacks or []
+                     if not isinstance(c, (tf.keras.callbacks.ModelCheckpoint, AsyncModelCheckpoint))]
+
+        history = head.fit(
+            train_seq,
+            epochs=self.config.param_epochs,
+            validation_data=val_seq,
+            callbacks=callbacks,
+            verbose=1
+        )
+
+        self.save_model(path=self.config.trained_model_path, model=self.model)
+        create_directories(["final_model"])
+        self.save_model(path="final_model/model.keras", model=self.model)
+
+        return history
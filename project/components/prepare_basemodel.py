@@ -1,33 +1,103 @@
+import os
 import tensorflow as tf
 from project.entity.config import PrepareBasemodelConfig
-from pathlib import Path 
+from project.logger import logging
+from project.pipeline.backends import precision_policy
+from pathlib import Path
 
 
+# name -> (application, extra kwargs, (scale, offset) mapping the pipeline's [0, 1] images to the
+# backbone's expected input, or None to feed [0, 1] directly as the original VGG16 model does)
+BACKBONES = {
+    "vgg16": (tf.keras.applications.VGG16, {}, None),
+    "resnet50v2": (tf.keras.applications.ResNet50V2, {}, (2.0, -1.0)),
+    "mobilenet_v3_small": (tf.keras.applications.MobileNetV3Small, {"include_preprocessing": True}, (255.0, 0.0)),
+    "mobilenet_v3_large": (tf.keras.applications.MobileNetV3Large, {"include_preprocessing": True}, (255.0, 0.0)),
+    "efficientnet_b0": (tf.keras.applications.EfficientNetB0, {}, (255.0, 0.0)),
+}
 
 
 class PrepareBaseModel:
     def __init__(self,config=PrepareBasemodelConfig):
         self.config = config
-    
-    def get_base_model(self):
-        self.model = tf.keras.applications.VGG16(
-        include_top=self.config.param_include_top,
-        weights=self.config.param_weight,
-        input_shape=self.config.param_image_size,
-        classes=self.config.param_classics,
-        classifier_activation='softmax'
+
+    def _build_backbone(self, weights, input_tensor=None):
+        application, kwargs, _ = BACKBONES[self.config.param_backbone]
+        return application(
+            include_top=self.config.param_include_top,
+            weights=weights,
+            input_tensor=input_tensor,
+            input_shape=self.config.param_image_size,
+            classes=self.config.param_classics,
+            classifier_activation='softmax',
+            **kwargs
         )
 
+    def _resolve_weights(self):
+        """
+        Pretrained weights of the selected backbone, served from the local cache.
+
+        The first run downloads the ImageNet weights and stores them under
+        `weights_cache_dir`; later runs (including offline ones) load that file.
+
+        Returns:
+            tf.keras.Model: The backbone with its weights loaded.
+        """
+        if self.config.param_weight != "imagenet":
+            return self._build_backbone(self.config.param_weight)
+
+        top = "top" if self.config.param_include_top else "notop"
+        cache_file = os.path.join(
+            str(self.config.weights_cache_dir), f"{self.config.param_backbone}_{top}.weights.h5")
+        if os.path.exists(cache_file):
+            model = self._build_backbone(None)
+            model.load_weights(cache_file)
+            logging.info(f"Loaded {self.config.param_backbone} weights from {cache_file}")
+            return model
+
+        try:
+            model = self._build_backbone("imagenet")
+        except Exception as e:
+            raise RuntimeError(
+                f"ImageNet weights for {self.config.param_backbone} are not in {cache_file} "
+                f"and could not be downloaded: {e}"
+            )
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        model.save_weights(cache_file)
+        logging.info(f"Cached {self.config.param_backbone} weights at {cache_file}")
+        return model
+
+    def get_base_model(self):
+        if self.config.param_backbone not in BACKBONES:
+            raise ValueError(f"Unknown BACKBONE {self.config.param_backbone!r}, expected one of {sorted(BACKBONES)}")
+
+        # Layers pick up the global dtype policy when they are built
+        with precision_policy(self.config.param_precision):
+            self.model = self._resolve_weights()
+
+            input_scaling = BACKBONES[self.config.param_backbone][2]
+            if input_scaling is not None:
+                # Rebuild on a rescaled input so the model keeps taking [0, 1] images
+                # and stays one flat functional graph
+                scale, offset = input_scaling
+                inputs = tf.keras.Input(shape=tuple(self.config.param_image_size))
+                scaled = tf.keras.layers.Rescaling(scale, offset=offset, name="input_scaling")(inputs)
+                weights = self.model.get_weights()
+                self.model = self._build_backbone(None, input_tensor=scaled)
+                self.model.set_weights(weights)
+
         self.save_model(self.config.base_model,model=self.model)
 
     def update_base_model(self):
-        self.full_model = self.prepare_model_layers(
-            model=self.model,
-            num_classes=self.config.param_classics,
-            freeze_all=True, # base model freeze
-            freeze_till=None, # classifier unfreeze
-            learning_rate = self.config.param_learning_rate
-        )
+        with precision_policy(self.config.param_precision):
+            self.full_model = self.prepare_model_layers(
+                model=self.model,
+                num_classes=self.config.param_classics,
+                freeze_all=True, # base model freeze
+                freeze_till=None, # classifier unfreeze
+                learning_rate = self.config.param_learning_rate,
+                head=self.config.param_head
+            )
         self.save_model(self.config.update_base_model,model=self.full_model)
 
 
@@ -37,16 +107,18 @@ class PrepareBaseModel:
         model.save(file_path)
 
     @staticmethod
-    def prepare_model_layers(model,num_classes,learning_rate, freeze_all=False, freeze_till=None):
+    def prepare_model_layers(model,num_classes,learning_rate, freeze_all=False, freeze_till=None, head="flatten"):
         """
         Freeze layers of a TensorFlow/Keras model based on configuration.
 
         Args:
             model (tf.keras.Model): The model whose layers need to be frozen.
             freeze_all (bool): If True, all layers will be frozen (trainable=False).
-            freeze_till (int or None): 
+            freeze_till (int or None):
                 Number of layers from the end that should remain trainable.
                 Example: freeze_till=10 → freeze all layers except the last 10.
+            head (str): "flatten" (Flatten + Dense over the whole feature map) or
+                "gap" (GlobalAveragePooling2D + Dense, channels x classes weights).
 
         Returns:
             tf.keras.Model: The model with updated layer trainable settings.
@@ -62,8 +134,12 @@ class PrepareBaseModel:
             for layer in model.layers[:-freeze_till]:
                 layer.trainable = False
 
-        flatten_in = tf.keras.layers.Flatten()(model.output)
-        prediction = tf.keras.layers.Dense(num_classes, activation='softmax')(flatten_in)
+        if head == "gap":
+            pooled = tf.keras.layers.GlobalAveragePooling2D()(model.output)
+        else:
+            pooled = tf.keras.layers.Flatten()(model.output)
+        # float32 output layer: the softmax stays in full precision under mixed_bfloat16
+        prediction = tf.keras.layers.Dense(num_classes, activation='softmax', dtype='float32')(pooled)
 
         # Combine base model and new classifier
         full_model = tf.keras.Model(inputs=model.input, outputs=prediction)
@@ -76,4 +152,3 @@ class PrepareBaseModel:
         full_model.summary()
 
         return full_model
-
@@ -0,0 +1,161 @@
+import os
+import sys
+import time
+import numpy as np
+import tensorflow as tf
+from pathlib import Path
+from project.entity.config import TFLiteExportConfig
+from project.exception import CustomException
+from project.logger import logging
+from project.pipeline.backends import TFLiteBackend
+from project.utils import save_json
+
+
+class TFLiteExport:
+    """
+    Exports the trained Keras model to TFLite with post-training quantization.
+
+    Produces a float16 model and a full-integer (int8) model calibrated on a
+    representative sample of the training images, then writes a report
+    comparing accuracy, file size and single-image latency against the
+    original float32 Keras model.
+
+    Attributes:
+        config (TFLiteExportConfig): Paths and export settings.
+    """
+
+    def __init__(self, config: TFLiteExportConfig):
+        try:
+            self.config = config
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    # ---------------------------------------------------------------------
+    def load_model(self):
+        """Load the trained Keras model."""
+        try:
+            self.model = tf.keras.models.load_model(self.config.trained_model_path)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _dataset(self, subset: str, shuffle: bool):
+        """Normalized dataset over the same 70/30 split as Evaluation."""
+        img_size = tuple(self.config.param_image_size[:-1])
+        ds = tf.keras.utils.image_dataset_from_directory(
+            self.config.training_data,
+            validation_split=0.30,
+            subset=subset,
+            seed=42,
+            image_size=img_size,
+            batch_size=self.config.param_batch_size,
+            shuffle=shuffle,
+            label_mode='categorical',
+        )
+        normalization_layer = tf.keras.layers.Rescaling(1.0 / 255)
+        return ds.map(
+            lambda x, y: (normalization_layer(x), y), num_parallel_calls=tf.data.AUTOTUNE
+        )
+
+    def _representative_dataset(self):
+        """Yield single training images used to calibrate int8 activation ranges."""
+        images = self._dataset("training", shuffle=True).unbatch()
+        for image, _ in images.take(self.config.representative_samples):
+            yield [tf.expand_dims(image, axis=0)]
+
+    # ---------------------------------------------------------------------
+    def export_float16(self):
+        """Convert the model with float16 weight quantization."""
+        try:
+            converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.target_spec.supported_types = [tf.float16]
+            self._write(converter.convert(), self.config.float16_model_path)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def export_int8(self):
+        """Convert the model with full-integer quantization (int8 weights, activations and I/O)."""
+        try:
+            converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.representative_dataset = self._representative_dataset
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+            converter.inference_input_type = tf.int8
+            converter.inference_output_type = tf.int8
+            self._write(converter.convert(), self.config.int8_model_path)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def _write(flatbuffer: bytes, path: Path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(flatbuffer)
+        logging.info(f"TFLite model saved at: {path} ({len(flatbuffer) / 1024 / 1024:.1f} MB)")
+
+    # ---------------------------------------------------------------------
+    def _evaluate(self, predict_fn) -> dict:
+        """Accuracy over the validation split and single-image latency."""
+        correct, total = 0, 0
+        first_image = None
+        for images, labels in self._dataset("validation", shuffle=False):
+            images = images.numpy()
+            if first_image is None:
+                first_image = images[:1]
+            predictions = predict_fn(images)
+            correct += int(np.sum(np.argmax(predictions, axis=1) == np.argmax(labels.numpy(), axis=1)))
+            total += len(images)
+
+        predict_fn(first_image)  # warm-up at batch size 1
+        timings = []
+        for _ in range(self.config.latency_runs):
+            start = time.perf_counter()
+            predict_fn(first_image)
+            timings.append((time.perf_counter() - start) * 1000.0)
+
+        return {
+            "accuracy": correct / total if total else 0.0,
+            "latency_p50_ms": float(np.percentile(timings, 50)),
+            "latency_p99_ms": float(np.percentile(timings, 99)),
+        }
+
+    def save_report(self) -> dict:
+        """
+        Evaluate the Keras, float16 and int8 models and save the comparison report.
+
+        Returns:
+            dict: Per-variant accuracy, accuracy delta vs Keras, size and latency.
+        """
+        try:
+            variants = {
+                "keras_float32": (
+                    self.config.trained_model_path,
+                    lambda x: self.model(x, training=False).numpy()
+                ),
+                "tflite_float16": (
+                    self.config.float16_model_path,
+                    TFLiteBackend(str(self.config.float16_model_path), self.config.num_threads)
+                ),
+                "tflite_int8": (
+                    self.config.int8_model_path,
+                    TFLiteBackend(str(self.config.int8_model_path), self.config.num_threads)
+                ),
+            }
+
+            report = {}
+            for name, (path, predict_fn) in variants.items():
+                result = self._evaluate(predict_fn)
+                result["size_mb"] = os.path.getsize(path) / 1024 / 1024
+                report[name] = result
+                logging.info(f"{name}: {result}")
+
+            baseline = report["keras_float32"]
+            for result in report.values():
+                result["accuracy_delta"] = result["accuracy"] - baseline["accuracy"]
+                result["size_ratio"] = result["size_mb"] / baseline["size_mb"]
+                result["speedup"] = baseline["latency_p50_ms"] / result["latency_p50_ms"]
+
+            save_json(path=Path(self.config.report_file_path), data=report)
+            return report
+        except Exception as e:
+            raise CustomException(e, sys)
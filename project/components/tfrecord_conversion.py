@@ -0,0 +1,160 @@
+import os
+import sys
+import json
+import time
+import tensorflow as tf
+from project.entity.config import TFRecordConversionConfig
+from project.exception import CustomException
+from project.logger import logging
+
+
+FEATURES = {
+    "image": tf.io.FixedLenFeature([], tf.string),
+    "label": tf.io.FixedLenFeature([], tf.int64),
+}
+
+
+def load_tfrecord_metadata(record_dir) -> dict:
+    """Read metadata.json (class names, split sizes, file lists) of a record directory."""
+    with open(os.path.join(str(record_dir), "metadata.json")) as f:
+        return json.load(f)
+
+
+def load_tfrecord_dataset(record_dir, split: str, batch_size: int, shuffle: bool = False,
+                          seed: int = 42) -> tf.data.Dataset:
+    """
+    Read one split of the sharded TFRecords written by `TFRecordConversion`.
+
+    Shards are read with a parallel interleave and decoded in parallel. The
+    result matches `image_dataset_from_directory(label_mode="categorical")`:
+    float32 images in [0, 255] and one-hot labels, batched, with a known
+    cardinality so `steps_per_epoch` can be derived from it.
+
+    Args:
+        record_dir (Path): Directory holding the shards and metadata.json.
+        split (str): "train" or "val".
+        batch_size (int): Batch size.
+        shuffle (bool): Shuffle shard order and examples every epoch.
+        seed (int): Shuffle seed.
+
+    Returns:
+        tf.data.Dataset: Batched (images, labels) dataset.
+    """
+    metadata = load_tfrecord_metadata(record_dir)
+    num_classes = len(metadata["class_names"])
+    height, width, channels = metadata["image_size"]
+
+    def parse(record):
+        example = tf.io.parse_single_example(record, FEATURES)
+        image = tf.io.decode_image(example["image"], channels=channels, expand_animations=False)
+        image = tf.cast(tf.reshape(image, (height, width, channels)), tf.float32)
+        return image, tf.one_hot(example["label"], num_classes)
+
+    files = tf.data.Dataset.list_files(
+        os.path.join(str(record_dir), f"{split}-*.tfrecord"), shuffle=shuffle, seed=seed)
+    dataset = files.interleave(
+        tf.data.TFRecordDataset,
+        cycle_length=tf.data.AUTOTUNE,
+        num_parallel_calls=tf.data.AUTOTUNE,
+        deterministic=not shuffle
+    )
+    dataset = dataset.apply(tf.data.experimental.assert_cardinality(metadata["splits"][split]))
+    if shuffle:
+        dataset = dataset.shuffle(4 * batch_size * 16, seed=seed, reshuffle_each_iteration=True)
+
+    return dataset.map(parse, num_parallel_calls=tf.data.AUTOTUNE).batch(batch_size)
+
+
+class TFRecordConversion:
+    """
+    Converts the raw image tree into sharded TFRecords.
+
+    Images are decoded once, resized to IMAGE_SIZE and re-encoded compactly
+    (JPEG or PNG), so training and evaluation no longer list the directory,
+    open thousands of files and decode full-size images every epoch. The
+    train/validation split is the one `image_dataset_from_directory`
+    produces with the same seed, so results are comparable with the
+    directory-based path.
+    """
+
+    def __init__(self, config: TFRecordConversionConfig):
+        self.config = config
+
+    def split_files(self):
+        """Return (class_names, {split: (files, labels)}) using the directory loader's split."""
+        train_ds, val_ds = tf.keras.utils.image_dataset_from_directory(
+            self.config.training_data,
+            validation_split=self.config.validation_split,
+            subset="both",
+            seed=42,
+            image_size=tuple(self.config.param_image_size[:-1]),
+            batch_size=None,
+            label_mode="int"
+        )
+        class_names = train_ds.class_names
+
+        def labelled(files):
+            return [class_names.index(os.path.basename(os.path.dirname(f))) for f in files]
+
+        return class_names, {
+            "train": (list(train_ds.file_paths), labelled(train_ds.file_paths)),
+            "val": (list(val_ds.file_paths), labelled(val_ds.file_paths)),
+        }
+
+    def _encode(self, path: str) -> bytes:
+        image = tf.io.decode_image(tf.io.read_file(path), channels=3, expand_animations=False)
+        image = tf.image.resize(image, tuple(self.config.param_image_size[:-1]), method="bilinear")
+        image = tf.cast(tf.clip_by_value(tf.round(image), 0, 255), tf.uint8)
+        if self.config.image_format == "png":
+            return tf.io.encode_png(image).numpy()
+        return tf.io.encode_jpeg(image, quality=self.config.jpeg_quality).numpy()
+
+    def _write_split(self, split: str, files: list, labels: list) -> list:
+        per_shard = self.config.images_per_shard
+        num_shards = max(1, -(-len(files) // per_shard))
+        shard_names = []
+        for shard in range(num_shards):
+            name = f"{split}-{shard:05d}-of-{num_shards:05d}.tfrecord"
+            with tf.io.TFRecordWriter(os.path.join(self.config.root_dir, name)) as writer:
+                for path, label in zip(files[shard * per_shard:(shard + 1) * per_shard],
+                                       labels[shard * per_shard:(shard + 1) * per_shard]):
+                    example = tf.train.Example(features=tf.train.Features(feature={
+                        "image": tf.train.Feature(bytes_list=tf.train.BytesList(value=[self._encode(path)])),
+                        "label": tf.train.Feature(int64_list=tf.train.Int64List(value=[label])),
+                    }))
+                    writer.write(example.SerializeToString())
+            shard_names.append(name)
+        return shard_names
+
+    def convert(self):
+        """Write train/val shards and metadata.json."""
+        try:
+            start = time.perf_counter()
+            # Drop shards of a previous conversion
+            for name in os.listdir(self.config.root_dir):
+                if name.endswith(".tfrecord"):
+                    os.remove(os.path.join(self.config.root_dir, name))
+
+            class_names, splits = self.split_files()
+            metadata = {
+                "class_names": class_names,
+                "image_size": list(self.config.param_image_size),
+                "image_format": self.config.image_format,
+                "splits": {},
+                "shards": {},
+                "files": {},
+            }
+            for split, (files, labels) in splits.items():
+                metadata["shards"][split] = self._write_split(split, files, labels)
+                metadata["splits"][split] = len(files)
+                metadata["files"][split] = files
+
+            with open(self.config.metadata_file, "w") as f:
+                json.dump(metadata, f, indent=4)
+
+            logging.info(
+                f"Wrote {sum(metadata['splits'].values())} images to TFRecords in "
+                f"{time.perf_counter() - start:.1f}s: {metadata['splits']}"
+            )
+        except Exception as e:
+            raise CustomException(e, sys)
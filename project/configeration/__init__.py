@@ -1,8 +1,14 @@
 from project.entity.config import (DataIngestionConfig,
+                                  TFRecordConversionConfig,
                                   PrepareBasemodelConfig,
                                   PrepareCallbackConfig,
                                   TrainingConfig,
-                                  ModelEvaluationConfig)
+                                  TFLiteExportConfig,
+                                  ModelEvaluationConfig,
+                                  PredictionConfig,
+                                  BulkScoringConfig,
+                                  BackboneBenchmarkConfig,
+                                  DistillationConfig)
 from project.utils import read_yaml, create_directories
 from project.exception import CustomException
 from project.constants import *
@@ -70,6 +76,31 @@ class ConfigerationManager:
 
 
 
+    def get_tfrecord_conversion_config(self) -> TFRecordConversionConfig:
+        """
+        Create and return the TFRecordConversionConfig dataclass.
+
+        Returns:
+            TFRecordConversionConfig: Shard directory, split and encoding settings.
+        """
+        try:
+            config = self.config.tfrecord_conversion
+
+            create_directories(config.root_dir)
+
+            return TFRecordConversionConfig(
+                root_dir=Path(config.root_dir),
+                metadata_file=Path(config.metadata_file),
+                training_data=Path(self.config.data_ingestion.unzip_dir) / "kidney-ct-scan-image",
+                validation_split=float(config.validation_split),
+                images_per_shard=int(config.images_per_shard),
+                image_format=config.image_format,
+                jpeg_quality=int(config.jpeg_quality),
+                param_image_size=self.param.IMAGE_SIZE
+            )
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def get_prepare_base_model_config(self)-> PrepareBasemodelConfig:
         """
         Creates and returns the PrepareBasemodelConfig object 
@@ -102,8 +133,11 @@ class ConfigerationManager:
             param_learning_rate=self.param.LEARNING_RATE, 
             param_classics=self.param.CLASSICS, 
             param_weight=self.param.WEIGHTS, 
-            param_include_top=self.param.INCLUDETOP
-            
+            param_include_top=self.param.INCLUDETOP,
+            param_precision=self.param.PRECISION,
+            weights_cache_dir=Path(config.weights_cache_dir),
+            param_backbone=self.param.BACKBONE,
+            param_head=self.param.HEAD
             )
         
             return prepare_base_model_config
@@ -139,7 +173,11 @@ class ConfigerationManager:
             return PrepareCallbackConfig(
                 root_dir=Path(config.root_dir),
                 tensorboard_root_log_dir=Path(config.tensorboard_root_log_dir),
-                checkpoint_model_filepath=Path(config.checkpoint_model_filepath)
+                checkpoint_model_filepath=Path(config.checkpoint_model_filepath),
+                param_async_callbacks=self.param.ASYNC_CALLBACKS,
+                param_tb_flush_every=self.param.TB_FLUSH_EVERY,
+                param_step_profiler=self.param.STEP_PROFILER,
+                param_profile_trace_steps=self.param.PROFILE_TRACE_STEPS
             )
         except Exception as e:
             raise CustomException(e, sys)
@@ -191,13 +229,60 @@ class ConfigerationManager:
             param_batch_size= self.param.BATCH_SIZE, 
             param_epochs= self.param.EPOCHS, 
             params_augmentation= self.param.AUGMENTATION,
-            param_learning_rate= self.param.LEARNING_RATE
+            param_learning_rate= self.param.LEARNING_RATE,
+            feature_cache_dir= training.feature_cache_dir,
+            param_feature_cache= self.param.FEATURE_CACHE,
+            param_feature_cache_variants= self.param.FEATURE_CACHE_VARIANTS,
+            tfrecord_dir= Path(self.config.tfrecord_conversion.root_dir),
+            param_use_tfrecords= self.param.USE_TFRECORDS,
+            data_cache_dir= Path(training.data_cache_dir),
+            param_num_parallel_calls= self.param.NUM_PARALLEL_CALLS,
+            param_deterministic= self.param.DETERMINISTIC,
+            param_data_cache= self.param.DATA_CACHE,
+            param_augment_in= self.param.AUGMENT_IN,
+            param_precision= self.param.PRECISION,
+            param_distributed= self.param.DISTRIBUTED,
+            checkpoint_dir= Path(training.checkpoint_dir),
+            param_resume= self.param.RESUME,
+            param_checkpoint_every_steps= self.param.CHECKPOINT_EVERY_STEPS,
+            param_checkpoints_to_keep= self.param.CHECKPOINTS_TO_KEEP,
+            param_checkpoint_keep_every_hours= self.param.CHECKPOINT_KEEP_EVERY_HOURS
         )
         return training_config
 
     
     
 
+    def get_tflite_export_config(self) -> TFLiteExportConfig:
+        """
+        Create and return the TFLiteExportConfig dataclass.
+
+        Returns:
+            TFLiteExportConfig: Paths of the quantized models and report, plus
+            calibration/evaluation settings.
+        """
+        try:
+            config = self.config.tflite_export
+
+            create_directories(config.root_dir)
+
+            return TFLiteExportConfig(
+                root_dir=Path(config.root_dir),
+                trained_model_path=Path(config.trained_model_path),
+                float16_model_path=Path(config.float16_model_path),
+                int8_model_path=Path(config.int8_model_path),
+                report_file_path=Path(config.report_file_path),
+                training_data=Path(self.config.data_ingestion.unzip_dir) / "kidney-ct-scan-image",
+                representative_samples=int(config.representative_samples),
+                num_threads=int(config.num_threads),
+                latency_runs=int(config.latency_runs),
+                param_image_size=self.param.IMAGE_SIZE,
+                param_batch_size=self.param.BATCH_SIZE
+            )
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
     def get_model_evaluation_config(self) -> ModelEvaluationConfig:
         """
         Create and return the ModelEvaluationConfig dataclass.
@@ -237,7 +322,135 @@ class ConfigerationManager:
             param_batch_size=self.param.BATCH_SIZE,
             training_data_path=Path(
                 self.config.data_ingestion.unzip_dir
-            ) / "kidney-ct-scan-image"
+            ) / "kidney-ct-scan-image",
+            tfrecord_dir=Path(self.config.tfrecord_conversion.root_dir),
+            param_use_tfrecords=self.param.USE_TFRECORDS,
+            param_precision=self.param.PRECISION
         )
 
         return model_evaluation_config
+
+
+    def get_prediction_config(self) -> PredictionConfig:
+        """
+        Create and return the PredictionConfig dataclass used by the API.
+
+        Returns:
+            PredictionConfig: Model path, image size, micro-batching, batch
+            endpoint, admission control and prediction cache settings.
+        """
+        try:
+            config = self.config.prediction
+
+            return PredictionConfig(
+                model_path=Path(config.model_path),
+                registry_dir=Path(config.registry_dir),
+                registry_poll_seconds=float(config.registry_poll_seconds),
+                backend=config.backend,
+                param_image_size=self.param.IMAGE_SIZE,
+                param_precision=self.param.PRECISION,
+                compiled_inference=bool(config.compiled_inference),
+                jit_compile=bool(config.jit_compile),
+                warmup_batch_sizes=list(config.warmup_batch_sizes),
+                num_threads=int(config.num_threads),
+                max_batch_size=int(config.max_batch_size),
+                max_wait_ms=float(config.max_wait_ms),
+                batch_endpoint_size=int(config.batch_endpoint_size),
+                decode_workers=int(config.decode_workers),
+                max_image_bytes=int(config.max_image_bytes),
+                draft_decode=bool(config.draft_decode),
+                max_tensor_batch=int(config.max_tensor_batch),
+                inference_workers=int(config.inference_workers),
+                max_queue=int(config.max_queue),
+                retry_after_seconds=int(config.retry_after_seconds),
+                overload_status_code=int(config.overload_status_code),
+                cache_max_entries=int(config.cache_max_entries),
+                cache_ttl_seconds=float(config.cache_ttl_seconds),
+                cache_db_path=Path(config.cache_db_path) if config.cache_db_path else None
+            )
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+    def get_bulk_scoring_config(self) -> BulkScoringConfig:
+        """
+        Create and return the BulkScoringConfig dataclass.
+
+        Returns:
+            BulkScoringConfig: Model, output and tf.data settings for offline scoring.
+        """
+        try:
+            config = self.config.bulk_scoring
+
+            create_directories(config.root_dir)
+
+            return BulkScoringConfig(
+                root_dir=Path(config.root_dir),
+                model_path=Path(config.model_path),
+                output_path=Path(config.output_path),
+                backend=config.backend,
+                batch_size=int(config.batch_size),
+                num_parallel_calls=int(config.num_parallel_calls),
+                checkpoint_every_batches=int(config.checkpoint_every_batches),
+                param_image_size=self.param.IMAGE_SIZE
+            )
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+    def get_backbone_benchmark_config(self) -> BackboneBenchmarkConfig:
+        """
+        Create and return the BackboneBenchmarkConfig dataclass.
+
+        Returns:
+            BackboneBenchmarkConfig: Backbones to compare and the report paths.
+        """
+        try:
+            config = self.config.backbone_benchmark
+
+            create_directories(config.root_dir)
+
+            return BackboneBenchmarkConfig(
+                root_dir=Path(config.root_dir),
+                report_file_path=Path(config.report_file_path),
+                table_file_path=Path(config.table_file_path),
+                backbones=list(config.backbones),
+                head=config.head,
+                epochs=int(config.epochs),
+                latency_runs=int(config.latency_runs)
+            )
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+    def get_distillation_config(self) -> DistillationConfig:
+        """
+        Create and return the DistillationConfig dataclass.
+
+        Returns:
+            DistillationConfig: Teacher/student paths, teacher cache and
+            distillation hyperparameters.
+        """
+        try:
+            config = self.config.distillation
+
+            create_directories(config.root_dir)
+
+            return DistillationConfig(
+                root_dir=Path(config.root_dir),
+                teacher_model_path=Path(config.teacher_model_path),
+                student_model_path=Path(config.student_model_path),
+                teacher_cache_dir=Path(config.teacher_cache_dir),
+                report_file_path=Path(config.report_file_path),
+                training_data=Path(self.config.data_ingestion.unzip_dir) / "kidney-ct-scan-image",
+                latency_runs=int(config.latency_runs),
+                param_image_size=self.param.IMAGE_SIZE,
+                param_batch_size=self.param.BATCH_SIZE,
+                param_epochs=self.param.DISTILL_EPOCHS,
+                param_learning_rate=self.param.DISTILL_LEARNING_RATE,
+                param_temperature=self.param.DISTILL_TEMPERATURE,
+                param_alpha=self.param.DISTILL_ALPHA,
+                param_student_filters=list(self.param.STUDENT_FILTERS)
+            )
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -18,6 +18,31 @@ class DataIngestionConfig:
     unzip_dir: Path
 
 
+@dataclass(frozen=True)
+class TFRecordConversionConfig:
+    """
+    Dataclass for storing the configuration required to convert images to TFRecords.
+
+    Attributes:
+        root_dir (Path): Output directory of the TFRecord shards.
+        metadata_file (Path): JSON file with class names, split sizes and file lists.
+        training_data (Path): Raw image directory (one sub-directory per class).
+        validation_split (float): Fraction of images in the validation split.
+        images_per_shard (int): Images written to each shard.
+        image_format (str): Encoding of the resized images ("jpeg" or "png").
+        jpeg_quality (int): JPEG quality when image_format is "jpeg".
+        param_image_size (list): Size the images are resized to (Height, Width, Channels).
+    """
+    root_dir: Path
+    metadata_file: Path
+    training_data: Path
+    validation_split: float
+    images_per_shard: int
+    image_format: str
+    jpeg_quality: int
+    param_image_size: list
+
+
 @dataclass(frozen=True)
 class PrepareBasemodelConfig:
     """
@@ -30,6 +55,10 @@ class PrepareBasemodelConfig:
         param_image_size (list): List of image sizes for training.
         param_batch_size (int): Batch size for training.
         param_epochs (int): Number of epochs for training.
+        param_precision (str): Keras dtype policy ("float32" or "mixed_bfloat16").
+        weights_cache_dir (Path): Local cache of the pretrained backbone weights.
+        param_backbone (str): Backbone architecture (see `BACKBONES` in prepare_basemodel).
+        param_head (str): Classifier head, "flatten" or "gap" (global average pooling).
     """
     root_dir: Path
     base_model: Path
@@ -41,6 +70,10 @@ class PrepareBasemodelConfig:
     param_classics: int
     param_weight:str
     param_include_top: bool
+    param_precision: str
+    weights_cache_dir: Path
+    param_backbone: str
+    param_head: str
 
 
 @dataclass(frozen=True)
@@ -52,10 +85,18 @@ class PrepareCallbackConfig:
         root_dir (Path): Base directory for callback-related artifacts.
         tensorboard_root_log_dir (Path): Directory where TensorBoard logs will be saved.
         checkpoint_model_filepath (Path): Full filepath where the model checkpoint will be stored.
+        param_async_callbacks (bool): Write checkpoints and TensorBoard logs on a background thread.
+        param_tb_flush_every (int): Epochs of TensorBoard scalars buffered per async write.
+        param_step_profiler (bool): Add the StepTimeProfiler callback.
+        param_profile_trace_steps (list): [start, stop) global steps of a TF profiler trace, or None.
     """
     root_dir: Path
     tensorboard_root_log_dir: Path
     checkpoint_model_filepath: Path
+    param_async_callbacks: bool
+    param_tb_flush_every: int
+    param_step_profiler: bool
+    param_profile_trace_steps: list
 
 
 @dataclass(frozen=True)
@@ -71,6 +112,24 @@ class TrainingConfig:
         param_image_size (list): List of image sizes for training.
         param_batch_size (int): Batch size for training.
         param_epochs (int): Number of epochs for training.
+        feature_cache_dir (Path): Memory-mapped bottleneck feature cache.
+        param_feature_cache (bool): Train only the head on cached backbone features.
+        param_feature_cache_variants (int): Cached variants per training image
+            (1 plain + N-1 augmented copies).
+        tfrecord_dir (Path): Sharded TFRecords written by the tfrecord_conversion stage.
+        param_use_tfrecords (bool): Read training data from the TFRecords.
+        data_cache_dir (Path): Directory of the tf.data file cache (DATA_CACHE: file).
+        param_num_parallel_calls (int): Parallel map calls of the input pipeline (-1 = AUTOTUNE).
+        param_deterministic (bool): Preserve element order in parallel maps.
+        param_data_cache (str): "none", "memory" or "file" cache of decoded images.
+        param_augment_in (str): Run augmentation in the "pipeline" or in the "model".
+        param_precision (str): Keras dtype policy ("float32" or "mixed_bfloat16").
+        param_distributed (bool): Train with MultiWorkerMirroredStrategy (cluster from TF_CONFIG).
+        checkpoint_dir (Path): Resumable checkpoints (weights, optimizer state, epoch/step).
+        param_resume (bool): Write checkpoints and resume from the latest compatible one.
+        param_checkpoint_every_steps (int): Also checkpoint every N steps (0 = epoch ends only).
+        param_checkpoints_to_keep (int): Newest checkpoints kept by the rotation.
+        param_checkpoint_keep_every_hours (float): Additionally keep one checkpoint per N hours (0 = off).
     """ 
     root_dir: Path
     trained_model_path: Path
@@ -81,7 +140,55 @@ class TrainingConfig:
     param_epochs: int 
     params_augmentation: bool 
     param_learning_rate: float
+    feature_cache_dir: Path
+    param_feature_cache: bool
+    param_feature_cache_variants: int
+    tfrecord_dir: Path
+    param_use_tfrecords: bool
+    data_cache_dir: Path
+    param_num_parallel_calls: int
+    param_deterministic: bool
+    param_data_cache: str
+    param_augment_in: str
+    param_precision: str
+    param_distributed: bool
+    checkpoint_dir: Path
+    param_resume: bool
+    param_checkpoint_every_steps: int
+    param_checkpoints_to_keep: int
+    param_checkpoint_keep_every_hours: float
+
+
 
+@dataclass(frozen=True)
+class TFLiteExportConfig:
+    """
+    Dataclass for storing the configuration required to export TFLite models.
+
+    Attributes:
+        root_dir (Path): Base directory for TFLite artifacts.
+        trained_model_path (Path): Trained Keras model to convert.
+        float16_model_path (Path): Output path of the float16 quantized model.
+        int8_model_path (Path): Output path of the full-integer quantized model.
+        report_file_path (Path): JSON report comparing accuracy, size and latency.
+        training_data (Path): Image directory used for calibration and evaluation.
+        representative_samples (int): Number of images used to calibrate int8 ranges.
+        num_threads (int): TFLite interpreter threads used for evaluation.
+        latency_runs (int): Single-image runs used to measure latency.
+        param_image_size (list): Image size used by the model (Height, Width, Channels).
+        param_batch_size (int): Batch size used for evaluation.
+    """
+    root_dir: Path
+    trained_model_path: Path
+    float16_model_path: Path
+    int8_model_path: Path
+    report_file_path: Path
+    training_data: Path
+    representative_samples: int
+    num_threads: int
+    latency_runs: int
+    param_image_size: list
+    param_batch_size: int
 
 
 @dataclass
@@ -103,6 +210,10 @@ class ModelEvaluationConfig:
         param_image_size (List[int]): Image size used during training/evaluation (Height, Width, Channels).
         param_batch_size (int): Batch size used during evaluation.
         training_data_path (Path): Path to the validation dataset for model evaluation.
+        tfrecord_dir (Path): Sharded TFRecords written by the tfrecord_conversion stage.
+        param_use_tfrecords (bool): Evaluate on the TFRecord validation split.
+        param_precision (str): Keras dtype policy; "mixed_bfloat16" adds a
+            float32 vs bf16 accuracy/latency comparison to the report.
     """
     root_dir: Path
     report_file_path: Path
@@ -119,5 +230,151 @@ class ModelEvaluationConfig:
     all_params: dict
     param_image_size: list
     param_batch_size: int
-    threshold_accuracy: float 
-     
+    threshold_accuracy: float
+    tfrecord_dir: Path
+    param_use_tfrecords: bool
+    param_precision: str
+
+
+@dataclass(frozen=True)
+class PredictionConfig:
+    """
+    Dataclass for storing the configuration required to serve predictions.
+
+    Attributes:
+        model_path (Path): Model served when the model registry is empty.
+        registry_dir (Path): Versioned model registry watched for hot reloads.
+        registry_poll_seconds (float): Registry polling interval.
+        backend (str): Inference backend ("keras", "savedmodel", "tflite", "onnx" or "auto").
+        param_image_size (list): Image size expected by the model (Height, Width, Channels).
+        param_precision (str): Keras dtype policy the served Keras model runs under.
+        compiled_inference (bool): Serve through a traced tf.function instead of model.predict.
+        jit_compile (bool): Compile the traced inference function with XLA.
+        warmup_batch_sizes (list): Batch sizes run once at load time.
+        num_threads (int): Runtime threads for the TFLite and ONNX backends.
+        max_batch_size (int): Maximum number of requests merged into one forward pass.
+        max_wait_ms (float): Maximum time a request waits for a batch to fill up.
+        batch_endpoint_size (int): Images per forward pass on /predict/batch.
+        decode_workers (int): Threads used to decode uploads in parallel.
+        max_image_bytes (int): Largest accepted image (upload or archive member).
+        draft_decode (bool): Decode large JPEGs at reduced resolution (DCT scaling).
+        max_tensor_batch (int): Largest batch accepted by /predict/tensor.
+        inference_workers (int): Concurrent forward passes on the inference executor.
+        max_queue (int): Requests admitted beyond the running ones before refusing.
+        retry_after_seconds (int): Retry-After sent with refused requests.
+        overload_status_code (int): HTTP status for refused requests (429 or 503).
+        cache_max_entries (int): Size of the in-memory prediction cache.
+        cache_ttl_seconds (float): Lifetime of a cached prediction.
+        cache_db_path (Path): SQLite file for the on-disk cache tier (None disables it).
+    """
+    model_path: Path
+    registry_dir: Path
+    registry_poll_seconds: float
+    backend: str
+    param_image_size: list
+    param_precision: str
+    compiled_inference: bool
+    jit_compile: bool
+    warmup_batch_sizes: list
+    num_threads: int
+    max_batch_size: int
+    max_wait_ms: float
+    batch_endpoint_size: int
+    decode_workers: int
+    max_image_bytes: int
+    draft_decode: bool
+    max_tensor_batch: int
+    inference_workers: int
+    max_queue: int
+    retry_after_seconds: int
+    overload_status_code: int
+    cache_max_entries: int
+    cache_ttl_seconds: float
+    cache_db_path: Path
+
+
+@dataclass(frozen=True)
+class BulkScoringConfig:
+    """
+    Dataclass for storing the configuration required to score image archives offline.
+
+    Attributes:
+        root_dir (Path): Base directory for bulk scoring artifacts.
+        model_path (Path): Model used for scoring.
+        output_path (Path): Default results file (.csv) or Parquet dataset directory (.parquet).
+        backend (str): Inference backend ("keras", "savedmodel", "tflite", "onnx" or "auto").
+        batch_size (int): Images per forward pass.
+        num_parallel_calls (int): Parallel tf.data decode calls (-1 = AUTOTUNE).
+        checkpoint_every_batches (int): Batches between output flushes and checkpoints.
+        param_image_size (list): Image size expected by the model (Height, Width, Channels).
+    """
+    root_dir: Path
+    model_path: Path
+    output_path: Path
+    backend: str
+    batch_size: int
+    num_parallel_calls: int
+    checkpoint_every_batches: int
+    param_image_size: list
+
+
+
+@dataclass(frozen=True)
+class BackboneBenchmarkConfig:
+    """
+    Dataclass for storing the configuration of the backbone benchmark stage.
+
+    Attributes:
+        root_dir (Path): Per-backbone models and the reports.
+        report_file_path (Path): JSON report (one entry per backbone).
+        table_file_path (Path): Markdown table of the same results.
+        backbones (list): Backbones to compare.
+        head (str): Classifier head used for every backbone.
+        epochs (int): Head training epochs per backbone.
+        latency_runs (int): Single-image runs used to measure latency.
+    """
+    root_dir: Path
+    report_file_path: Path
+    table_file_path: Path
+    backbones: list
+    head: str
+    epochs: int
+    latency_runs: int
+
+
+
+@dataclass(frozen=True)
+class DistillationConfig:
+    """
+    Dataclass for storing the configuration of the distillation stage.
+
+    Attributes:
+        root_dir (Path): Base directory for distillation artifacts.
+        teacher_model_path (Path): Trained teacher model.
+        student_model_path (Path): Output path of the distilled student (servable by ImagePredictor).
+        teacher_cache_dir (Path): Cached teacher probabilities, per teacher file hash.
+        report_file_path (Path): JSON report comparing teacher and student.
+        training_data (Path): Image directory (same train/validation split as training).
+        latency_runs (int): Single-image runs used to measure latency.
+        param_image_size (list): Image size used by the models (Height, Width, Channels).
+        param_batch_size (int): Batch size.
+        param_epochs (int): Student training epochs.
+        param_learning_rate (float): Student learning rate.
+        param_temperature (float): Softmax temperature of the soft targets.
+        param_alpha (float): Weight of the hard-label loss (1 - alpha on the soft targets).
+        param_student_filters (list): Conv widths of the student's blocks.
+    """
+    root_dir: Path
+    teacher_model_path: Path
+    student_model_path: Path
+    teacher_cache_dir: Path
+    report_file_path: Path
+    training_data: Path
+    latency_runs: int
+    param_image_size: list
+    param_batch_size: int
+    param_epochs: int
+    param_learning_rate: float
+    param_temperature: float
+    param_alpha: float
+    param_student_filters: list
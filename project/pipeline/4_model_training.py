@@ -22,14 +22,14 @@ class TraningPipeline:
             # Initialize configuration manager
             config = ConfigerationManager()  
 
+            # Training setup (first: a distribution strategy must be created before other TF ops)
+            training_config = config.get_training_config()
+            trainer = Training(config=training_config)  # fixed spelling from 'Traning'
+
             # Prepare callbacks (optional, uncomment if needed)
             callbacks_config = config.get_prepare_callback_config()
             callback_list = CallBacks(config=callbacks_config).get_tb_ckpt_callbacks()
 
-            # Training setup
-            training_config = config.get_training_config()
-            trainer = Training(config=training_config)  # fixed spelling from 'Traning'
-
             # Prepare model and data
             trainer.get_base_model()
             trainer.train_valid_generator()
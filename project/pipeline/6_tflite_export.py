@@ -0,0 +1,34 @@
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from project.components.tflite_export import TFLiteExport
+from project.configeration import ConfigerationManager
+from project.exception import CustomException
+from project.logger import logging
+
+
+class TFLiteExportPipeline:
+    def __init__(self):
+        pass
+
+    def main(self):
+        try:
+            config = ConfigerationManager()
+            tflite_export_config = config.get_tflite_export_config()
+            tflite_export = TFLiteExport(config=tflite_export_config)
+            tflite_export.load_model()
+            tflite_export.export_float16()
+            tflite_export.export_int8()
+            tflite_export.save_report()
+        except Exception as e:
+            raise CustomException(e, sys)
+
+if __name__ == "__main__":
+    try:
+        pipeline = TFLiteExportPipeline()
+        pipeline.main()
+    except Exception as e:
+        raise CustomException(e, sys)
@@ -0,0 +1,31 @@
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from project.components.tfrecord_conversion import TFRecordConversion
+from project.configeration import ConfigerationManager
+from project.exception import CustomException
+from project.logger import logging
+
+
+class TFRecordConversionPipeline:
+    def __init__(self):
+        pass
+
+    def main(self):
+        try:
+            config = ConfigerationManager()
+            tfrecord_conversion_config = config.get_tfrecord_conversion_config()
+            tfrecord_conversion = TFRecordConversion(config=tfrecord_conversion_config)
+            tfrecord_conversion.convert()
+        except Exception as e:
+            raise CustomException(e, sys)
+
+if __name__ == "__main__":
+    try:
+        pipeline = TFRecordConversionPipeline()
+        pipeline.main()
+    except Exception as e:
+        raise CustomException(e, sys)
@@ -0,0 +1,34 @@
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from project.components.backbone_benchmark import BackboneBenchmark
+from project.configeration import ConfigerationManager
+from project.exception import CustomException
+from project.logger import logging
+
+
+class BackboneBenchmarkPipeline:
+    def __init__(self):
+        pass
+
+    def main(self):
+        try:
+            config = ConfigerationManager()
+            backbone_benchmark = BackboneBenchmark(
+                config=config.get_backbone_benchmark_config(),
+                prepare_config=config.get_prepare_base_model_config(),
+                training_config=config.get_training_config()
+            )
+            backbone_benchmark.run()
+        except Exception as e:
+            raise CustomException(e, sys)
+
+if __name__ == "__main__":
+    try:
+        pipeline = BackboneBenchmarkPipeline()
+        pipeline.main()
+    except Exception as e:
+        raise CustomException(e, sys)
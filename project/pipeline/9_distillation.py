@@ -0,0 +1,31 @@
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from project.components.distillation import Distillation
+from project.configeration import ConfigerationManager
+from project.exception import CustomException
+from project.logger import logging
+
+
+class DistillationPipeline:
+    def __init__(self):
+        pass
+
+    def main(self):
+        try:
+            config = ConfigerationManager()
+            distillation_config = config.get_distillation_config()
+            distillation = Distillation(config=distillation_config)
+            distillation.run()
+        except Exception as e:
+            raise CustomException(e, sys)
+
+if __name__ == "__main__":
+    try:
+        pipeline = DistillationPipeline()
+        pipeline.main()
+    except Exception as e:
+        raise CustomException(e, sys)
@@ -1,9 +1,5 @@
-from project.components.data_ingestion import DataIngestion 
-from project.components.prepare_basemodel import PrepareBaseModel
-from project.components.callbacks import CallBacks
-from project.components.model_training import Training
-from project.components.model_evalution import Evaluation
-
+# Components are imported inside each step: importing `project.pipeline`
+# (e.g. for `project.pipeline.prediction`) must not pull in TensorFlow, MLflow or dagshub.
 from project.configeration import ConfigerationManager
 from project.exception import CustomException
 from project.logger import logging
@@ -42,6 +38,8 @@ class TrainingPipeline:
             CustomException: If any part of ingestion fails.
         """
         try:
+            from project.components.data_ingestion import DataIngestion
+
             logging.info(">>>>>>> Data Ingestion started <<<<<<<<<")
             data_ingestion_config = self.config.get_data_ingestion_config()
             data_ingestion = DataIngestion(data_ingestion_config)
@@ -51,6 +49,24 @@ class TrainingPipeline:
         except Exception as e:
             raise CustomException(e, sys)
 
+    def run_tfrecord_conversion(self):
+        """
+        Convert the ingested images into pre-resized, sharded TFRecords.
+
+        Raises:
+            CustomException: If conversion fails.
+        """
+        try:
+            from project.components.tfrecord_conversion import TFRecordConversion
+
+            logging.info(">>>>>>> TFRecord Conversion started <<<<<<<<<")
+            tfrecord_conversion_config = self.config.get_tfrecord_conversion_config()
+            tfrecord_conversion = TFRecordConversion(tfrecord_conversion_config)
+            tfrecord_conversion.convert()
+            logging.info(">>>>>>> TFRecord Conversion completed <<<<<<<<<")
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def run_prepare_base_model(self):
         """
         Prepare the base model for training.
@@ -63,6 +79,8 @@ class TrainingPipeline:
             CustomException: If any part of base model preparation fails.
         """
         try:
+            from project.components.prepare_basemodel import PrepareBaseModel
+
             logging.info(">>>>>>> Prepare Base Model started <<<<<<<<<")
             prepare_base_model_config = self.config.get_prepare_base_model_config()
             prepare_base_model = PrepareBaseModel(prepare_base_model_config)
@@ -85,6 +103,8 @@ class TrainingPipeline:
             CustomException: If callback preparation fails.
         """
         try:
+            from project.components.callbacks import CallBacks
+
             logging.info(">>>>>>> Prepare Callback started <<<<<<<<<")
             callback_config = self.config.get_prepare_callback_config()
             callback = CallBacks(callback_config)
@@ -105,6 +125,8 @@ class TrainingPipeline:
             CustomException: If model training fails.
         """
         try:
+            from project.components.model_training import Training
+
             logging.info(">>>>>>> Model Training started <<<<<<<<<")
 
             model_training_config = self.config.get_training_config()
@@ -126,6 +148,74 @@ class TrainingPipeline:
         except Exception as e:
             raise CustomException(e, sys)
 
+    def run_distillation(self):
+        """
+        Distill the trained model into a compact student CNN.
+
+        Not part of `run`: it trains a second model; the `distillation` DVC
+        stage (or 9_distillation.py) runs it when a student is wanted.
+
+        Raises:
+            CustomException: If teacher targets, student training or the report fail.
+        """
+        try:
+            from project.components.distillation import Distillation
+
+            logging.info(">>>>>>> Distillation started <<<<<<<<<")
+            distillation_config = self.config.get_distillation_config()
+            distillation = Distillation(distillation_config)
+            distillation.run()
+            logging.info(">>>>>>> Distillation completed <<<<<<<<<")
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def run_tflite_export(self):
+        """
+        Export the trained model to float16 and int8 TFLite models.
+
+        Not part of `run`: the `tflite_export` DVC stage (or 6_tflite_export.py)
+        runs it when an on-device model is wanted.
+
+        Raises:
+            CustomException: If conversion or the comparison report fails.
+        """
+        try:
+            from project.components.tflite_export import TFLiteExport
+
+            logging.info(">>>>>>> TFLite Export started <<<<<<<<<")
+            tflite_export_config = self.config.get_tflite_export_config()
+            tflite_export = TFLiteExport(tflite_export_config)
+            tflite_export.load_model()
+            tflite_export.export_float16()
+            tflite_export.export_int8()
+            tflite_export.save_report()
+            logging.info(">>>>>>> TFLite Export completed <<<<<<<<<")
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def run_backbone_benchmark(self):
+        """
+        Compare backbones (latency, size, accuracy) with the benchmark head.
+
+        Not part of `run`: it trains one model per configured backbone.
+
+        Raises:
+            CustomException: If any backbone fails to build, train or measure.
+        """
+        try:
+            from project.components.backbone_benchmark import BackboneBenchmark
+
+            logging.info(">>>>>>> Backbone Benchmark started <<<<<<<<<")
+            backbone_benchmark = BackboneBenchmark(
+                config=self.config.get_backbone_benchmark_config(),
+                prepare_config=self.config.get_prepare_base_model_config(),
+                training_config=self.config.get_training_config()
+            )
+            backbone_benchmark.run()
+            logging.info(">>>>>>> Backbone Benchmark completed <<<<<<<<<")
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def run_model_evaluation(self):
         """
         Evaluate the trained model on the test dataset.
@@ -134,6 +224,8 @@ class TrainingPipeline:
             CustomException: If evaluation fails.
         """
         try:
+            from project.components.model_evalution import Evaluation
+
             logging.info(">>>>>>> Model Evaluation started <<<<<<<<<")
             model_evaluation_config = self.config.get_model_evaluation_config()
             model_evaluation = Evaluation(model_evaluation_config)
@@ -146,9 +238,10 @@ class TrainingPipeline:
         """
         Execute the full ML pipeline in order:
         1. Data ingestion
-        2. Base model preparation
-        3. Model training
-        4. Model evaluation
+        2. TFRecord conversion (only with USE_TFRECORDS)
+        3. Base model preparation
+        4. Model training
+        5. Model evaluation
         
         Raises:
             CustomException: If any stage of the pipeline fails.
@@ -156,6 +249,8 @@ class TrainingPipeline:
         try:
             logging.info(">>>>>>> Training Pipeline started <<<<<<<<<")
             self.run_data_ingestion()
+            if self.config.param.USE_TFRECORDS:
+                self.run_tfrecord_conversion()
             self.run_prepare_base_model()
             self.run_model_training()
             self.run_model_evaluation()
@@ -0,0 +1,333 @@
+import os
+import threading
+import importlib.util
+from contextlib import contextmanager
+import numpy as np
+
+
+BACKENDS = {}
+
+
+def _tf():
+    """Import TensorFlow on first use so importing this module stays cheap."""
+    import tensorflow as tf
+    return tf
+
+
+def cast_model_precision(model, policy: str = "mixed_bfloat16"):
+    """
+    Rebuild a Keras model under a dtype policy, keeping its weights.
+
+    Every layer gets `policy` except the output layer, which stays float32 so
+    the softmax is computed and returned in full precision. Trainable flags
+    are preserved.
+
+    Args:
+        model (tf.keras.Model): Functional or Sequential model.
+        policy (str): Keras dtype policy, e.g. "mixed_bfloat16" or "float32".
+
+    Returns:
+        tf.keras.Model: The rebuilt model (uncompiled).
+    """
+    tf = _tf()
+    output_layer = model.layers[-1]
+
+    def clone(layer):
+        config = layer.get_config()
+        config["dtype"] = "float32" if layer is output_layer else policy
+        return layer.__class__.from_config(config)
+
+    cast = tf.keras.models.clone_model(model, clone_function=clone)
+    cast.set_weights(model.get_weights())
+    return cast
+
+
+@contextmanager
+def precision_policy(policy: str):
+    """Set the Keras global dtype policy for the layers built inside the block, then restore it."""
+    tf = _tf()
+    previous = tf.keras.mixed_precision.global_policy()
+    tf.keras.mixed_precision.set_global_policy(policy)
+    try:
+        yield
+    finally:
+        tf.keras.mixed_precision.set_global_policy(previous)
+
+
+def needs_precision_cast(model, policy: str) -> bool:
+    """Whether any hidden layer of `model` runs under a dtype policy other than `policy`."""
+    return any(layer.dtype_policy.name != policy for layer in model.layers[1:-1])
+
+
+def register_backend(name: str):
+    """
+    Class decorator registering an inference backend under `name`.
+
+    Example:
+        @register_backend("keras")
+        class KerasBackend(InferenceBackend): ...
+    """
+    def decorator(cls):
+        cls.name = name
+        BACKENDS[name] = cls
+        return cls
+    return decorator
+
+
+def resolve_backend_name(model_path: str, backend: str = "auto") -> str:
+    """
+    Pick a backend from the model path when `backend` is "auto".
+
+    .tflite -> tflite, .onnx -> onnx, directory -> savedmodel, anything else -> keras.
+    """
+    if backend != "auto":
+        return backend
+
+    path = str(model_path)
+    if path.endswith(".tflite"):
+        return "tflite"
+    if path.endswith(".onnx"):
+        return "onnx"
+    if os.path.isdir(path):
+        return "savedmodel"
+    return "keras"
+
+
+def load_backend(model_path: str, backend: str = "auto", **options):
+    """
+    Instantiate the backend registered under `backend` for `model_path`.
+
+    Args:
+        model_path (str): Model file or directory.
+        backend (str): Registered backend name or "auto".
+        **options: Backend specific options (e.g. num_threads, jit_compile).
+
+    Returns:
+        InferenceBackend: Loaded backend.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+        ImportError: If the backend's runtime is not installed.
+    """
+    name = resolve_backend_name(model_path, backend)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{name}'. Available: {sorted(BACKENDS)}")
+
+    cls = BACKENDS[name]
+    if not cls.is_available():
+        raise ImportError(f"Inference backend '{name}' requires {cls.requires}, which is not installed")
+
+    return cls(str(model_path), **options)
+
+
+def available_backends() -> list:
+    """Return the names of registered backends whose runtime is installed."""
+    return [name for name, cls in BACKENDS.items() if cls.is_available()]
+
+
+class InferenceBackend:
+    """
+    Base class for inference backends.
+
+    Every backend takes a float32 batch of shape (N, H, W, C) with values in
+    [0, 1] and returns float32 softmax outputs of shape (N, num_classes).
+
+    Attributes:
+        name (str): Registry name, set by `register_backend`.
+        requires (str): Python module needed by the backend.
+        input_shape (tuple): Per-image input shape (H, W, C).
+    """
+
+    name = None
+    requires = "tensorflow"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return importlib.util.find_spec(cls.requires) is not None
+
+    def __init__(self, model_path: str, **options):
+        self.model_path = model_path
+        self.input_shape = None
+
+    def __call__(self, img_batch: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+
+@register_backend("keras")
+class KerasBackend(InferenceBackend):
+    """
+    Keras .h5/.keras model, served through a traced `tf.function` by default.
+
+    Options:
+        compiled (bool): Use a traced function with a fixed input signature
+            instead of `model.predict`.
+        jit_compile (bool): Compile the traced function with XLA.
+        precision (str): Dtype policy to run the model under, e.g.
+            "mixed_bfloat16" (bf16 compute, float32 softmax). None keeps the
+            saved policy.
+    """
+
+    def __init__(self, model_path: str, compiled: bool = True, jit_compile: bool = False,
+                 precision: str = None, **options):
+        super().__init__(model_path)
+        tf = _tf()
+        self.model = tf.keras.models.load_model(model_path, compile=False)
+        if precision and needs_precision_cast(self.model, precision):
+            self.model = cast_model_precision(self.model, precision)
+        self.input_shape = tuple(self.model.input_shape[1:])
+        self._infer = None
+        if compiled:
+            self._infer = self.build_inference_fn(self.model, self.input_shape, jit_compile)
+
+    @staticmethod
+    def build_inference_fn(model, input_shape, jit_compile: bool = False):
+        """
+        Trace the model's forward pass once with a fixed (None, H, W, C) signature.
+
+        Args:
+            model (tf.keras.Model): Model to wrap.
+            input_shape (tuple): Per-image input shape (H, W, C).
+            jit_compile (bool): Whether to compile the function with XLA.
+
+        Returns:
+            tf.types.experimental.GenericFunction: Callable returning softmax outputs.
+        """
+        tf = _tf()
+
+        @tf.function(
+            input_signature=[tf.TensorSpec(shape=(None, *input_shape), dtype=tf.float32)],
+            jit_compile=jit_compile
+        )
+        def infer(images):
+            return model(images, training=False)
+
+        return infer
+
+    def __call__(self, img_batch: np.ndarray) -> np.ndarray:
+        if self._infer is not None:
+            tf = _tf()
+            output = self._infer(tf.convert_to_tensor(img_batch, dtype=tf.float32))
+            return np.asarray(output, dtype=np.float32)
+
+        return np.asarray(self.model.predict(img_batch, verbose=0), dtype=np.float32)
+
+
+@register_backend("savedmodel")
+class SavedModelBackend(InferenceBackend):
+    """
+    SavedModel directory such as the one `Evaluation.log_mlflow` exports to
+    `artifacts/training/model_export` (via `model.export`).
+
+    Options:
+        signature (str): Serving endpoint to call. Defaults to "serve", the
+            endpoint created by `Model.export`, falling back to "serving_default".
+    """
+
+    def __init__(self, model_path: str, signature: str = "serve", **options):
+        super().__init__(model_path)
+        tf = _tf()
+        self.model = tf.saved_model.load(model_path)
+        if hasattr(self.model, signature):
+            self._infer = getattr(self.model, signature)
+            spec = self._infer.input_signature[0]
+        else:
+            self._infer = self.model.signatures["serving_default"]
+            spec = list(self._infer.structured_input_signature[1].values())[0]
+        self.input_shape = tuple(int(d) for d in spec.shape[1:])
+
+    def __call__(self, img_batch: np.ndarray) -> np.ndarray:
+        tf = _tf()
+        output = self._infer(tf.convert_to_tensor(img_batch, dtype=tf.float32))
+        if isinstance(output, dict):
+            output = list(output.values())[0]
+        return np.asarray(output, dtype=np.float32)
+
+
+@register_backend("tflite")
+class TFLiteBackend(InferenceBackend):
+    """
+    `tf.lite.Interpreter` backend for float32/float16/int8 flatbuffers.
+
+    Quantized inputs are quantized from [0, 1] floats and quantized outputs
+    are dequantized back, so callers always see float probabilities. Uses the
+    standalone `tflite_runtime` interpreter when installed, which avoids
+    importing the full TensorFlow package at startup.
+
+    Options:
+        num_threads (int): Interpreter CPU threads.
+    """
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return any(importlib.util.find_spec(m) is not None for m in ("tflite_runtime", "tensorflow"))
+
+    def __init__(self, model_path: str, num_threads: int = None, **options):
+        super().__init__(model_path)
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            Interpreter = _tf().lite.Interpreter
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self.input_shape = tuple(int(d) for d in self._input["shape"][1:])
+        self._batch_size = int(self._input["shape"][0])
+        # The interpreter is not thread-safe
+        self._lock = threading.Lock()
+
+    def __call__(self, img_batch: np.ndarray) -> np.ndarray:
+        with self._lock:
+            if img_batch.shape[0] != self._batch_size:
+                self.interpreter.resize_tensor_input(
+                    self._input["index"], [img_batch.shape[0], *self.input_shape]
+                )
+                self.interpreter.allocate_tensors()
+                self._input = self.interpreter.get_input_details()[0]
+                self._output = self.interpreter.get_output_details()[0]
+                self._batch_size = img_batch.shape[0]
+
+            input_dtype = self._input["dtype"]
+            if input_dtype in (np.int8, np.uint8):
+                scale, zero_point = self._input["quantization"]
+                info = np.iinfo(input_dtype)
+                img_batch = np.clip(np.round(img_batch / scale + zero_point), info.min, info.max)
+            self.interpreter.set_tensor(self._input["index"], img_batch.astype(input_dtype))
+            self.interpreter.invoke()
+            output = self.interpreter.get_tensor(self._output["index"])
+
+            if self._output["dtype"] in (np.int8, np.uint8):
+                scale, zero_point = self._output["quantization"]
+                output = (output.astype(np.float32) - zero_point) * scale
+
+            return output.astype(np.float32)
+
+
+@register_backend("onnx")
+class OnnxBackend(InferenceBackend):
+    """
+    ONNX Runtime backend (CPU execution provider). Requires `onnxruntime`.
+
+    Options:
+        num_threads (int): Intra-op threads for the session.
+    """
+
+    requires = "onnxruntime"
+
+    def __init__(self, model_path: str, num_threads: int = None, **options):
+        super().__init__(model_path)
+        import onnxruntime as ort
+
+        session_options = ort.SessionOptions()
+        if num_threads:
+            session_options.intra_op_num_threads = int(num_threads)
+        self.session = ort.InferenceSession(
+            model_path, sess_options=session_options, providers=["CPUExecutionProvider"]
+        )
+        model_input = self.session.get_inputs()[0]
+        self._input_name = model_input.name
+        self.input_shape = tuple(int(d) for d in model_input.shape[1:])
+
+    def __call__(self, img_batch: np.ndarray) -> np.ndarray:
+        output = self.session.run(None, {self._input_name: img_batch.astype(np.float32)})[0]
+        return np.asarray(output, dtype=np.float32)
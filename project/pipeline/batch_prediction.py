@@ -0,0 +1,185 @@
+import json
+import zipfile
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from project.logger import logging
+from project.pipeline.prediction import decode_image_bytes
+from project.pipeline.model_registry import resolve_predictor
+
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+
+def iter_image_sources(uploads: list, max_image_bytes: int):
+    """
+    Yield (filename, image_bytes, error) for every image in the uploads.
+
+    Plain image uploads are yielded as-is. Zip archives are walked member by
+    member, so only one compressed member is held in memory at a time no
+    matter how large the archive is.
+
+    Args:
+        uploads (list): FastAPI UploadFile objects (images and/or .zip archives).
+        max_image_bytes (int): Images larger than this are skipped with an error.
+    """
+    for upload in uploads:
+        name = upload.filename or ""
+        lower = name.lower()
+
+        if lower.endswith(".zip"):
+            try:
+                archive = zipfile.ZipFile(upload.file)
+            except zipfile.BadZipFile as e:
+                yield name, None, f"Invalid zip archive: {e}"
+                continue
+
+            with archive:
+                for info in archive.infolist():
+                    if info.is_dir() or not info.filename.lower().endswith(IMAGE_EXTENSIONS):
+                        continue
+                    if info.file_size > max_image_bytes:
+                        yield info.filename, None, "Image exceeds max_image_bytes"
+                        continue
+                    yield info.filename, archive.read(info), None
+
+        elif lower.endswith(IMAGE_EXTENSIONS):
+            image_bytes = upload.file.read(max_image_bytes + 1)
+            if len(image_bytes) > max_image_bytes:
+                yield name, None, "Image exceeds max_image_bytes"
+            else:
+                yield name, image_bytes, None
+
+        else:
+            yield name, None, "Invalid file type"
+
+
+def _chunked(iterable, size: int):
+    """Split an iterator into lists of at most `size` items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class BatchPredictionStreamer:
+    """
+    Scores many images with batched inference and streams NDJSON results.
+
+    Images are pulled from the uploads one chunk at a time, decoded in parallel
+    on a thread pool, scored with a single `predict_batch` call per chunk and
+    emitted as one JSON line per image. At most one chunk of encoded bytes and
+    decoded arrays is alive at once, which keeps memory bounded.
+    """
+
+    def __init__(self, predictor, target_size=(224, 224), batch_size: int = 16,
+                 decode_workers: int = 4, max_image_bytes: int = 20 * 1024 * 1024,
+                 cache=None, executor=None, draft_decode: bool = False):
+        """
+        Args:
+            predictor (ImagePredictor or ModelManager): Predictor exposing
+                `predict_batch`, or a manager resolving to the version being served.
+            target_size (tuple): Resize target (height, width).
+            batch_size (int): Images per forward pass (and per decode chunk).
+            decode_workers (int): Threads used to decode a chunk in parallel.
+            max_image_bytes (int): Per-image size limit for uploads/archive members.
+            cache (PredictionCache, optional): Content-addressed cache consulted
+                before decoding and filled after scoring.
+            executor (InferenceExecutor, optional): Dedicated pool the forward
+                passes are submitted to, sharing its concurrency limit with /predict.
+            draft_decode (bool): Decode large JPEGs at reduced resolution.
+        """
+        self.predictor = predictor
+        self.target_size = tuple(target_size)
+        self.batch_size = max(1, int(batch_size))
+        self.decode_workers = max(1, int(decode_workers))
+        self.max_image_bytes = int(max_image_bytes)
+        self.cache = cache
+        self.executor = executor
+        self.draft_decode = draft_decode
+
+    def _decode(self, item):
+        """
+        Decode one (filename, bytes, error) item, capturing decode failures.
+
+        Returns:
+            tuple: (filename, array or None, error or None, cache key, cached result)
+        """
+        filename, image_bytes, error = item
+        if error is not None:
+            return filename, None, error, None, None
+
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(image_bytes)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return filename, None, None, key, cached
+        try:
+            return filename, decode_image_bytes(image_bytes, self.target_size, draft=self.draft_decode)[0], None, key, None
+        except Exception as e:
+            return filename, None, f"Could not decode image: {e}", key, None
+
+    def stream(self, uploads: list):
+        """
+        Generate one NDJSON line per image as soon as its batch is scored.
+
+        Args:
+            uploads (list): FastAPI UploadFile objects.
+
+        Yields:
+            str: JSON encoded result followed by a newline.
+        """
+        sources = iter_image_sources(uploads, self.max_image_bytes)
+        scored = 0
+
+        with ThreadPoolExecutor(max_workers=self.decode_workers) as pool:
+            for chunk in _chunked(sources, self.batch_size):
+                decoded = list(pool.map(self._decode, chunk))
+
+                ready = [arr for _, arr, _, _, _ in decoded if arr is not None]
+                # One consistent model version per chunk, even across a hot swap
+                predictor = resolve_predictor(self.predictor)
+                results = []
+                if ready:
+                    try:
+                        batch = np.stack(ready)
+                        if self.executor is not None:
+                            results = self.executor.call(predictor.predict_batch, batch)
+                        else:
+                            results = predictor.predict_batch(batch)
+                    except Exception as e:
+                        logging.error(f"Batch prediction failed: {e}")
+                        results = [e] * len(ready)
+
+                ready_index = 0
+                for name, arr, error, key, cached in decoded:
+                    if error is not None:
+                        record = {"filename": name, "error": error}
+                    else:
+                        if cached is not None:
+                            result = cached
+                        else:
+                            result = results[ready_index]
+                            ready_index += 1
+                            if key is not None and not isinstance(result, Exception):
+                                self.cache.put(key, *result, fingerprint=predictor.model_fingerprint)
+
+                        if isinstance(result, Exception):
+                            record = {"filename": name, "error": str(result)}
+                        else:
+                            label, confidence = result
+                            record = {
+                                "filename": name,
+                                "prediction": label,
+                                "confidence": float(confidence),
+                                "model_version": predictor.version
+                            }
+                            scored += 1
+                    yield json.dumps(record) + "\n"
+
+        logging.info(f"Batch prediction streamed {scored} scored images")
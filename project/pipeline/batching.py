@@ -0,0 +1,227 @@
+import asyncio
+import time
+from collections import Counter, deque, namedtuple
+
+import numpy as np
+
+from project.logger import logging
+from project.pipeline.model_registry import resolve_predictor
+
+
+# Result of one image, tagged with the model that produced it
+Prediction = namedtuple("Prediction", ["label", "confidence", "version", "fingerprint"])
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching queue in front of ImagePredictor.
+
+    Concurrent requests are collected until either `max_batch_size` images are
+    waiting or the oldest one has waited `max_wait_ms`. The batch is then run
+    through a single forward pass and the results are fanned back out to the
+    waiting callers. Up to `max_in_flight` forward passes run at once; the
+    next batch is collected while they do.
+
+    Attributes:
+        predictor (ImagePredictor or ModelManager): Predictor exposing
+            `predict_batch`, or a manager resolving to the version being served.
+        max_batch_size (int): Upper bound on images per forward pass.
+        max_wait (float): Maximum time (seconds) to wait for a batch to fill.
+        max_in_flight (int): Maximum concurrent forward passes.
+    """
+
+    def __init__(self, predictor, max_batch_size: int = 8, max_wait_ms: float = 5.0,
+                 stats_window: int = 1024, executor=None, max_in_flight: int = None):
+        """
+        Args:
+            predictor (ImagePredictor): Predictor used for the batched forward pass.
+            max_batch_size (int): Maximum number of images per batch.
+            max_wait_ms (float): Maximum queue wait before a partial batch is flushed.
+            stats_window (int): Number of recent queue waits kept for percentiles.
+            executor (InferenceExecutor, optional): Dedicated pool for the forward
+                pass. Defaults to the event loop's default thread pool.
+            max_in_flight (int, optional): Maximum concurrent forward passes.
+                Defaults to the executor's worker count, or 1 without an executor.
+        """
+        self.predictor = predictor
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.executor = executor
+        if max_in_flight is None:
+            max_in_flight = executor.max_workers if executor is not None else 1
+        self.max_in_flight = max(1, int(max_in_flight))
+
+        self._queue = None
+        self._worker = None
+        self._slots = None
+        self._in_flight = set()
+
+        # Statistics
+        self._requests = 0
+        self._batches = 0
+        self._batch_sizes = Counter()
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._recent_waits = deque(maxlen=stats_window)
+
+    # ---------------------------------------------------------------------
+    async def start(self):
+        """Create the queue and start the background batching task."""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+            self._worker = asyncio.create_task(self._run())
+            logging.info(
+                f"MicroBatcher started (max_batch_size={self.max_batch_size}, "
+                f"max_wait_ms={self.max_wait * 1000:.1f}, max_in_flight={self.max_in_flight})"
+            )
+
+    async def stop(self):
+        """Stop the background task, finish the running batches and fail any request still queued."""
+        if self._worker is None:
+            return
+
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+        while not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Batcher stopped"))
+
+    # ---------------------------------------------------------------------
+    async def submit(self, img_array: np.ndarray):
+        """
+        Queue one preprocessed image and wait for its prediction.
+
+        Args:
+            img_array (np.ndarray): Image of shape (H, W, 3) or (1, H, W, 3).
+
+        Returns:
+            Prediction: (label, confidence, version, fingerprint) for the image.
+        """
+        if self._worker is None:
+            raise RuntimeError("MicroBatcher is not started")
+
+        if img_array.ndim == 4:
+            img_array = img_array[0]
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((img_array, future, time.perf_counter()))
+
+        return await future
+
+    # ---------------------------------------------------------------------
+    async def _collect(self):
+        """Block for the first request, then gather more until full or timed out."""
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already waiting without yielding to the loop
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        """Background loop: wait for a free slot, collect a batch, start it, repeat."""
+        while True:
+            # Requests keep queueing while every slot is busy, so the next batch fills up meanwhile
+            await self._slots.acquire()
+            try:
+                batch = await self._collect()
+            except asyncio.CancelledError:
+                self._slots.release()
+                raise
+            task = asyncio.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._dispatched)
+
+    def _dispatched(self, task):
+        self._in_flight.discard(task)
+        self._slots.release()
+
+    async def _dispatch(self, batch: list):
+        """Run one batched forward pass and resolve every waiting future."""
+        dispatched_at = time.perf_counter()
+        self._record(batch, dispatched_at)
+
+        try:
+            images = np.stack([img for img, _, _ in batch])
+            predictor = resolve_predictor(self.predictor)
+            if self.executor is not None:
+                results = await self.executor.run(predictor.predict_batch, images)
+            else:
+                results = await asyncio.to_thread(predictor.predict_batch, images)
+        except Exception as e:
+            logging.error(f"Batched prediction failed for {len(batch)} requests: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), (label, confidence) in zip(batch, results):
+            if not future.done():
+                future.set_result(
+                    Prediction(label, confidence, predictor.version, predictor.model_fingerprint)
+                )
+
+    # ---------------------------------------------------------------------
+    def _record(self, batch: list, dispatched_at: float):
+        """Update batch-size and queue-wait counters."""
+        self._batches += 1
+        self._requests += len(batch)
+        self._batch_sizes[len(batch)] += 1
+
+        for _, _, enqueued_at in batch:
+            wait = dispatched_at - enqueued_at
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+            self._recent_waits.append(wait)
+
+    def stats(self) -> dict:
+        """
+        Return batching statistics for tuning the throughput/latency tradeoff.
+
+        Returns:
+            dict: Request/batch counts, batch-size histogram and queue-wait
+            statistics in milliseconds (mean, max and recent p50/p95/p99).
+        """
+        waits = np.asarray(self._recent_waits) * 1000.0
+        percentiles = (
+            np.percentile(waits, [50, 95, 99]).tolist() if waits.size else [0.0, 0.0, 0.0]
+        )
+
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "max_in_flight": self.max_in_flight,
+            "requests": self._requests,
+            "batches": self._batches,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "in_flight": len(self._in_flight),
+            "mean_batch_size": self._requests / self._batches if self._batches else 0.0,
+            "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+            "queue_wait_ms": {
+                "mean": (self._wait_total / self._requests * 1000.0) if self._requests else 0.0,
+                "max": self._wait_max * 1000.0,
+                "p50": percentiles[0],
+                "p95": percentiles[1],
+                "p99": percentiles[2],
+            },
+        }
@@ -0,0 +1,318 @@
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import csv
+import json
+import time
+import argparse
+from project.configeration import ConfigerationManager
+from project.exception import CustomException
+from project.logger import logging
+from project.pipeline.prediction import ImagePredictor, decode_image_bytes
+
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+OUTPUT_COLUMNS = ["path", "label", "confidence", "model_version"]
+
+
+def list_images(source: str) -> list:
+    """
+    Return the image paths to score, in a stable order.
+
+    Args:
+        source (str): Directory (walked recursively), a .csv manifest with a
+            `path` column, or a text manifest with one path per line.
+
+    Returns:
+        list: Image paths.
+    """
+    if os.path.isdir(source):
+        return sorted(
+            os.path.join(root, name)
+            for root, _, names in os.walk(source) for name in names
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+
+    with open(source, newline="") as f:
+        if source.endswith(".csv"):
+            return [row["path"] for row in csv.DictReader(f)]
+        return [line.strip() for line in f if line.strip()]
+
+
+class CsvScoreWriter:
+    """
+    Appends result rows to a CSV file.
+
+    The committed state is the file size after the last flush; on resume the
+    file is truncated back to it, dropping any partially written rows.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def committed(self, state: dict) -> set:
+        """Truncate to the checkpointed size and return the paths already scored."""
+        if not os.path.exists(self.path):
+            return set()
+        with open(self.path, "r+", newline="") as f:
+            f.truncate(state.get("csv_offset", 0))
+            f.seek(0)
+            return {row["path"] for row in csv.DictReader(f)}
+
+    def write(self, rows: list, state: dict):
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=OUTPUT_COLUMNS)
+            if new_file:
+                writer.writeheader()
+            writer.writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+        state["csv_offset"] = os.path.getsize(self.path)
+
+
+class ParquetScoreWriter:
+    """
+    Writes result rows as numbered part files of a Parquet dataset directory.
+
+    Only parts listed in the checkpoint are committed; stray parts from an
+    interrupted flush are deleted on resume.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(self.path, exist_ok=True)
+
+    def committed(self, state: dict) -> set:
+        import pandas as pd
+
+        parts = set(state.get("parquet_parts", []))
+        done = set()
+        for name in os.listdir(self.path):
+            part_path = os.path.join(self.path, name)
+            if name not in parts:
+                os.remove(part_path)
+                continue
+            done.update(pd.read_parquet(part_path, columns=["path"])["path"])
+        return done
+
+    def write(self, rows: list, state: dict):
+        import pandas as pd
+
+        parts = state.setdefault("parquet_parts", [])
+        name = f"part-{len(parts):05d}.parquet"
+        pd.DataFrame(rows, columns=OUTPUT_COLUMNS).to_parquet(os.path.join(self.path, name), index=False)
+        parts.append(name)
+
+
+class BulkScorer:
+    """
+    Scores large image collections offline.
+
+    Files are read, decoded, resized and normalized by a parallel `tf.data`
+    pipeline and scored in batches. Results are appended to the output
+    every `checkpoint_every_batches` batches, then a checkpoint is written
+    atomically. A rerun with the same output resumes by skipping every path
+    already committed. Images that cannot be read or decoded are not written
+    to the output; they are listed under "failed" in the checkpoint and
+    retried by the next run.
+    """
+
+    def __init__(self, predictor: ImagePredictor, target_size=(224, 224), batch_size: int = 64,
+                 num_parallel_calls: int = -1, checkpoint_every_batches: int = 20):
+        """
+        Args:
+            predictor (ImagePredictor): Loaded model.
+            target_size (tuple): Resize target (height, width).
+            batch_size (int): Images per forward pass.
+            num_parallel_calls (int): Parallel decode calls (-1 = AUTOTUNE).
+            checkpoint_every_batches (int): Batches between flushes/checkpoints.
+        """
+        self.predictor = predictor
+        self.target_size = tuple(target_size)
+        self.batch_size = max(1, int(batch_size))
+        self.num_parallel_calls = int(num_parallel_calls)
+        self.checkpoint_every_batches = max(1, int(checkpoint_every_batches))
+
+    # ---------------------------------------------------------------------
+    def build_dataset(self, paths: list):
+        """
+        Parallel read + decode pipeline yielding (path, image) batches.
+
+        Files are decoded and resized with PIL, exactly like the online path
+        (`tf.image.resize` nearest picks different source pixels than PIL's
+        NEAREST). Unreadable or corrupt files are dropped by `ignore_errors`;
+        they are reported afterwards as failed.
+        """
+        import tensorflow as tf
+
+        parallel = tf.data.AUTOTUNE if self.num_parallel_calls < 0 else self.num_parallel_calls
+        target_size = self.target_size
+
+        def decode(image_bytes):
+            return decode_image_bytes(image_bytes, target_size=target_size)[0]
+
+        def load(path):
+            image = tf.numpy_function(decode, [tf.io.read_file(path)], tf.float32)
+            return path, tf.ensure_shape(image, (*target_size, 3))
+
+        return (
+            tf.data.Dataset.from_tensor_slices(paths)
+            .map(load, num_parallel_calls=parallel, deterministic=False)
+            .apply(tf.data.experimental.ignore_errors())
+            .batch(self.batch_size)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+
+    # ---------------------------------------------------------------------
+    @staticmethod
+    def _checkpoint_path(output_path: str) -> str:
+        return f"{output_path.rstrip(os.sep)}.checkpoint.json"
+
+    def _save_checkpoint(self, output_path: str, state: dict):
+        checkpoint_path = self._checkpoint_path(output_path)
+        tmp_path = f"{checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=4)
+        os.replace(tmp_path, checkpoint_path)
+
+    def _load_checkpoint(self, output_path: str) -> dict:
+        checkpoint_path = self._checkpoint_path(output_path)
+        if not os.path.exists(checkpoint_path):
+            return {}
+        with open(checkpoint_path) as f:
+            return json.load(f)
+
+    # ---------------------------------------------------------------------
+    def score(self, paths: list, output_path: str, restart: bool = False) -> dict:
+        """
+        Score `paths`, writing results to `output_path` (.csv, or .parquet directory).
+
+        Args:
+            paths (list): Image paths to score.
+            output_path (str): Results file or Parquet dataset directory.
+            restart (bool): Ignore an existing checkpoint and start over.
+
+        Returns:
+            dict: Summary with counts, elapsed time and images/sec.
+
+        Raises:
+            ValueError: If the checkpoint was produced by a different model.
+        """
+        output_path = str(output_path)
+        writer = ParquetScoreWriter(output_path) if output_path.endswith(".parquet") else CsvScoreWriter(output_path)
+
+        state = {} if restart else self._load_checkpoint(output_path)
+        if state and state.get("model_fingerprint") != self.predictor.model_fingerprint:
+            raise ValueError(
+                f"{output_path} was scored with another model; rerun with --restart to start over"
+            )
+        state["model_fingerprint"] = self.predictor.model_fingerprint
+        state.setdefault("scored", 0)
+
+        done = writer.committed(state)
+        todo = [p for p in paths if p not in done]
+        logging.info(f"Bulk scoring {len(todo)} images ({len(done)} already scored) into {output_path}")
+
+        pending, seen = [], set()
+        start = time.perf_counter()
+        scored_this_run = 0
+
+        def flush():
+            if pending:
+                writer.write(pending, state)
+                state["scored"] += len(pending)
+                pending.clear()
+            self._save_checkpoint(output_path, state)
+
+        for batch_index, (batch_paths, images) in enumerate(self.build_dataset(todo) if todo else []):
+            probabilities = self.predictor.predict_probabilities(images.numpy())
+            for path, prediction in zip(batch_paths.numpy(), probabilities):
+                label, confidence = self.predictor.decode_prediction(prediction)
+                path = path.decode()
+                seen.add(path)
+                pending.append({"path": path, "label": label, "confidence": confidence,
+                                "model_version": self.predictor.version})
+            scored_this_run += len(probabilities)
+
+            if (batch_index + 1) % self.checkpoint_every_batches == 0:
+                flush()
+                elapsed = time.perf_counter() - start
+                logging.info(f"Scored {state['scored']} images, {scored_this_run / elapsed:.1f} images/sec")
+
+        # Not committed, so a rerun tries them again
+        failed = [p for p in todo if p not in seen]
+        state["failed"] = failed
+        flush()
+        if failed:
+            logging.warning(f"{len(failed)} images could not be read or decoded; "
+                            f"they are listed in {self._checkpoint_path(output_path)}")
+
+        elapsed = time.perf_counter() - start
+        summary = {
+            "output": output_path,
+            "scored": scored_this_run,
+            "failed": len(failed),
+            "skipped_already_scored": len(done),
+            "elapsed_s": elapsed,
+            "images_per_s": scored_this_run / elapsed if elapsed > 0 else 0.0,
+        }
+        logging.info(f"Bulk scoring finished: {summary}")
+        return summary
+
+
+class BulkScoringPipeline:
+    """Score a directory or manifest of images offline with the trained model."""
+
+    def __init__(self):
+        pass
+
+    def main(self, source: str, output_path: str = None, model_path: str = None,
+             batch_size: int = None, restart: bool = False):
+        try:
+            config = ConfigerationManager()
+            bulk_config = config.get_bulk_scoring_config()
+            batch_size = batch_size or bulk_config.batch_size
+
+            predictor = ImagePredictor(
+                str(model_path or bulk_config.model_path),
+                backend=bulk_config.backend,
+                warmup_batch_sizes=(batch_size,)
+            )
+            scorer = BulkScorer(
+                predictor,
+                target_size=bulk_config.param_image_size[:-1],
+                batch_size=batch_size,
+                num_parallel_calls=bulk_config.num_parallel_calls,
+                checkpoint_every_batches=bulk_config.checkpoint_every_batches
+            )
+            summary = scorer.score(
+                list_images(source), output_path or bulk_config.output_path, restart=restart
+            )
+            print(json.dumps(summary, indent=4))
+            return summary
+        except Exception as e:
+            raise CustomException(e, sys)
+
+if __name__ == "__main__":
+    try:
+        parser = argparse.ArgumentParser(description="Bulk-score images offline with resumable output.")
+        parser.add_argument("--input", type=str, required=True,
+                            help="Image directory, .csv manifest (path column) or text manifest")
+        parser.add_argument("--output", type=str, default=None,
+                            help="Results .csv file or .parquet directory (default from config.yaml)")
+        parser.add_argument("--model", type=str, default=None, help="Model path (default from config.yaml)")
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over")
+        args = parser.parse_args()
+
+        pipeline = BulkScoringPipeline()
+        pipeline.main(args.input, args.output, args.model, args.batch_size, args.restart)
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+## python project/pipeline/bulk_scoring.py --input archive/ --output artifacts/bulk_scoring/scores.parquet
@@ -0,0 +1,226 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+from project.logger import logging
+
+
+class PredictionCache:
+    """
+    Content-addressed prediction cache with LRU + TTL eviction.
+
+    Keys are the SHA-256 of the uploaded image bytes; every entry is also tagged
+    with the fingerprint of the model that produced it. Changing the fingerprint
+    (new model file, hot reload) drops all entries produced by other models, in
+    memory and on disk.
+
+    The in-memory tier is a bounded LRU. The optional SQLite tier survives
+    restarts and is consulted on an in-memory miss.
+
+    Attributes:
+        fingerprint (str): Fingerprint of the model currently serving.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that required inference.
+    """
+
+    def __init__(self, fingerprint: str, max_entries: int = 4096, ttl_seconds: float = 86400,
+                 db_path: str = None, disk_max_entries: int = 100000):
+        """
+        Args:
+            fingerprint (str): Fingerprint of the loaded model (None until a model
+                is loaded; set it later with `set_fingerprint`).
+            max_entries (int): Maximum entries kept in memory.
+            ttl_seconds (float): Entry lifetime; <= 0 disables expiry.
+            db_path (str, optional): SQLite file for the on-disk tier. None disables it.
+            disk_max_entries (int): Maximum rows kept in the SQLite tier.
+        """
+        self.fingerprint = fingerprint
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = float(ttl_seconds)
+        self.disk_max_entries = int(disk_max_entries)
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._db = None
+        self._disk_writes = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        if db_path:
+            self._open_db(db_path)
+
+    # ---------------------------------------------------------------------
+    @staticmethod
+    def key(image_bytes: bytes) -> str:
+        """Return the content address of an encoded image."""
+        return hashlib.sha256(image_bytes).hexdigest()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl > 0 and (now - created_at) > self.ttl
+
+    # ---------------------------------------------------------------------
+    def _open_db(self, db_path: str):
+        """Open (or create) the SQLite tier and drop rows from other models."""
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS predictions ("
+            "key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+            "label TEXT NOT NULL, confidence REAL NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._purge_disk()
+        logging.info(f"Prediction cache disk tier opened at {db_path}")
+
+    def _purge_disk(self):
+        """Delete rows produced by another model or past their TTL."""
+        if self._db is None:
+            return
+        with self._db:
+            self._db.execute("DELETE FROM predictions WHERE fingerprint != ?", (self.fingerprint,))
+            if self.ttl > 0:
+                self._db.execute(
+                    "DELETE FROM predictions WHERE created_at < ?", (time.time() - self.ttl,)
+                )
+
+    def _trim_disk(self):
+        """Keep the SQLite tier below disk_max_entries by dropping the oldest rows."""
+        with self._db:
+            self._db.execute(
+                "DELETE FROM predictions WHERE key IN ("
+                "SELECT key FROM predictions ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.disk_max_entries,)
+            )
+
+    # ---------------------------------------------------------------------
+    def set_fingerprint(self, fingerprint: str):
+        """
+        Switch to a new model fingerprint, invalidating every older entry.
+
+        Args:
+            fingerprint (str): Fingerprint of the newly loaded model.
+        """
+        with self._lock:
+            if fingerprint == self.fingerprint:
+                return
+            logging.info(f"Model fingerprint changed {str(self.fingerprint)[:12]} -> {fingerprint[:12]}, "
+                         f"invalidating prediction cache")
+            self.fingerprint = fingerprint
+            self._memory.clear()
+            self._purge_disk()
+
+    def get(self, key: str):
+        """
+        Look up a cached prediction.
+
+        Args:
+            key (str): Content address from `key()`.
+
+        Returns:
+            tuple or None: (label, confidence) on a hit, None on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                label, confidence, created_at = entry
+                if self._expired(created_at, now):
+                    del self._memory[key]
+                    self.expirations += 1
+                else:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return label, confidence
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT label, confidence, created_at FROM predictions "
+                    "WHERE key = ? AND fingerprint = ?",
+                    (key, self.fingerprint)
+                ).fetchone()
+                if row is not None and not self._expired(row[2], now):
+                    self._insert_memory(key, (row[0], row[1], row[2]))
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0], row[1]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, label: str, confidence: float, fingerprint: str = None):
+        """
+        Store a prediction.
+
+        Args:
+            key (str): Content address from `key()`.
+            label (str): Predicted label.
+            confidence (float): Prediction confidence.
+            fingerprint (str, optional): Fingerprint of the model that produced the
+                prediction. Stale results (from a model that was swapped out while
+                the request was in flight) are ignored.
+        """
+        now = time.time()
+        with self._lock:
+            if fingerprint is not None and fingerprint != self.fingerprint:
+                return
+            self._insert_memory(key, (label, float(confidence), now))
+
+            if self._db is not None:
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)",
+                        (key, self.fingerprint, label, float(confidence), now)
+                    )
+                self._disk_writes += 1
+                if self._disk_writes % 1000 == 0:
+                    self._trim_disk()
+
+    def _insert_memory(self, key: str, entry: tuple):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every entry in both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM predictions")
+
+    def close(self):
+        """Close the SQLite tier."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            disk_entries = None
+            if self._db is not None:
+                disk_entries = self._db.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+            return {
+                "fingerprint": self.fingerprint,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "disk_entries": disk_entries,
+                "ttl_seconds": self.ttl,
+            }
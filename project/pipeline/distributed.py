@@ -0,0 +1,142 @@
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import json
+import time
+import socket
+import argparse
+import subprocess
+from project.configeration import ConfigerationManager
+from project.exception import CustomException
+from project.logger import logging
+
+
+TRAINING_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "4_model_training.py")
+
+
+def free_ports(count: int) -> list:
+    """Reserve `count` free localhost ports (released right before the workers bind them)."""
+    sockets = []
+    try:
+        for _ in range(count):
+            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            s.bind(("localhost", 0))
+            sockets.append(s)
+        return [s.getsockname()[1] for s in sockets]
+    finally:
+        for s in sockets:
+            s.close()
+
+
+def tf_config(workers: list, index: int) -> str:
+    """TF_CONFIG of worker `index` in a cluster of `workers` ("host:port") addresses."""
+    return json.dumps({
+        "cluster": {"worker": workers},
+        "task": {"type": "worker", "index": index},
+    })
+
+
+def launch_local_workers(num_workers: int, command: list, threads_per_worker: int = None,
+                         log_dir: str = None, poll_interval: float = 1.0) -> list:
+    """
+    Run `command` as `num_workers` local processes forming one TF_CONFIG cluster.
+
+    Worker 0 (the chief) keeps this process's stdout/stderr; the others log to
+    `<log_dir>/worker-<i>.log`. When one worker fails the rest are terminated,
+    since the survivors would otherwise block forever in a collective op.
+
+    Args:
+        num_workers (int): Number of worker processes.
+        command (list): Command line each worker runs.
+        threads_per_worker (int, optional): Intra-op/OpenMP threads per worker,
+            so workers sharing one box do not oversubscribe its cores.
+        log_dir (str, optional): Directory of the non-chief worker logs.
+        poll_interval (float): Seconds between process status checks.
+
+    Returns:
+        list: Exit code of every worker.
+    """
+    workers = [f"localhost:{port}" for port in free_ports(num_workers)]
+    log_dir = log_dir or os.path.join("artifacts", "distributed")
+    os.makedirs(log_dir, exist_ok=True)
+
+    processes, logs = [], []
+    try:
+        for index in range(num_workers):
+            env = dict(os.environ, TF_CONFIG=tf_config(workers, index))
+            if threads_per_worker:
+                env.update({
+                    "TF_NUM_INTRAOP_THREADS": str(threads_per_worker),
+                    "TF_NUM_INTEROP_THREADS": str(max(1, threads_per_worker // 4)),
+                    "OMP_NUM_THREADS": str(threads_per_worker),
+                })
+            output = None
+            if index > 0:
+                output = open(os.path.join(log_dir, f"worker-{index}.log"), "w")
+                logs.append(output)
+            processes.append(subprocess.Popen(command, env=env, stdout=output, stderr=output))
+        logging.info(f"Launched {num_workers} local workers: {workers}")
+
+        while any(p.poll() is None for p in processes):
+            if any(p.returncode not in (None, 0) for p in processes):
+                logging.info("A worker failed, terminating the others")
+                for p in processes:
+                    if p.poll() is None:
+                        p.terminate()
+                break
+            time.sleep(poll_interval)
+        return [p.wait() for p in processes]
+    finally:
+        for p in processes:
+            if p.poll() is None:
+                p.kill()
+        for output in logs:
+            output.close()
+
+
+class DistributedTrainingPipeline:
+    """Run the model_training stage as a local multi-worker cluster."""
+
+    def __init__(self):
+        pass
+
+    def main(self, num_workers: int, threads_per_worker: int = None, command: list = None):
+        try:
+            if not ConfigerationManager().param.DISTRIBUTED:
+                logging.info("DISTRIBUTED is False in param.yaml: every worker would train on its own")
+
+            command = command or [sys.executable, TRAINING_SCRIPT]
+            threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // num_workers)
+            start = time.perf_counter()
+            exit_codes = launch_local_workers(num_workers, command, threads_per_worker)
+            logging.info(
+                f"Distributed training finished in {time.perf_counter() - start:.1f}s, "
+                f"exit codes {exit_codes}"
+            )
+            if any(exit_codes):
+                raise RuntimeError(f"Worker exit codes: {exit_codes}")
+            return exit_codes
+        except Exception as e:
+            raise CustomException(e, sys)
+
+if __name__ == "__main__":
+    try:
+        parser = argparse.ArgumentParser(description="Launch local TF_CONFIG workers for multi-worker training.")
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument("--threads-per-worker", type=int, default=None,
+                            help="Intra-op threads per worker (default: CPU count / workers)")
+        parser.add_argument("command", nargs=argparse.REMAINDER,
+                            help="Worker command after `--` (default: the model_training stage)")
+        args = parser.parse_args()
+        command = args.command[1:] if args.command[:1] == ["--"] else args.command
+
+        pipeline = DistributedTrainingPipeline()
+        pipeline.main(args.workers, args.threads_per_worker, command or None)
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+## python project/pipeline/distributed.py --workers 4 --threads-per-worker 4
@@ -0,0 +1,164 @@
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from project.logger import logging
+
+
+class ServerOverloaded(Exception):
+    """
+    Raised when a request is refused by admission control.
+
+    Attributes:
+        retry_after (int): Seconds the client should wait before retrying.
+    """
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Server overloaded, retry later")
+        self.retry_after = retry_after
+
+
+class _Ticket:
+    """Admission slot held by one request; released exactly once, from any thread."""
+
+    def __init__(self, executor):
+        self._executor = executor
+        self._released = False
+        self._lock = threading.Lock()
+
+    def release(self):
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._executor._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class InferenceExecutor:
+    """
+    Dedicated, bounded executor for model execution with admission control.
+
+    Model forward passes run on a private thread pool of `max_workers` threads,
+    so they never block the asyncio event loop. Requests must first be admitted:
+    once `max_workers + max_queue` requests are in the system, new ones are
+    refused with `ServerOverloaded` instead of queueing up latency.
+
+    Attributes:
+        max_workers (int): Maximum concurrent forward passes.
+        max_queue (int): Maximum admitted requests waiting for a worker.
+        retry_after (int): Retry-After hint (seconds) for refused requests.
+    """
+
+    def __init__(self, max_workers: int = 1, max_queue: int = 64, retry_after: int = 1,
+                 histogram=None):
+        """
+        Args:
+            max_workers (int): Size of the inference thread pool.
+            max_queue (int): Admitted requests allowed beyond the running ones.
+            retry_after (int): Seconds returned to clients in Retry-After.
+            histogram (Histogram, optional): Observes the duration of every call.
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self.retry_after = max(1, int(retry_after))
+        self.histogram = histogram
+
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+
+        self._admitted = 0
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    # ---------------------------------------------------------------------
+    def admit(self) -> _Ticket:
+        """
+        Reserve an admission slot for one request.
+
+        Returns:
+            _Ticket: Context manager releasing the slot on exit.
+
+        Raises:
+            ServerOverloaded: If the executor is at capacity.
+        """
+        with self._lock:
+            if self._admitted >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise ServerOverloaded(self.retry_after)
+            self._admitted += 1
+        return _Ticket(self)
+
+    def _release(self):
+        with self._lock:
+            self._admitted -= 1
+
+    # ---------------------------------------------------------------------
+    def _enqueue(self):
+        with self._lock:
+            self._queued += 1
+
+    def _wrap(self, fn, *args):
+        with self._lock:
+            self._queued -= 1
+            self._in_flight += 1
+        start = time.perf_counter()
+        try:
+            result = fn(*args)
+            with self._lock:
+                self._completed += 1
+            return result
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            if self.histogram is not None:
+                self.histogram.observe(time.perf_counter() - start)
+            with self._lock:
+                self._in_flight -= 1
+
+    async def run(self, fn, *args):
+        """Run `fn(*args)` on the inference pool without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        self._enqueue()
+        return await loop.run_in_executor(self._pool, self._wrap, fn, *args)
+
+    def call(self, fn, *args):
+        """Run `fn(*args)` on the inference pool from a worker thread and wait for it."""
+        self._enqueue()
+        return self._pool.submit(self._wrap, fn, *args).result()
+
+    def shutdown(self):
+        """Stop accepting work and wait for running forward passes."""
+        self._pool.shutdown(wait=True)
+        logging.info("Inference executor shut down")
+
+    # ---------------------------------------------------------------------
+    def stats(self) -> dict:
+        """
+        Return queue depth, in-flight count and admission counters.
+
+        `admitted` counts requests inside the service, `queue_depth` counts
+        forward passes waiting for a worker and `in_flight` those running.
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "admitted": self._admitted,
+                "in_flight": self._in_flight,
+                "queue_depth": self._queued,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
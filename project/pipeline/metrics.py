@@ -0,0 +1,209 @@
+import time
+import threading
+from bisect import bisect_left
+
+
+# Latency buckets (seconds) covering sub-millisecond decode up to multi-second forwards
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _format_labels(label_names: tuple, label_values: tuple, extra: str = "") -> str:
+    pairs = [f'{k}="{v}"' for k, v in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter, optionally split by a fixed set of label names."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values: tuple = (), amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for label_values, value in items:
+            yield f"{self.name}{_format_labels(self.label_names, label_values)} {value}"
+
+
+class Gauge:
+    """
+    Value that goes up and down. Either set directly (`inc`/`dec`/`set`) or
+    read from a callback at scrape time.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback=None):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float):
+        with self._lock:
+            self._value = value
+
+    def samples(self):
+        value = self.callback() if self.callback is not None else self._value
+        yield f"{self.name} {value}"
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram. `observe` only bisects the bucket bounds and bumps
+    two numbers, so it is cheap enough for every request.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def time(self):
+        """Context manager observing the elapsed wall time of its block."""
+        return _Timer(self)
+
+    def samples(self):
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            yield f'{self.name}_bucket{{le="{bound}"}} {cumulative}'
+        cumulative += counts[-1]
+        yield f'{self.name}_bucket{{le="+Inf"}} {cumulative}'
+        yield f"{self.name}_sum {total}"
+        yield f"{self.name}_count {cumulative}"
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the Prometheus text exposition format."""
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, prefix: str = ""):
+        self.prefix = prefix
+        self._metrics = []
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: tuple = ()) -> Counter:
+        return self._add(Counter(self.prefix + name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, callback=None) -> Gauge:
+        return self._add(Gauge(self.prefix + name, documentation, callback))
+
+    def histogram(self, name: str, documentation: str, buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(self.prefix + name, documentation, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+class ServingMetrics:
+    """
+    The metric set of the prediction API.
+
+    Per-stage latency histograms (upload read, decode, resize/normalize, model
+    forward, serialization), request and error counters, and in-flight gauges.
+    """
+
+    def __init__(self, executor=None, batcher=None):
+        """
+        Args:
+            executor (InferenceExecutor, optional): Source of queue/in-flight gauges.
+            batcher (MicroBatcher, optional): Source of the batching queue gauge.
+        """
+        self.registry = MetricsRegistry(prefix="kidney_")
+
+        self.requests = self.registry.counter(
+            "requests_total", "Requests handled, by endpoint and status code.", ("endpoint", "status"))
+        self.errors = self.registry.counter(
+            "errors_total", "Requests that failed, by endpoint and stage.", ("endpoint", "stage"))
+        self.in_flight = self.registry.gauge(
+            "requests_in_flight", "Requests currently being handled.")
+        self.images = self.registry.counter(
+            "images_scored_total", "Images scored, by source.", ("source",))
+
+        self.upload_read = self.registry.histogram(
+            "upload_read_seconds", "Time reading the upload body.")
+        self.decode = self.registry.histogram(
+            "decode_seconds", "Time decoding the encoded image.")
+        self.resize_normalize = self.registry.histogram(
+            "resize_normalize_seconds", "Time resizing and normalizing the decoded image.")
+        self.forward = self.registry.histogram(
+            "model_forward_seconds", "Time of one batched model forward pass.")
+        self.serialization = self.registry.histogram(
+            "serialization_seconds", "Time serializing the response body.")
+
+        if executor is not None:
+            self.registry.gauge(
+                "inference_in_flight", "Forward passes currently running.",
+                callback=lambda: executor.stats()["in_flight"])
+            self.registry.gauge(
+                "inference_queue_depth", "Forward passes waiting for an inference worker.",
+                callback=lambda: executor.stats()["queue_depth"])
+            self.registry.gauge(
+                "admitted_requests", "Requests admitted by admission control.",
+                callback=lambda: executor.stats()["admitted"])
+        if batcher is not None:
+            self.registry.gauge(
+                "batcher_queue_depth", "Images waiting in the micro-batching queue.",
+                callback=lambda: batcher.stats()["queue_depth"])
+
+    def render(self) -> str:
+        return self.registry.render()
@@ -0,0 +1,275 @@
+import os
+import time
+import shutil
+import asyncio
+
+from project.logger import logging
+
+
+MODEL_FILENAMES = ("model.h5", "model.keras", "model.tflite", "model.onnx")
+MODEL_EXTENSIONS = (".h5", ".keras", ".tflite", ".onnx")
+
+
+def resolve_predictor(source):
+    """
+    Return the predictor to use for one forward pass.
+
+    `source` is either an ImagePredictor or a ModelManager; a manager resolves
+    to the version currently being served, so a batch always runs on a single
+    consistent model even if a swap happens mid-flight.
+    """
+    return getattr(source, "current", source)
+
+
+class ModelRegistry:
+    """
+    Local, versioned model registry on the filesystem.
+
+    Layout (both forms are accepted):
+        <root_dir>/<version>/model.h5|model.keras|model.tflite|model.onnx
+        <root_dir>/<version>/saved_model.pb   (SavedModel directory)
+        <root_dir>/<version>.h5|.keras|.tflite|.onnx
+
+    Versions are ordered by modification time, then name. Entries modified in
+    the last `settle_seconds` are ignored so a half-copied model is never loaded.
+    """
+
+    def __init__(self, root_dir: str, settle_seconds: float = 2.0):
+        """
+        Args:
+            root_dir (str): Registry directory.
+            settle_seconds (float): Minimum age of an entry before it is considered.
+        """
+        self.root_dir = str(root_dir)
+        self.settle_seconds = settle_seconds
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def _model_path(self, entry: str):
+        path = os.path.join(self.root_dir, entry)
+        if os.path.isfile(path) and entry.endswith(MODEL_EXTENSIONS):
+            return path
+        if os.path.isdir(path):
+            for name in MODEL_FILENAMES:
+                if os.path.isfile(os.path.join(path, name)):
+                    return os.path.join(path, name)
+            if os.path.isfile(os.path.join(path, "saved_model.pb")):
+                return path
+        return None
+
+    def versions(self) -> dict:
+        """
+        Return {version: model_path} for every settled entry, oldest first.
+        """
+        now = time.time()
+        found = []
+        for entry in os.listdir(self.root_dir):
+            if entry.startswith("."):
+                continue
+            model_path = self._model_path(entry)
+            if model_path is None:
+                continue
+            entry_path = os.path.join(self.root_dir, entry)
+            mtime = os.path.getmtime(entry_path)
+            if now - mtime < self.settle_seconds:
+                continue
+            version = entry if os.path.isdir(entry_path) else os.path.splitext(entry)[0]
+            found.append((mtime, version, model_path))
+
+        return {version: path for _, version, path in sorted(found)}
+
+    def latest(self):
+        """Return (version, model_path) of the newest settled version, or None."""
+        versions = self.versions()
+        if not versions:
+            return None
+        version = list(versions)[-1]
+        return version, versions[version]
+
+    def publish(self, model_path: str, version: str = None) -> str:
+        """
+        Copy a trained model into the registry atomically.
+
+        The copy is written to a hidden staging directory and renamed into
+        place, so watchers never observe a partial model.
+
+        Args:
+            model_path (str): Model file or SavedModel directory to publish.
+            version (str, optional): Version name. Defaults to a timestamp.
+
+        Returns:
+            str: The published version name.
+        """
+        version = version or time.strftime("%Y%m%d-%H%M%S")
+        target = os.path.join(self.root_dir, version)
+        if os.path.exists(target):
+            raise FileExistsError(f"Model version {version} already exists in {self.root_dir}")
+
+        staging = os.path.join(self.root_dir, f".staging-{version}")
+        if os.path.isdir(model_path):
+            shutil.copytree(model_path, staging)
+        else:
+            os.makedirs(staging)
+            extension = os.path.splitext(model_path)[1]
+            shutil.copy2(model_path, os.path.join(staging, f"model{extension}"))
+        # copytree keeps the source's mtime; versions() orders by it, so stamp the publish time
+        os.utime(staging)
+        os.replace(staging, target)
+
+        logging.info(f"Published {model_path} as model version {version}")
+        return version
+
+
+class ModelManager:
+    """
+    Serves one model version at a time and hot-swaps to new ones.
+
+    A background task polls the registry; when a newer version appears it is
+    loaded and warmed up in a worker thread while the current version keeps
+    serving, then swapped in with a single reference assignment. Pinning stops
+    automatic upgrades; rollback re-serves the previously served version.
+
+    Attributes:
+        registry (ModelRegistry): Source of model versions.
+        current (ImagePredictor): Predictor of the version being served.
+        pinned (str or None): Version pinned by an operator.
+    """
+
+    def __init__(self, registry: ModelRegistry, loader, poll_seconds: float = 10.0,
+                 on_swap=None):
+        """
+        Args:
+            registry (ModelRegistry): Versioned model registry.
+            loader (callable): loader(model_path, version) -> warmed-up ImagePredictor.
+            poll_seconds (float): Registry polling interval.
+            on_swap (callable, optional): Called with the new predictor after a swap.
+        """
+        self.registry = registry
+        self.loader = loader
+        self.poll_seconds = poll_seconds
+        self.on_swap = on_swap
+
+        self.current = None
+        self.pinned = None
+        self.history = []
+        self.fallback_path = None
+        self._task = None
+        # Created here so pin/rollback before `start()` still serialize swaps
+        self._swap_lock = asyncio.Lock()
+        self._last_error = None
+
+    # ---------------------------------------------------------------------
+    @property
+    def version(self):
+        return getattr(self.current, "version", None)
+
+    @property
+    def model_fingerprint(self):
+        return getattr(self.current, "model_fingerprint", None)
+
+    def resolve_initial(self, fallback_path: str = None):
+        """
+        Return (version, model_path) of the model to serve first: the latest
+        registry version, or `fallback_path` when the registry is empty.
+        """
+        latest = self.registry.latest()
+        if latest is not None:
+            return latest
+        if fallback_path is not None:
+            return "default", str(fallback_path)
+        raise FileNotFoundError(f"No model versions found in {self.registry.root_dir}")
+
+    def load_initial(self, fallback_path: str = None):
+        """Synchronously load and serve the initial model (see `resolve_initial`)."""
+        # Kept so "default" stays loadable once it is in the history
+        self.fallback_path = None if fallback_path is None else str(fallback_path)
+        version, model_path = self.resolve_initial(fallback_path)
+        self._swap(self.loader(model_path, version))
+
+    def _swap(self, predictor):
+        previous = self.current
+        self.current = predictor
+        if previous is not None and previous.version != predictor.version:
+            self.history.append(previous.version)
+            self.history = self.history[-10:]
+        if self.on_swap is not None:
+            self.on_swap(predictor)
+        logging.info(f"Serving model version {predictor.version}")
+
+    async def load_version(self, version: str, unless_pinned: bool = False):
+        """
+        Load and warm `version` off the event loop, then swap it in.
+
+        "default" is the fallback model served while the registry was empty.
+        With `unless_pinned`, nothing is loaded once a version is pinned.
+        """
+        if version == "default" and self.fallback_path is not None:
+            model_path = self.fallback_path
+        else:
+            model_path = self.registry.versions().get(version)
+        if model_path is None:
+            raise KeyError(f"Unknown model version {version}")
+
+        async with self._swap_lock:
+            # An operator may have pinned while this waited for the lock
+            if self.version == version or unless_pinned and self.pinned is not None:
+                return
+            logging.info(f"Loading model version {version} in the background")
+            predictor = await asyncio.to_thread(self.loader, model_path, version)
+            self._swap(predictor)
+
+    # ---------------------------------------------------------------------
+    async def start(self):
+        """Start watching the registry."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            if self.pinned is not None:
+                continue
+            try:
+                latest = await asyncio.to_thread(self.registry.latest)
+                if latest is not None and latest[0] != self.version:
+                    await self.load_version(latest[0], unless_pinned=True)
+                self._last_error = None
+            except Exception as e:
+                # Keep serving the current version; retry on the next poll
+                self._last_error = str(e)
+                logging.error(f"Model hot-reload failed: {e}")
+
+    # ---------------------------------------------------------------------
+    async def pin(self, version: str):
+        """Serve `version` and stop following the newest registry version."""
+        await self.load_version(version)
+        self.pinned = version
+
+    def unpin(self):
+        """Resume following the newest registry version on the next poll."""
+        self.pinned = None
+
+    async def rollback(self):
+        """Re-serve the previously served version and pin it."""
+        if not self.history:
+            raise KeyError("No previous model version to roll back to")
+        await self.pin(self.history[-1])
+
+    def status(self) -> dict:
+        return {
+            "current": self.version,
+            "fingerprint": self.model_fingerprint,
+            "pinned": self.pinned,
+            "history": list(self.history),
+            "available": list(self.registry.versions()),
+            "poll_seconds": self.poll_seconds,
+            "last_error": self._last_error,
+        }
@@ -1,10 +1,119 @@
 
-import tensorflow as tf
+import io
+import hashlib
+import time
 import numpy as np
 import os
+from PIL import Image
+from project.pipeline.backends import load_backend
 
 
 
+def fingerprint_path(path: str) -> str:
+    """
+    Return a SHA-256 fingerprint of a model file or model directory.
+
+    Args:
+        path (str): Model file (.h5/.keras/.tflite) or directory (SavedModel).
+
+    Returns:
+        str: Hex digest over the file contents (and relative names for directories).
+    """
+    digest = hashlib.sha256()
+
+    if os.path.isdir(path):
+        files = sorted(
+            os.path.join(root, name)
+            for root, _, names in os.walk(path) for name in names
+        )
+    else:
+        files = [path]
+
+    for file_path in files:
+        if os.path.isdir(path):
+            digest.update(os.path.relpath(file_path, path).encode())
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+
+    return digest.hexdigest()
+
+
+def decode_image_bytes(image_bytes: bytes, target_size=(224, 224), draft: bool = False) -> np.ndarray:
+    """
+    Decode an encoded image (PNG/JPEG) held in memory into a normalized array.
+
+    Mirrors `tf.keras.utils.load_img` (RGB conversion, nearest-neighbour resize)
+    so predictions match the file based path exactly. With `draft=True`, large
+    JPEGs are decoded at reduced resolution first (see `open_image_bytes`),
+    which is much faster but no longer bit-identical.
+
+    Args:
+        image_bytes (bytes): Raw encoded image, e.g. the body of an upload.
+        target_size (tuple): Resize target (height, width).
+        draft (bool): Use reduced-resolution JPEG decoding.
+
+    Returns:
+        np.ndarray: Float32 array of shape (1, H, W, 3) normalized to [0, 1].
+    """
+    img = open_image_bytes(image_bytes, draft_size=target_size if draft else None)
+
+    return resize_and_normalize(img, target_size=target_size)
+
+
+def open_image_bytes(image_bytes: bytes, draft_size=None) -> Image.Image:
+    """
+    Decode encoded image bytes into an RGB PIL image (decode stage only).
+
+    Args:
+        image_bytes (bytes): Raw encoded PNG/JPEG.
+        draft_size (tuple, optional): Final (height, width) the image will be
+            resized to. JPEGs at least twice that size are then decoded with
+            DCT scaling (PIL draft mode) at 1/2, 1/4 or 1/8 scale, the smallest
+            scale that still covers `draft_size`. Other formats are unaffected.
+
+    Returns:
+        PIL.Image.Image: Decoded RGB image.
+    """
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        if draft_size is not None and img.format == "JPEG":
+            img.draft("RGB", (draft_size[1], draft_size[0]))
+        return img.convert("RGB")
+
+
+def resize_and_normalize(img: Image.Image, target_size=(224, 224)) -> np.ndarray:
+    """
+    Resize a decoded image (nearest-neighbour, like `load_img`) and normalize it.
+
+    Args:
+        img (PIL.Image.Image): Decoded RGB image.
+        target_size (tuple): Resize target (height, width).
+
+    Returns:
+        np.ndarray: Float32 array of shape (1, H, W, 3) normalized to [0, 1].
+    """
+    if img.size != (target_size[1], target_size[0]):
+        img = img.resize((target_size[1], target_size[0]), Image.NEAREST)
+
+    return normalize_array(np.asarray(img, dtype=np.float32))
+
+
+def normalize_array(img_array: np.ndarray) -> np.ndarray:
+    """
+    Add the batch dimension and scale pixel values to [0, 1].
+
+    Args:
+        img_array (np.ndarray): Image of shape (H, W, 3) or batch of shape (N, H, W, 3).
+
+    Returns:
+        np.ndarray: Float32 batch of shape (N, H, W, 3).
+    """
+    if img_array.ndim == 3:
+        img_array = img_array[np.newaxis, ...]
+
+    return img_array.astype(np.float32, copy=False) / 255.0
+
+
 class ImagePredictor:
     """
     A utility class for kidney disease image classification using a trained Keras model.
@@ -13,24 +122,76 @@ class ImagePredictor:
     predictions with confidence scores.
 
     Attributes:
-        model (tf.keras.Model): The loaded deep learning model.
+        backend (InferenceBackend): Batch-first backend running the model.
+        model (tf.keras.Model): The loaded Keras model (None for non-Keras backends).
+        model_fingerprint (str): SHA-256 of the model file, used to key caches.
+        input_shape (tuple): Per-image input shape (H, W, C) expected by the model.
+        version (str): Model version label reported with predictions.
+        load_timings (dict): Seconds spent deserializing and warming up the model.
     """
 
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, compiled: bool = True, jit_compile: bool = False,
+                 warmup_batch_sizes=(1,), num_threads: int = None, backend: str = "auto",
+                 version: str = None, precision: str = None):
         """
         Initialize the ImagePredictor by loading the trained model.
 
         Args:
-            model_path (str): Path to the saved Keras model (.h5 or .keras file).
+            model_path (str): Path to the saved model: Keras (.h5/.keras),
+                SavedModel directory, .tflite or .onnx.
+            compiled (bool): Serve through a traced `tf.function` with a fixed input
+                signature instead of `model.predict`, which rebuilds a data adapter
+                and runs callback machinery on every call.
+            jit_compile (bool): Compile the traced function with XLA.
+            warmup_batch_sizes (iterable): Batch sizes run once at load time so the
+                first real request does not pay for tracing/compilation.
+            num_threads (int, optional): Runtime threads (TFLite/ONNX backends).
+            backend (str): Registered backend name ("keras", "savedmodel", "tflite",
+                "onnx") or "auto" to pick one from the model path.
+            version (str, optional): Version label, e.g. the model registry version.
+            precision (str, optional): Keras dtype policy for Keras models, e.g.
+                "mixed_bfloat16"; the softmax output stays float32.
 
         Raises:
             FileNotFoundError: If the model file does not exist.
         """
         if not os.path.exists(model_path):
             raise FileNotFoundError(f"Model file not found at {model_path}")
-        self.model = tf.keras.models.load_model(model_path)
+        self.model_fingerprint = fingerprint_path(model_path)
+        self.version = version or self.model_fingerprint[:12]
+
+        start = time.perf_counter()
+        self.backend = load_backend(
+            model_path,
+            backend=backend,
+            compiled=compiled,
+            jit_compile=jit_compile,
+            num_threads=num_threads,
+            precision=precision
+        )
+        self.model = getattr(self.backend, "model", None) if self.backend.name == "keras" else None
+        self.input_shape = self.backend.input_shape
+        loaded = time.perf_counter()
+        self.warmup(warmup_batch_sizes)
 
-    def preprocess_image(self, img_path: str, target_size=(224, 224)):
+        self.load_timings = {
+            "model_deserialize_s": loaded - start,
+            "warmup_s": time.perf_counter() - loaded,
+        }
+
+    def warmup(self, batch_sizes=(1,)):
+        """
+        Run dummy batches through the model to trigger tracing and kernel setup.
+
+        Args:
+            batch_sizes (iterable): Batch sizes to warm up. XLA compiles one
+                executable per distinct batch size, so include the serving sizes.
+        """
+        for batch_size in batch_sizes or ():
+            dummy = np.zeros((int(batch_size), *self.input_shape), dtype=np.float32)
+            self.predict_probabilities(dummy)
+
+    def preprocess_image(self, img_path: str, target_size=(224, 224), draft: bool = False):
         """
         Load and preprocess an image for model prediction.
 
@@ -43,6 +204,8 @@ class ImagePredictor:
         Args:
             img_path (str): Path to the input image.
             target_size (tuple): Resize target (height, width).
+            draft (bool): Decode large JPEGs at reduced resolution before the
+                final resize instead of decoding them at native resolution.
 
         Returns:
             np.ndarray: Preprocessed image ready for prediction.
@@ -53,6 +216,12 @@ class ImagePredictor:
         if not os.path.exists(img_path):
             raise FileNotFoundError(f"Image file not found at {img_path}")
 
+        if draft:
+            with open(img_path, "rb") as f:
+                return decode_image_bytes(f.read(), target_size=target_size, draft=True)
+
+        import tensorflow as tf
+
         img = tf.keras.utils.load_img(img_path, target_size=target_size)
         img_array = tf.keras.utils.img_to_array(img)
         img_array = np.expand_dims(img_array, axis=0)
@@ -60,6 +229,84 @@ class ImagePredictor:
 
         return img_array
 
+    def preprocess_bytes(self, image_bytes: bytes, target_size=(224, 224), draft: bool = False):
+        """
+        Preprocess an encoded image held in memory without touching the filesystem.
+
+        Args:
+            image_bytes (bytes): Encoded PNG/JPEG bytes.
+            target_size (tuple): Resize target (height, width).
+            draft (bool): Use reduced-resolution JPEG decoding.
+
+        Returns:
+            np.ndarray: Preprocessed image ready for prediction.
+        """
+        return decode_image_bytes(image_bytes, target_size=target_size, draft=draft)
+
+    def preprocess_array(self, img_array: np.ndarray, target_size=(224, 224)):
+        """
+        Preprocess an already decoded uint8 image (H, W, 3).
+
+        Args:
+            img_array (np.ndarray): Decoded RGB image.
+            target_size (tuple): Resize target (height, width).
+
+        Returns:
+            np.ndarray: Preprocessed image ready for prediction.
+        """
+        if img_array.shape[:2] != tuple(target_size):
+            img = Image.fromarray(np.asarray(img_array, dtype=np.uint8))
+            img_array = np.asarray(img.resize((target_size[1], target_size[0]), Image.NEAREST))
+
+        return normalize_array(img_array)
+
+    def predict_bytes(self, image_bytes: bytes, target_size=(224, 224)):
+        """
+        Predict directly from encoded image bytes.
+
+        Returns:
+            tuple: (label, confidence) for the image.
+        """
+        img_array = self.preprocess_bytes(image_bytes, target_size=target_size)
+
+        return self.predict_batch(img_array)[0]
+
+    @staticmethod
+    def decode_prediction(prediction: np.ndarray):
+        """
+        Convert one row of softmax output into a (label, confidence) pair.
+
+        Notes:
+            Assumes class index 1 = Tumor, 0 = Normal.
+        """
+        label = "Tumor" if np.argmax(prediction) == 1 else "Normal"
+        confidence = float(np.max(prediction))
+
+        return label, confidence
+
+    def predict_batch(self, img_batch: np.ndarray):
+        """
+        Run one forward pass over a batch of preprocessed images.
+
+        Args:
+            img_batch (np.ndarray): Array of shape (N, H, W, 3) normalized to [0, 1].
+
+        Returns:
+            list: One (label, confidence) tuple per image, in input order.
+        """
+        predictions = self.predict_probabilities(img_batch)
+
+        return [self.decode_prediction(p) for p in predictions]
+
+    def predict_probabilities(self, img_batch: np.ndarray) -> np.ndarray:
+        """
+        Return raw softmax outputs of shape (N, num_classes) for a batch.
+
+        Args:
+            img_batch (np.ndarray): Array of shape (N, H, W, 3) normalized to [0, 1].
+        """
+        return self.backend(img_batch)
+
     def predict(self, img_path: str):
         """
         Predict whether the input CT image indicates kidney tumor or normal.
@@ -76,8 +323,5 @@ class ImagePredictor:
             Assumes class index 1 = Tumor, 0 = Normal.
         """
         img_array = self.preprocess_image(img_path)
-        predictions = self.model.predict(img_array)
-        label = "Tumor" if np.argmax(predictions) == 1 else "Normal"
-        confidence = float(np.max(predictions))
 
-        return label, confidence
\ No newline at end of file
+        return self.predict_batch(img_array)[0]
@@ -0,0 +1,45 @@
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import argparse
+from project.configeration import ConfigerationManager
+from project.exception import CustomException
+from project.logger import logging
+from project.pipeline.model_registry import ModelRegistry
+
+
+class PublishModelPipeline:
+    """Copy a trained model into the serving model registry as a new version."""
+
+    def __init__(self):
+        pass
+
+    def main(self, model_path: str, version: str = None):
+        try:
+            config = ConfigerationManager()
+            prediction_config = config.get_prediction_config()
+            registry = ModelRegistry(prediction_config.registry_dir)
+            version = registry.publish(model_path, version=version)
+            logging.info(f"Model {model_path} published as version {version}")
+            print(version)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+if __name__ == "__main__":
+    try:
+        parser = argparse.ArgumentParser(description="Publish a model version for hot reload.")
+        parser.add_argument("--model", type=str, default="artifacts/training/model.h5",
+                            help="Model file or SavedModel directory (e.g. final_model/model.keras)")
+        parser.add_argument("--version", type=str, default=None, help="Version name (default: timestamp)")
+        args = parser.parse_args()
+
+        pipeline = PublishModelPipeline()
+        pipeline.main(args.model, args.version)
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+## python project/pipeline/publish_model.py --model final_model/model.keras
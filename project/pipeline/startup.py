@@ -0,0 +1,53 @@
+import time
+from contextlib import contextmanager
+
+from project.logger import logging
+
+
+class StartupProfiler:
+    """
+    Breaks cold start into named phases (imports, TensorFlow import, model
+    deserialize, warm-up, ...) so slow pod readiness can be attributed.
+
+    Phases are either timed with the `phase` context manager, closed with
+    `mark` (time since the previous mark), or recorded from measurements
+    taken elsewhere with `record`.
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._last_mark = self._origin
+        self.phases = {}
+        self.ready_after = None
+
+    def mark(self, name: str):
+        """Record the time elapsed since the previous mark (or creation) as `name`."""
+        now = time.perf_counter()
+        self.phases[name] = now - self._last_mark
+        self._last_mark = now
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as phase `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - start
+            self._last_mark = time.perf_counter()
+
+    def record(self, name: str, seconds: float):
+        """Record a phase measured elsewhere."""
+        self.phases[name] = seconds
+
+    def ready(self):
+        """Mark the service ready and log the full breakdown."""
+        self.ready_after = time.perf_counter() - self._origin
+        logging.info(f"Startup profile: {self.report()}")
+
+    def report(self) -> dict:
+        return {
+            "phases_s": dict(self.phases),
+            "ready_after_s": self.ready_after,
+            "uptime_s": time.perf_counter() - self._origin,
+        }
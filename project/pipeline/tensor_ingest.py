@@ -0,0 +1,118 @@
+import io
+import struct
+import numpy as np
+
+
+# Compact tensor format (little-endian):
+#   magic "KTNS" | uint8 dtype code | uint8 ndim | uint16 reserved | uint32 shape[ndim] | C-order data
+TENSOR_MAGIC = b"KTNS"
+NPY_MAGIC = b"\x93NUMPY"
+DTYPE_CODES = {0: np.dtype(np.uint8), 1: np.dtype("<f4")}
+
+
+class TensorPayloadError(ValueError):
+    """Raised when a raw tensor payload is malformed or has the wrong shape."""
+
+
+def encode_tensor(array: np.ndarray) -> bytes:
+    """
+    Serialize a uint8 or float32 array to the compact tensor format.
+
+    Args:
+        array (np.ndarray): Image (H, W, C) or batch (N, H, W, C).
+
+    Returns:
+        bytes: Header followed by the raw C-order data.
+    """
+    array = np.ascontiguousarray(array)
+    codes = {dtype: code for code, dtype in DTYPE_CODES.items()}
+    if array.dtype not in codes:
+        raise TensorPayloadError(f"Unsupported dtype {array.dtype}; use uint8 or float32")
+
+    header = TENSOR_MAGIC + struct.pack("<BBH", codes[array.dtype], array.ndim, 0)
+    header += struct.pack(f"<{array.ndim}I", *array.shape)
+    return header + array.tobytes()
+
+
+def _parse_compact(buffer) -> np.ndarray:
+    if len(buffer) < 8:
+        raise TensorPayloadError("Truncated tensor header")
+    dtype_code, ndim, _ = struct.unpack_from("<BBH", buffer, 4)
+    if dtype_code not in DTYPE_CODES:
+        raise TensorPayloadError(f"Unknown dtype code {dtype_code}")
+    offset = 8 + 4 * ndim
+    if len(buffer) < offset:
+        raise TensorPayloadError("Truncated tensor header")
+    shape = struct.unpack_from(f"<{ndim}I", buffer, 8)
+    return _view(buffer, DTYPE_CODES[dtype_code], shape, offset)
+
+
+def _parse_npy(buffer) -> np.ndarray:
+    if len(buffer) < 10:
+        raise TensorPayloadError("Truncated .npy header")
+    version = (buffer[6], buffer[7])
+    if version == (1, 0):
+        header_len, offset = struct.unpack_from("<H", buffer, 8)[0], 10
+    elif version == (2, 0):
+        header_len, offset = struct.unpack_from("<I", buffer, 8)[0], 12
+    else:
+        raise TensorPayloadError(f"Unsupported .npy version {version}")
+
+    header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+    shape, fortran_order, dtype = header(io.BytesIO(bytes(buffer[8:offset + header_len])))
+    if fortran_order:
+        raise TensorPayloadError("Fortran-ordered .npy arrays are not supported")
+    if dtype not in DTYPE_CODES.values():
+        raise TensorPayloadError(f"Unsupported dtype {dtype}; use uint8 or float32")
+    return _view(buffer, dtype, shape, offset + header_len)
+
+
+def _view(buffer, dtype: np.dtype, shape: tuple, offset: int) -> np.ndarray:
+    """Wrap the payload bytes as an array without copying them."""
+    count = int(np.prod(shape))
+    if len(buffer) - offset != count * dtype.itemsize:
+        raise TensorPayloadError(
+            f"Payload holds {len(buffer) - offset} data bytes, shape {tuple(shape)} needs {count * dtype.itemsize}"
+        )
+    return np.frombuffer(buffer, dtype=dtype, count=count, offset=offset).reshape(shape)
+
+
+def parse_tensor_payload(buffer, image_shape, max_batch: int = 64) -> np.ndarray:
+    """
+    Parse a raw `.npy` or compact tensor payload into a model-ready batch.
+
+    uint8 pixels are scaled to [0, 1] in a single float32 pass; float32
+    payloads must already be in [0, 1] and are passed through without copying.
+
+    Args:
+        buffer (bytes or bytearray): Request body.
+        image_shape (list): Expected per-image shape (H, W, C), i.e. IMAGE_SIZE.
+        max_batch (int): Largest accepted batch.
+
+    Returns:
+        np.ndarray: Float32 batch of shape (N, H, W, C).
+
+    Raises:
+        TensorPayloadError: If the payload is malformed or has the wrong shape.
+    """
+    if bytes(buffer[:6]) == NPY_MAGIC:
+        array = _parse_npy(buffer)
+    elif bytes(buffer[:4]) == TENSOR_MAGIC:
+        array = _parse_compact(buffer)
+    else:
+        raise TensorPayloadError("Payload is neither a .npy file nor a KTNS tensor")
+
+    image_shape = tuple(int(d) for d in image_shape)
+    if array.ndim == len(image_shape):
+        array = array[np.newaxis, ...]
+    if array.ndim != len(image_shape) + 1 or tuple(array.shape[1:]) != image_shape:
+        raise TensorPayloadError(
+            f"Expected shape {image_shape} or (N, {', '.join(map(str, image_shape))}), got {tuple(array.shape)}"
+        )
+    if not 1 <= array.shape[0] <= max_batch:
+        raise TensorPayloadError(f"Batch size must be between 1 and {max_batch}, got {array.shape[0]}")
+
+    if array.dtype == np.uint8:
+        return np.divide(array, np.float32(255.0), dtype=np.float32)
+
+    return array
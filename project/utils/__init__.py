@@ -3,7 +3,6 @@ import sys
 import json
 import yaml
 import base64
-import joblib
 
 from pathlib import Path
 from typing import Any, List
@@ -116,6 +115,7 @@ def load_json(path: Path) -> ConfigBox:
 def save_bin(data: Any, path: Path):
     """Save binary data using joblib."""
     try:
+        import joblib
         joblib.dump(value=data, filename=path)
         logging.info(f"Binary file saved at: {path}")
     except Exception as e:
@@ -126,6 +126,7 @@ def save_bin(data: Any, path: Path):
 def load_bin(path: Path) -> Any:
     """Load binary data using joblib."""
     try:
+        import joblib
         data = joblib.load(path)
         logging.info(f"Binary file loaded from: {path}")
         return data
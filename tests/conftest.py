@@ -0,0 +1,9 @@
+import sys
+import os
+import tempfile
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Keep test runs out of the project's logs/ folder
+os.environ.setdefault("LOG_DIR", tempfile.mkdtemp(prefix="kidney-test-logs-"))
@@ -0,0 +1,114 @@
+"""
+One worker of the distributed resume tests in test_checkpointing.py.
+
+Usage: python resume_worker.py <work_dir> <mode> [checkpoint_dir]
+
+Runs `Training` with DISTRIBUTED on (cluster from TF_CONFIG) on the images
+under <work_dir>/data, checkpointing every step:
+
+    train       train, then print the restored position and the final weights
+    interrupt   abort the run after the first step of the second epoch
+    restore     only restore the latest checkpoint and print its position
+
+The global batch size is 4 whatever the number of workers, so checkpoints
+written by one cluster are compatible with another.
+"""
+import sys
+import os
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import tensorflow as tf
+from pathlib import Path
+from project.components.model_training import Training
+from project.entity.config import TrainingConfig
+
+GLOBAL_BATCH_SIZE = 4
+
+
+class Interrupt(tf.keras.callbacks.Callback):
+    """Simulated preemption after `step` steps of `epoch`."""
+
+    def __init__(self, epoch: int, step: int):
+        super().__init__()
+        self.epoch, self.step = epoch, step
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._epoch = epoch
+
+    def on_train_batch_begin(self, batch, logs=None):
+        # At the next step's start, so the checkpointer has saved the last finished one
+        if self._epoch == self.epoch and batch == self.step:
+            raise RuntimeError("simulated preemption")
+
+
+class RecordingTraining(Training):
+    """Training that remembers the (epoch, step) it resumed from."""
+
+    def restore_checkpoint(self, model):
+        checkpointer, position = super().restore_checkpoint(model)
+        self.restored = list(position)
+        return checkpointer, position
+
+
+def training_config(work_dir: Path, num_workers: int, checkpoint_dir: Path) -> TrainingConfig:
+    return TrainingConfig(
+        root_dir=work_dir,
+        trained_model_path=work_dir / "model.h5",
+        update_base_model=work_dir / "base.h5",
+        training_data=work_dir / "data",
+        param_image_size=[8, 8, 3],
+        param_batch_size=GLOBAL_BATCH_SIZE // num_workers,
+        param_epochs=2,
+        params_augmentation=False,
+        param_learning_rate=0.01,
+        feature_cache_dir=work_dir / "feature_cache",
+        param_feature_cache=False,
+        param_feature_cache_variants=1,
+        tfrecord_dir=work_dir / "tfrecords",
+        param_use_tfrecords=False,
+        data_cache_dir=work_dir / "data_cache",
+        param_num_parallel_calls=1,
+        param_deterministic=True,
+        param_data_cache="none",
+        param_augment_in="pipeline",
+        param_precision="float32",
+        param_distributed=True,
+        checkpoint_dir=checkpoint_dir,
+        param_resume=True,
+        param_checkpoint_every_steps=1,
+        param_checkpoints_to_keep=2,
+        param_checkpoint_keep_every_hours=0,
+    )
+
+
+if __name__ == "__main__":
+    work_dir, mode = Path(sys.argv[1]), sys.argv[2]
+    checkpoint_dir = Path(sys.argv[3]) if len(sys.argv) > 3 else work_dir / "checkpoints"
+    os.chdir(work_dir)  # final_model/ is written relative to the working directory
+
+    num_workers = len(json.loads(os.environ["TF_CONFIG"])["cluster"]["worker"])
+    trainer = RecordingTraining(training_config(work_dir, num_workers, checkpoint_dir))
+    trainer.get_base_model()
+    trainer.train_valid_generator()
+
+    if mode == "restore":
+        trainer.restore_checkpoint(trainer.model)
+        print("\nRESULT " + json.dumps({"restored": trainer.restored}), flush=True)
+        sys.exit(0)
+
+    try:
+        trainer.train(callbacks=[Interrupt(epoch=1, step=1)] if mode == "interrupt" else [])
+        finished = True
+    except Exception as e:
+        if "simulated preemption" not in str(e):
+            raise
+        finished = False
+    # Own line: the progress bar does not end with a newline
+    print("\nRESULT " + json.dumps({
+        "finished": finished,
+        "restored": trainer.restored,
+        "weights": [w.tolist() for w in trainer.model.get_weights()],
+    }), flush=True)
@@ -0,0 +1,133 @@
+import time
+import asyncio
+import threading
+import numpy as np
+import pytest
+from project.pipeline.batching import MicroBatcher, Prediction
+from project.pipeline.executor import InferenceExecutor
+
+
+class EchoPredictor:
+    """Labels every image with its first pixel; records the batch sizes and overlap of forward passes."""
+
+    version = "v1"
+    model_fingerprint = "fp-v1"
+
+    def __init__(self, seconds=0.0, fail=False):
+        self.seconds, self.fail = seconds, fail
+        self.batch_sizes = []
+        self.running = self.max_running = 0
+        self._lock = threading.Lock()
+
+    def predict_batch(self, images):
+        with self._lock:
+            self.batch_sizes.append(len(images))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(self.seconds)
+            if self.fail:
+                raise ValueError("forward pass failed")
+            return [(str(int(image[0, 0, 0])), 0.5) for image in images]
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+def image(value):
+    return np.full((2, 2, 3), value, np.float32)
+
+
+def serve(batcher, requests):
+    async def main():
+        await batcher.start()
+        try:
+            return await requests()
+        finally:
+            await batcher.stop()
+    return asyncio.run(main())
+
+
+def test_full_batch_is_flushed_without_waiting_and_fanned_out_in_order():
+    predictor = EchoPredictor()
+    batcher = MicroBatcher(predictor, max_batch_size=4, max_wait_ms=10_000)
+
+    async def requests():
+        return await asyncio.gather(*(batcher.submit(image(i)) for i in range(4)))
+
+    started = time.perf_counter()
+    results = serve(batcher, requests)
+    assert time.perf_counter() - started < 5
+    assert predictor.batch_sizes == [4]
+    assert results == [Prediction(str(i), 0.5, "v1", "fp-v1") for i in range(4)]
+
+
+def test_partial_batch_is_flushed_after_max_wait():
+    predictor = EchoPredictor()
+    batcher = MicroBatcher(predictor, max_batch_size=8, max_wait_ms=20)
+
+    async def requests():
+        return await asyncio.gather(batcher.submit(image(1)), batcher.submit(image(2)[None]))
+
+    assert [r.label for r in serve(batcher, requests)] == ["1", "2"]
+    assert predictor.batch_sizes == [2]
+    assert batcher.stats()["batch_size_histogram"] == {2: 1}
+
+
+def test_failed_forward_pass_fails_every_caller_of_the_batch():
+    batcher = MicroBatcher(EchoPredictor(fail=True), max_batch_size=2, max_wait_ms=10_000)
+
+    async def requests():
+        return await asyncio.gather(batcher.submit(image(1)), batcher.submit(image(2)),
+                                    return_exceptions=True)
+
+    assert [type(r) for r in serve(batcher, requests)] == [ValueError, ValueError]
+
+
+def test_next_batches_run_while_a_forward_pass_is_in_flight():
+    predictor = EchoPredictor(seconds=0.2)
+    executor = InferenceExecutor(max_workers=2)
+    batcher = MicroBatcher(predictor, max_batch_size=1, max_wait_ms=0, executor=executor)
+    assert batcher.max_in_flight == 2
+
+    async def requests():
+        return await asyncio.gather(*(batcher.submit(image(i)) for i in range(4)))
+
+    results = serve(batcher, requests)
+    assert [r.label for r in results] == ["0", "1", "2", "3"]
+    assert predictor.max_running == 2
+    executor.shutdown()
+
+
+def test_requests_queue_into_one_batch_while_every_slot_is_busy():
+    predictor = EchoPredictor(seconds=0.2)
+    batcher = MicroBatcher(predictor, max_batch_size=8, max_wait_ms=0, max_in_flight=1)
+
+    async def requests():
+        first = asyncio.ensure_future(batcher.submit(image(0)))
+        await asyncio.sleep(0.05)
+        rest = [batcher.submit(image(i)) for i in range(1, 4)]
+        return await asyncio.gather(first, *rest)
+
+    serve(batcher, requests)
+    assert predictor.batch_sizes == [1, 3]
+    assert predictor.max_running == 1
+
+
+def test_stop_finishes_running_batches_and_fails_queued_requests():
+    batcher = MicroBatcher(EchoPredictor(seconds=0.2), max_batch_size=1, max_wait_ms=0)
+
+    async def main():
+        await batcher.start()
+        running = asyncio.ensure_future(batcher.submit(image(1)))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(batcher.submit(image(2)))
+        await asyncio.sleep(0)
+        await batcher.stop()
+        return await running, await asyncio.gather(queued, return_exceptions=True)
+
+    finished, (failed,) = asyncio.run(main())
+    assert finished.label == "1"
+    assert isinstance(failed, RuntimeError)
+    with pytest.raises(RuntimeError):
+        asyncio.run(batcher.submit(image(3)))
@@ -0,0 +1,97 @@
+import pytest
+from project.pipeline import cache as cache_module
+from project.pipeline.cache import PredictionCache
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "time", clock.time)
+    return clock
+
+
+def test_key_is_the_content_address():
+    assert PredictionCache.key(b"image") == PredictionCache.key(b"image")
+    assert PredictionCache.key(b"image") != PredictionCache.key(b"other")
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache("fp", max_entries=2)
+    cache.put("a", "Normal", 0.9)
+    cache.put("b", "Tumor", 0.8)
+    assert cache.get("a") == ("Normal", 0.9)
+
+    cache.put("c", "Cyst", 0.7)
+    assert cache.get("b") is None
+    assert cache.get("a") == ("Normal", 0.9) and cache.get("c") == ("Cyst", 0.7)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (3, 1, 1)
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = PredictionCache("fp", ttl_seconds=60)
+    cache.put("a", "Normal", 0.9)
+
+    clock.now += 59
+    assert cache.get("a") == ("Normal", 0.9)
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_non_positive_ttl_never_expires(clock):
+    cache = PredictionCache("fp", ttl_seconds=0)
+    cache.put("a", "Normal", 0.9)
+    clock.now += 10 ** 9
+    assert cache.get("a") == ("Normal", 0.9)
+
+
+def test_new_fingerprint_drops_both_tiers(tmp_path):
+    cache = PredictionCache("old", db_path=str(tmp_path / "cache.db"))
+    cache.put("a", "Normal", 0.9)
+
+    cache.set_fingerprint("new")
+    assert cache.get("a") is None
+    assert cache.stats()["disk_entries"] == 0
+
+
+def test_results_of_a_swapped_out_model_are_not_stored():
+    cache = PredictionCache("new")
+    cache.put("a", "Normal", 0.9, fingerprint="old")
+    assert cache.get("a") is None
+
+
+def test_disk_tier_survives_a_restart_of_the_same_model(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    first = PredictionCache("fp", db_path=db_path)
+    first.put("a", "Normal", 0.9)
+    first.close()
+
+    second = PredictionCache("fp", db_path=db_path)
+    assert second.get("a") == ("Normal", 0.9)
+    assert second.stats()["disk_hits"] == 1
+    second.close()
+
+
+def test_opening_the_disk_tier_purges_other_models_and_expired_rows(tmp_path, clock):
+    db_path = str(tmp_path / "cache.db")
+    old_model = PredictionCache("old", db_path=db_path)
+    old_model.put("a", "Normal", 0.9)
+    old_model.close()
+    same_model = PredictionCache("fp", ttl_seconds=60, db_path=db_path)
+    same_model.put("b", "Tumor", 0.8)
+    same_model.close()
+
+    clock.now += 61
+    reopened = PredictionCache("fp", ttl_seconds=60, db_path=db_path)
+    assert reopened.stats()["disk_entries"] == 0
+    assert reopened.get("b") is None
+    reopened.close()
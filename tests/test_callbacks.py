@@ -0,0 +1,112 @@
+import os
+import json
+import time
+import numpy as np
+import tensorflow as tf
+from project.components.callbacks import StepTimeProfiler
+
+STEPS = 4
+SLOW_S = 0.3
+
+
+def tiny_model() -> tf.keras.Model:
+    model = tf.keras.Sequential([tf.keras.Input((4,)), tf.keras.layers.Dense(2)])
+    model.compile(optimizer="sgd", loss="mse")
+    # Trace the train step up front so the first measured step is not slow for its own reasons
+    model.fit(np.ones((2, 4), np.float32), np.zeros((2, 2), np.float32), verbose=0)
+    return model
+
+
+def batches(count: int, slow: set) -> tf.data.Dataset:
+    """`count` batches; producing the ones in `slow` takes SLOW_S seconds."""
+    def produce(index):
+        if int(index) in slow:
+            time.sleep(SLOW_S)
+        return np.ones((2, 4), np.float32), np.zeros((2, 2), np.float32)
+
+    def load(index):
+        x, y = tf.numpy_function(produce, [index], (tf.float32, tf.float32))
+        return tf.ensure_shape(x, (2, 4)), tf.ensure_shape(y, (2, 2))
+
+    return tf.data.Dataset.range(count).map(load).prefetch(tf.data.AUTOTUNE)
+
+
+class StepWalls(tf.keras.callbacks.Callback):
+    """Wall time of every step, per epoch."""
+
+    def __init__(self):
+        super().__init__()
+        self.walls = {}
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.walls[epoch] = []
+
+    def on_train_batch_begin(self, batch, logs=None):
+        self._start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        self.walls[max(self.walls)].append(time.perf_counter() - self._start)
+
+
+def fit(model, profiler, data, **kwargs) -> dict:
+    walls = StepWalls()
+    model.fit(data, callbacks=[profiler, walls], verbose=0, **kwargs)
+    return walls.walls
+
+
+def input_waits(log_dir, epoch: int) -> list:
+    with open(os.path.join(log_dir, f"epoch_{epoch:03d}.json")) as f:
+        return [step["input_wait_s"] for step in json.load(f)["per_step"]]
+
+
+def assert_wait_charged_to_stalled_steps(log_dir, walls: dict, stalls: int):
+    # Which step stalls on a slow batch depends on how far the prefetching got,
+    # so the profile is compared with the measured step times
+    stalled = [
+        (epoch, step) for epoch, times in walls.items()
+        for step, wall in enumerate(times) if wall > SLOW_S * 0.8
+    ]
+    assert len(stalled) == stalls, walls
+    for epoch in walls:
+        for step, wait in enumerate(input_waits(log_dir, epoch)):
+            if (epoch, step) in stalled:
+                assert wait > SLOW_S * 0.8, (epoch, step, wait)
+            else:
+                assert wait < SLOW_S * 0.5, (epoch, step, wait)
+
+
+def test_wait_is_charged_to_the_step_of_the_slow_batch_every_epoch(tmp_path):
+    profiler = StepTimeProfiler(tmp_path)
+    # Finite dataset: Keras starts a new iterator each epoch
+    walls = fit(tiny_model(), profiler, profiler.instrument(batches(STEPS, slow={2})), epochs=3)
+
+    assert_wait_charged_to_stalled_steps(tmp_path, walls, stalls=3)
+
+
+def test_one_stream_across_epochs_keeps_stamps_of_prefetched_batches(tmp_path):
+    profiler = StepTimeProfiler(tmp_path)
+    # One iterator for both epochs (infinite dataset and steps_per_epoch): the
+    # second epoch's first batches are prefetched before it begins
+    stream = batches(2 * STEPS, slow={STEPS + 2}).repeat()
+    walls = fit(tiny_model(), profiler, profiler.instrument(stream), epochs=2, steps_per_epoch=STEPS)
+
+    assert_wait_charged_to_stalled_steps(tmp_path, walls, stalls=1)
+
+
+def test_consecutive_fit_calls_restart_the_numbering(tmp_path):
+    profiler = StepTimeProfiler(tmp_path)
+    model = tiny_model()
+    first = fit(model, profiler, profiler.instrument(batches(STEPS, slow={1})), epochs=1)
+    second = fit(model, profiler, profiler.instrument(batches(STEPS, slow={3})), epochs=2, initial_epoch=1)
+
+    assert_wait_charged_to_stalled_steps(tmp_path, {**first, **second}, stalls=2)
+
+
+def test_uninstrumented_run_reports_no_split(tmp_path):
+    profiler = StepTimeProfiler(tmp_path)
+    fit(tiny_model(), profiler, batches(STEPS, slow=set()), epochs=1)
+
+    with open(os.path.join(tmp_path, "epoch_000.json")) as f:
+        summary = json.load(f)
+    assert summary["steps"] == STEPS
+    assert summary["input_wait_s"] is None and summary["bound"] is None
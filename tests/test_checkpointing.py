@@ -0,0 +1,197 @@
+import os
+import sys
+import json
+import shutil
+import subprocess
+import numpy as np
+import pytest
+import tensorflow as tf
+from pathlib import Path
+from PIL import Image
+from project.components.checkpointing import TrainingCheckpointer
+from project.pipeline.distributed import free_ports, tf_config
+
+
+def tiny_model(image_size=(8, 8, 3), num_classes=2) -> tf.keras.Model:
+    inputs = tf.keras.Input(shape=image_size)
+    x = tf.keras.layers.Conv2D(2, 3, name="conv")(inputs)
+    x = tf.keras.layers.Flatten()(x)
+    outputs = tf.keras.layers.Dense(num_classes, activation="softmax", dtype="float32")(x)
+    model = tf.keras.Model(inputs=inputs, outputs=outputs)
+    model.compile(optimizer=tf.keras.optimizers.Adam(0.01), loss="categorical_crossentropy")
+    return model
+
+
+def fit_steps(model, steps=2):
+    x = np.random.default_rng(0).random((steps * 2, 8, 8, 3), dtype=np.float32)
+    y = np.eye(2, dtype=np.float32)[np.arange(steps * 2) % 2]
+    model.fit(x, y, batch_size=2, epochs=1, verbose=0)
+
+
+def same_weights(a, b) -> bool:
+    return all(np.array_equal(x, y) for x, y in zip(a.get_weights(), b.get_weights()))
+
+
+@pytest.fixture
+def checkpoint_dir(tmp_path):
+    return str(tmp_path / "checkpoints")
+
+
+def test_fresh_directory_starts_at_zero(checkpoint_dir):
+    checkpointer = TrainingCheckpointer(checkpoint_dir, tiny_model(), compat_key="a")
+    assert checkpointer.restore() == (0, 0)
+
+
+def test_restore_returns_position_weights_and_optimizer_state(checkpoint_dir):
+    model = tiny_model()
+    fit_steps(model)
+    TrainingCheckpointer(checkpoint_dir, model, compat_key="a").save(epoch=1, step=3)
+
+    resumed = tiny_model()
+    assert TrainingCheckpointer(checkpoint_dir, resumed, compat_key="a").restore() == (1, 3)
+    assert same_weights(model, resumed)
+    assert int(resumed.optimizer.iterations.numpy()) == int(model.optimizer.iterations.numpy())
+
+
+def test_incompatible_checkpoint_is_discarded(checkpoint_dir):
+    TrainingCheckpointer(checkpoint_dir, tiny_model(), compat_key="a").save(epoch=1, step=3)
+
+    checkpointer = TrainingCheckpointer(checkpoint_dir, tiny_model(), compat_key="b")
+    assert checkpointer.restore() == (0, 0)
+    assert os.listdir(checkpoint_dir) == []
+
+
+def test_finished_run_is_not_resumed(checkpoint_dir):
+    checkpointer = TrainingCheckpointer(checkpoint_dir, tiny_model(), compat_key="a")
+    checkpointer.save(epoch=2, step=0)
+    checkpointer.mark_completed()
+
+    assert TrainingCheckpointer(checkpoint_dir, tiny_model(), compat_key="a").restore() == (0, 0)
+
+
+def test_worker_restores_from_chief_directory_and_writes_elsewhere(checkpoint_dir):
+    model = tiny_model()
+    fit_steps(model)
+    TrainingCheckpointer(checkpoint_dir, model, compat_key="a").save(epoch=1, step=3)
+    chief_files = sorted(os.listdir(checkpoint_dir))
+
+    resumed = tiny_model()
+    worker = TrainingCheckpointer(checkpoint_dir, resumed, compat_key="a", is_chief=False)
+    assert worker.restore() == (1, 3)
+    assert same_weights(model, resumed)
+
+    worker.save(epoch=1, step=4)
+    worker.mark_completed()
+    assert sorted(os.listdir(checkpoint_dir)) == chief_files
+    assert json.load(open(os.path.join(checkpoint_dir, "state.json")))["completed"] is False
+    assert not os.path.exists(worker.write_dir)
+
+
+def test_worker_leaves_incompatible_chief_checkpoints_to_the_chief(checkpoint_dir):
+    TrainingCheckpointer(checkpoint_dir, tiny_model(), compat_key="a").save(epoch=1, step=3)
+
+    worker = TrainingCheckpointer(checkpoint_dir, tiny_model(), compat_key="b", is_chief=False)
+    assert worker.restore() == (0, 0)
+    assert "state.json" in os.listdir(checkpoint_dir)
+
+
+def test_mid_epoch_checkpoints_follow_the_epoch_step(checkpoint_dir):
+    model = tiny_model()
+    fit_steps(model)
+    checkpointer = TrainingCheckpointer(checkpoint_dir, model, compat_key="a", save_every_steps=2)
+    checkpointer.resume_epoch, checkpointer.resume_step = 1, 2
+    checkpointer.on_epoch_begin(1)
+    for batch in range(2):
+        checkpointer.on_train_batch_end(batch)
+
+    assert TrainingCheckpointer(checkpoint_dir, tiny_model(), compat_key="a").restore() == (1, 4)
+
+
+# -------------------------------------------------------------------------
+def write_dataset(root: Path, per_class=10):
+    rng = np.random.default_rng(0)
+    for label in ("Normal", "Tumor"):
+        (root / label).mkdir(parents=True)
+        for i in range(per_class):
+            pixels = rng.integers(0, 256, size=(8, 8, 3), dtype=np.uint8)
+            Image.fromarray(pixels).save(root / label / f"{i}.png")
+
+
+def run_workers(work_dir: Path, mode: str, num_workers: int, checkpoint_dirs: list = None, timeout=300) -> list:
+    """Run resume_worker.py as a local TF_CONFIG cluster; a hang fails the test via the timeout."""
+    workers = [f"localhost:{port}" for port in free_ports(num_workers)]
+    script = os.path.join(os.path.dirname(__file__), "resume_worker.py")
+    checkpoint_dirs = checkpoint_dirs or [work_dir / "checkpoints"] * num_workers
+    processes = [
+        subprocess.Popen(
+            [sys.executable, script, str(work_dir), mode, str(checkpoint_dirs[index])],
+            env=dict(os.environ, TF_CONFIG=tf_config(workers, index), TF_CPP_MIN_LOG_LEVEL="2"),
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        for index in range(num_workers)
+    ]
+    results = []
+    try:
+        for process in processes:
+            stdout, stderr = process.communicate(timeout=timeout)
+            results.append((process.returncode, stdout, stderr))
+    finally:
+        for process in processes:
+            process.kill()
+    return results
+
+
+def outputs(results: list) -> list:
+    for returncode, _, stderr in results:
+        assert returncode == 0, stderr[-3000:]
+    return [
+        json.loads([line for line in stdout.splitlines() if line.startswith("RESULT ")][-1][len("RESULT "):])
+        for _, stdout, _ in results
+    ]
+
+
+@pytest.fixture
+def work_dir(tmp_path):
+    write_dataset(tmp_path / "data")
+    tiny_model().save(tmp_path / "base.h5")
+    return tmp_path
+
+
+def test_resumed_run_matches_an_uninterrupted_one(work_dir, tmp_path_factory):
+    reference_dir = tmp_path_factory.mktemp("reference")
+    shutil.copytree(work_dir, reference_dir, dirs_exist_ok=True)
+    reference = outputs(run_workers(reference_dir, "train", num_workers=1))[0]
+
+    interrupted = outputs(run_workers(work_dir, "interrupt", num_workers=1))[0]
+    assert not interrupted["finished"]
+
+    # The rest of the interrupted epoch replays the same batch order, so the weights end up the same
+    resumed = outputs(run_workers(work_dir, "train", num_workers=1))[0]
+    assert resumed["finished"] and resumed["restored"] == [1, 1]
+    for weights, expected in zip(resumed["weights"], reference["weights"]):
+        np.testing.assert_allclose(weights, expected, rtol=1e-5, atol=1e-6)
+
+
+def test_every_worker_restores_the_chiefs_checkpoint(work_dir):
+    outputs(run_workers(work_dir, "interrupt", num_workers=1))
+
+    restored = outputs(run_workers(work_dir, "restore", num_workers=2))
+    assert [r["restored"] for r in restored] == [[1, 1], [1, 1]]
+
+
+def test_workers_that_restore_different_positions_fail_instead_of_hanging(work_dir, tmp_path_factory):
+    outputs(run_workers(work_dir, "interrupt", num_workers=1))
+
+    unshared = tmp_path_factory.mktemp("unshared")
+    results = run_workers(work_dir, "restore", num_workers=2,
+                          checkpoint_dirs=[work_dir / "checkpoints", unshared])
+    for returncode, _, stderr in results:
+        assert returncode != 0
+        assert "must be readable by every worker" in stderr
+
+
+@pytest.mark.skipif(int(tf.keras.__version__.split(".")[0]) < 3, reason="Keras 2 runs multi-worker fit")
+def test_multi_worker_fit_on_keras_3_fails_with_a_clear_error(work_dir):
+    for returncode, _, stderr in run_workers(work_dir, "train", num_workers=2):
+        assert returncode != 0
+        assert "cannot run model.fit under MultiWorkerMirroredStrategy" in stderr
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import pytest
+from project.pipeline.executor import InferenceExecutor, ServerOverloaded
+
+
+def test_admits_workers_plus_queue_then_refuses():
+    executor = InferenceExecutor(max_workers=2, max_queue=1, retry_after=3)
+    tickets = [executor.admit() for _ in range(3)]
+
+    with pytest.raises(ServerOverloaded) as refused:
+        executor.admit()
+    assert refused.value.retry_after == 3
+    assert executor.stats()["admitted"] == 3
+    assert executor.stats()["rejected"] == 1
+
+    tickets[0].release()
+    executor.admit()
+    assert executor.stats()["admitted"] == 3
+
+
+def test_ticket_is_released_once_from_its_context_and_explicit_calls():
+    executor = InferenceExecutor(max_workers=1, max_queue=1)
+    ticket = executor.admit()
+    other = executor.admit()
+
+    with ticket:
+        pass
+    ticket.release()
+    assert executor.stats()["admitted"] == 1
+    other.release()
+    assert executor.stats()["admitted"] == 0
+
+
+def test_concurrent_releases_free_the_slot_once():
+    executor = InferenceExecutor(max_workers=1, max_queue=0)
+    for _ in range(50):
+        ticket = executor.admit()
+        barrier = threading.Barrier(4)
+
+        def release():
+            barrier.wait()
+            ticket.release()
+
+        threads = [threading.Thread(target=release) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert executor.stats()["admitted"] == 0
+
+
+def test_run_executes_on_the_pool_and_counts_outcomes():
+    executor = InferenceExecutor(max_workers=2)
+    caller = threading.get_ident()
+
+    def fail():
+        raise ValueError("boom")
+
+    async def main():
+        ident = await executor.run(threading.get_ident)
+        with pytest.raises(ValueError):
+            await executor.run(fail)
+        return ident
+
+    assert asyncio.run(main()) != caller
+    assert executor.call(lambda x: x + 1, 1) == 2
+    stats = executor.stats()
+    assert (stats["completed"], stats["failed"], stats["in_flight"], stats["queue_depth"]) == (2, 1, 0, 0)
+    executor.shutdown()
+
+
+def test_histogram_observes_every_call():
+    observed = []
+
+    class Histogram:
+        def observe(self, seconds):
+            observed.append(seconds)
+
+    executor = InferenceExecutor(histogram=Histogram())
+    executor.call(lambda: None)
+    executor.call(lambda: None)
+    assert len(observed) == 2 and all(s >= 0 for s in observed)
@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from project.pipeline.model_registry import ModelRegistry, ModelManager, resolve_predictor
+
+
+def load(model_path, version):
+    return SimpleNamespace(version=version, model_path=model_path, model_fingerprint=f"fp-{version}")
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(tmp_path / "registry", settle_seconds=0)
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    path = tmp_path / "model.h5"
+    path.write_bytes(b"weights")
+    return path
+
+
+def test_published_versions_are_listed_oldest_first(registry, model_file):
+    registry.publish(str(model_file), version="v1")
+    registry.publish(str(model_file), version="v2")
+
+    assert list(registry.versions()) == ["v1", "v2"]
+    assert registry.latest() == ("v2", registry.versions()["v2"])
+    with pytest.raises(FileExistsError):
+        registry.publish(str(model_file), version="v2")
+
+
+def test_initial_model_falls_back_when_the_registry_is_empty(registry, model_file):
+    manager = ModelManager(registry, load)
+    manager.load_initial(fallback_path=model_file)
+
+    assert manager.version == "default"
+    assert resolve_predictor(manager).model_path == str(model_file)
+
+
+def test_pin_and_rollback_work_before_start(registry, model_file):
+    registry.publish(str(model_file), version="v1")
+    registry.publish(str(model_file), version="v2")
+    manager = ModelManager(registry, load)
+    manager.load_initial()
+
+    asyncio.run(manager.pin("v1"))
+    assert (manager.version, manager.pinned, manager.history) == ("v1", "v1", ["v2"])
+
+    asyncio.run(manager.rollback())
+    assert (manager.version, manager.pinned) == ("v2", "v2")
+
+
+def test_rollback_to_the_fallback_model(registry, model_file):
+    manager = ModelManager(registry, load)
+    manager.load_initial(fallback_path=model_file)
+    registry.publish(str(model_file), version="v1")
+    asyncio.run(manager.load_version("v1"))
+
+    asyncio.run(manager.rollback())
+    assert manager.version == "default" and manager.pinned == "default"
+    assert manager.current.model_path == str(model_file)
+
+
+def test_unknown_versions_are_refused(registry, model_file):
+    manager = ModelManager(registry, load)
+    manager.load_initial(fallback_path=model_file)
+
+    with pytest.raises(KeyError):
+        asyncio.run(manager.pin("v9"))
+    with pytest.raises(KeyError):
+        asyncio.run(manager.rollback())
+    assert manager.version == "default" and manager.pinned is None
+
+
+def test_watcher_follows_the_registry_unless_pinned(registry, model_file):
+    registry.publish(str(model_file), version="v1")
+    swaps = []
+    manager = ModelManager(registry, load, poll_seconds=0.01, on_swap=lambda p: swaps.append(p.version))
+    manager.load_initial()
+
+    async def main():
+        await manager.start()
+        registry.publish(str(model_file), version="v2")
+        await asyncio.sleep(0.2)
+        await manager.pin("v1")
+        registry.publish(str(model_file), version="v3")
+        await asyncio.sleep(0.2)
+        await manager.stop()
+
+    asyncio.run(main())
+    assert swaps == ["v1", "v2", "v1"]
+    assert manager.status()["available"] == ["v1", "v2", "v3"]